@@ -6,6 +6,7 @@ from jose import JWTError, jwt
 from sqlalchemy.orm import Session
 
 from app.database import get_db
+from app.auth.principal_cache import load_principal
 from app.models.user import User
 from app.config import settings
 from app.utils.password import verify_password
@@ -40,7 +41,7 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
     
-    user = db.query(User).filter(User.id == user_id).first()
+    user = load_principal(db, user_id)
     if user is None:
         raise credentials_exception
     return user
@@ -0,0 +1,105 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.user import User
+
+# What an authenticated request may read off current_user; never the hash
+PRINCIPAL_FIELDS = (
+    "id", "email", "full_name", "phone_number", "role",
+    "is_active", "is_verified", "created_at", "updated_at"
+)
+
+class PrincipalCache:
+    """Bounded LRU of authenticated users, each entry expiring after `ttl_seconds`.
+
+    Entries hold plain field values and every hit builds a fresh, unattached
+    User, so a handler changing current_user cannot alter the cache. Writers
+    call invalidate() after committing a change to a user. The cache lives
+    in one worker, so other workers see such a change once their entry
+    expires.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        # Bumped by every invalidation; a load that started before one may
+        # have read the old row and is not cached
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, user_id: str) -> Optional[User]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[1] > time.monotonic():
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return User(**entry[0])
+            if entry is not None:
+                del self._entries[user_id]
+            self.misses += 1
+            return None
+
+    def put(self, user: User, generation: int) -> None:
+        fields = {name: getattr(user, name) for name in PRINCIPAL_FIELDS}
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[user.id] = (fields, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, user_id: str) -> None:
+        with self._lock:
+            self._generation += 1
+            self.invalidations += 1
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+def load_principal(db: Session, user_id: str) -> Optional[User]:
+    """The user behind a token: from the cache, else one query that fills it."""
+    user = principal_cache.get(user_id)
+    if user is not None:
+        return user
+    generation = principal_cache.generation
+    user = db.query(User).filter(User.id == user_id).first()
+    if user is not None:
+        principal_cache.put(user, generation)
+    return user
+
+principal_cache = PrincipalCache(settings.PRINCIPAL_CACHE_SIZE, settings.PRINCIPAL_CACHE_TTL_SECONDS)
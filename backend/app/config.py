@@ -12,12 +12,51 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./app.db")
+    # Defaults to DATABASE_URL with its asyncio driver (aiosqlite / asyncpg)
+    ASYNC_DATABASE_URL: Optional[str] = os.getenv("ASYNC_DATABASE_URL")
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # seconds before a connection is replaced
+    DB_POOL_PRE_PING: bool = True
+    # Read replica for read-only endpoints; unset means every read uses the primary
+    REPLICA_DATABASE_URL: Optional[str] = os.getenv("REPLICA_DATABASE_URL")
+    ASYNC_REPLICA_DATABASE_URL: Optional[str] = os.getenv("ASYNC_REPLICA_DATABASE_URL")
+    REPLICA_MAX_LAG_SECONDS: float = 5.0  # fall back to the primary beyond this
+    REPLICA_LAG_CHECK_INTERVAL: float = 2.0  # seconds a lag reading is reused
+    # Per-request statement counting (Server-Timing header, N+1 warnings)
+    QUERY_STATS_ENABLED: bool = True
+    N_PLUS_ONE_THRESHOLD: int = 10  # repeats of one statement before warning
+    # Opt-in log of slow statements with their EXPLAIN output
+    SLOW_QUERY_LOG_ENABLED: bool = False
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0
+    SLOW_QUERY_LOG_FILE: str = "logs/slow_queries.log"
+    SLOW_QUERY_LOG_MAX_BYTES: int = 10 * 1024 * 1024
+    SLOW_QUERY_LOG_BACKUP_COUNT: int = 5
+
+    # Nearby provider search
+    GEO_INDEX_ENABLED: bool = True
+    GEO_INDEX_REFRESH_SECONDS: float = 5.0
+    # Incremental refreshes re-read this far behind the newest updated_at
+    # seen, for rows stamped before a commit that landed later
+    GEO_INDEX_WATERMARK_LAG_SECONDS: float = 60.0
+    # Full reload, for anything committed later still
+    GEO_INDEX_REBUILD_SECONDS: float = 300.0
+
+    # Availability and booking slots
+    DEFAULT_BOOKING_MINUTES: int = 60
+    AVAILABILITY_HORIZON_DAYS: int = 28
+    AVAILABILITY_INDEX_REFRESH_SECONDS: float = 60.0
+    BOOKING_HOLD_SECONDS: int = 300
     
     # JWT
     JWT_SECRET_KEY: str = os.getenv("JWT_SECRET_KEY", "your-secret-key")
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    # Keys the HMAC refresh tokens are stored under; a copy of the table
+    # alone cannot be turned back into working tokens
+    REFRESH_TOKEN_SECRET: str = os.getenv("REFRESH_TOKEN_SECRET", os.getenv("JWT_SECRET_KEY", "your-secret-key"))
     
     # CORS
     CORS_ORIGINS: List[str] = [
@@ -37,6 +76,10 @@ class Settings(BaseSettings):
     
     # Security
     SECURITY_BCRYPT_ROUNDS: int = 12
+    # bcrypt runs on this many threads; past PASSWORD_HASH_QUEUE_LIMIT
+    # running or waiting hashes, sign-ins get a 503 straight away
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_LIMIT: int = 32
     SECURITY_PASSWORD_SALT: str = os.getenv("SECURITY_PASSWORD_SALT", "your-salt")
     SECURITY_TOKEN_MAX_AGE: int = 3600
     
@@ -58,6 +101,45 @@ class Settings(BaseSettings):
     REDIS_HOST: str = os.getenv("REDIS_HOST", "localhost")
     REDIS_PORT: int = int(os.getenv("REDIS_PORT", "6379"))
     REDIS_PASSWORD: Optional[str] = os.getenv("REDIS_PASSWORD")
+
+    # Realtime notifications: "memory" serves a single worker, "redis" fans
+    # out across workers over the Redis connection above
+    NOTIFICATION_BROKER: str = "memory"
+    NOTIFICATION_CHANNEL: str = "notifications"
+    # Per-socket send queue; a full queue drops the oldest message
+    # ("drop_oldest") or closes the socket ("disconnect")
+    WS_SEND_QUEUE_SIZE: int = 100
+    WS_OVERFLOW_POLICY: str = "disconnect"
+    # Sockets one worker accepts in total and per user before refusing more
+    WS_MAX_CONNECTIONS: int = 10000
+    WS_MAX_CONNECTIONS_PER_USER: int = 5
+    # Every socket is pinged this often and closed once it has sent nothing
+    # for the idle timeout
+    WS_HEARTBEAT_SECONDS: float = 25.0
+    WS_IDLE_TIMEOUT_SECONDS: float = 60.0
+    # Most missed notifications replayed to a reconnecting socket, fetched
+    # in batches; past that the client is told to refetch its list
+    WS_REPLAY_LIMIT: int = 500
+    WS_REPLAY_BATCH_SIZE: int = 100
+    # Write-behind notification inserts: a batch is written once it holds
+    # NOTIFICATION_BATCH_SIZE rows or NOTIFICATION_FLUSH_SECONDS after its
+    # first row; adds wait while NOTIFICATION_BUFFER_LIMIT rows are unwritten
+    NOTIFICATION_BATCH_SIZE: int = 500
+    NOTIFICATION_FLUSH_SECONDS: float = 0.05
+    NOTIFICATION_BUFFER_LIMIT: int = 20000
+    # Cached counters such as unread notifications: "memory" serves a single
+    # worker, "redis" is shared by all of them; the database stays the
+    # source of truth and entries are recounted after the TTL
+    COUNTER_CACHE: str = "memory"
+    UNREAD_COUNT_TTL_SECONDS: int = 300
+    # Compaction archives read notifications older than this many days, and
+    # read ones beyond the newest NOTIFICATION_HOT_LIMIT of each user
+    NOTIFICATION_RETENTION_DAYS: int = 90
+    NOTIFICATION_HOT_LIMIT: int = 1000
+    # Authenticated users cached per worker; a change made on another worker
+    # shows up here once the entry expires
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 30.0
     
     # Logging
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
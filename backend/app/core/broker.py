@@ -0,0 +1,177 @@
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from typing import Awaitable, Callable, Dict, Optional, Set
+
+try:
+    from redis import asyncio as aioredis
+except ImportError:  # only needed for NOTIFICATION_BROKER=redis
+    aioredis = None
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Called with (user_id, message) for every message published by any worker
+Handler = Callable[[str, dict], Awaitable[None]]
+
+class Broker:
+    """Carries realtime messages for a user to whichever worker holds their sockets.
+
+    Each worker calls start() once with the handler that delivers to its own
+    sockets; publish() may be called from any worker, before or after start.
+    """
+
+    async def start(self, handler: Handler) -> None:
+        raise NotImplementedError
+
+    async def stop(self) -> None:
+        raise NotImplementedError
+
+    async def publish(self, user_id: str, message: dict) -> None:
+        raise NotImplementedError
+
+class InMemoryBroker(Broker):
+    """Hands messages straight to this process's handler: one worker only."""
+
+    def __init__(self):
+        self._handler: Optional[Handler] = None
+
+    async def start(self, handler: Handler) -> None:
+        self._handler = handler
+
+    async def stop(self) -> None:
+        self._handler = None
+
+    async def publish(self, user_id: str, message: dict) -> None:
+        if self._handler is not None:
+            await self._handler(user_id, message)
+
+class RedisBroker(Broker):
+    """Fans messages out through one Redis pub/sub channel shared by all workers.
+
+    Every worker keeps a single subscription and a reader task that passes
+    each message to its handler, which drops users it holds no socket for.
+    """
+
+    def __init__(self, channel: str = "notifications", client=None, reconnect_seconds: float = 1.0):
+        self.channel = channel
+        self.reconnect_seconds = reconnect_seconds
+        self._client = client
+        self._owns_client = client is None
+        self._handler: Optional[Handler] = None
+        self._pubsub = None
+        self._reader: Optional[asyncio.Task] = None
+
+    def _connection(self):
+        if self._client is None:
+            if aioredis is None:
+                raise RuntimeError("NOTIFICATION_BROKER=redis needs the redis package")
+            self._client = aioredis.Redis(
+                host=settings.REDIS_HOST,
+                port=settings.REDIS_PORT,
+                password=settings.REDIS_PASSWORD
+            )
+        return self._client
+
+    async def start(self, handler: Handler) -> None:
+        if self._reader is not None:
+            return
+        self._handler = handler
+        self._pubsub = self._connection().pubsub(ignore_subscribe_messages=True)
+        await self._pubsub.subscribe(self.channel)
+        self._reader = asyncio.create_task(self._read())
+
+    async def _read(self) -> None:
+        while True:
+            try:
+                async for message in self._pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    envelope = json.loads(message["data"])
+                    try:
+                        await self._handler(envelope["user_id"], envelope["message"])
+                    except Exception:
+                        logger.exception("Delivering a realtime message failed")
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Lost the server; the pubsub resubscribes when it reconnects
+                logger.exception("Realtime subscription dropped, retrying")
+                await asyncio.sleep(self.reconnect_seconds)
+
+    async def stop(self) -> None:
+        if self._reader is not None:
+            self._reader.cancel()
+            try:
+                await self._reader
+            except asyncio.CancelledError:
+                pass
+            self._reader = None
+        if self._pubsub is not None:
+            await self._pubsub.unsubscribe(self.channel)
+            await self._pubsub.aclose()
+            self._pubsub = None
+        if self._owns_client and self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        self._handler = None
+
+    async def publish(self, user_id: str, message: dict) -> None:
+        envelope = json.dumps({"user_id": user_id, "message": message}, default=str)
+        await self._connection().publish(self.channel, envelope)
+
+class _LocalPubSub:
+    def __init__(self, server: "LocalRedis"):
+        self._server = server
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._channels: Set[str] = set()
+
+    async def subscribe(self, *channels: str) -> None:
+        for channel in channels:
+            self._channels.add(channel)
+            self._server.subscribers[channel].add(self._queue)
+
+    async def unsubscribe(self, *channels: str) -> None:
+        for channel in channels or tuple(self._channels):
+            self._channels.discard(channel)
+            self._server.subscribers[channel].discard(self._queue)
+
+    async def listen(self):
+        while True:
+            yield await self._queue.get()
+
+    async def aclose(self) -> None:
+        await self.unsubscribe()
+
+class LocalRedis:
+    """In-process stand-in for a Redis server's pub/sub.
+
+    Give one instance to several RedisBrokers and each acts as a separate
+    worker, so cross-worker delivery can be tested without a server.
+    """
+
+    def __init__(self):
+        self.subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+
+    def pubsub(self, ignore_subscribe_messages: bool = False) -> _LocalPubSub:
+        return _LocalPubSub(self)
+
+    async def publish(self, channel: str, data: str) -> int:
+        queues = list(self.subscribers[channel])
+        for queue in queues:
+            queue.put_nowait({"type": "message", "channel": channel, "data": data})
+        return len(queues)
+
+    async def aclose(self) -> None:
+        pass
+
+def create_broker() -> Broker:
+    if settings.NOTIFICATION_BROKER == "redis":
+        return RedisBroker(settings.NOTIFICATION_CHANNEL)
+    if settings.NOTIFICATION_BROKER == "memory":
+        return InMemoryBroker()
+    raise ValueError(f"Unknown NOTIFICATION_BROKER {settings.NOTIFICATION_BROKER!r}")
+
+broker = create_broker()
@@ -0,0 +1,301 @@
+import asyncio
+import json
+import logging
+from typing import AsyncIterator, Dict, Optional, Set
+
+from app.config import settings
+from app.core.broker import broker
+
+logger = logging.getLogger(__name__)
+
+# Close code for clients that cannot keep up, or a worker that is full
+# ("try again later")
+SLOW_CLIENT_CLOSE_CODE = 1013
+# Close codes for a user over their socket cap and for a silent client
+POLICY_CLOSE_CODE = 1008
+IDLE_CLOSE_CODE = 1001
+
+# Sent on every heartbeat; clients answer with any message, e.g. "pong".
+# Notifications carry no "event" key, so clients can tell the two apart.
+PING = {"event": "ping"}
+# Sent after a replay that hit its limit: refetch the list instead
+RESYNC = {"event": "resync"}
+
+class Connection:
+    """One open socket with its own bounded send queue and sender task.
+
+    Messages are queued without waiting, so a slow client only ever delays
+    itself; the sender task writes them to the socket in order. A held
+    connection queues but does not write until start(), which leaves the
+    socket free for a replay of missed notifications.
+    """
+
+    def __init__(
+        self,
+        websocket,
+        user_id: str,
+        queue_size: int,
+        manager: "ConnectionManager",
+        hold: bool = False,
+        reap_idle: bool = True
+    ):
+        self.websocket = websocket
+        self.user_id = user_id
+        self.reap_idle = reap_idle
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0
+        self.last_seen = asyncio.get_running_loop().time()
+        self.skip_through: Optional[int] = None
+        self._manager = manager
+        self._sender: Optional[asyncio.Task] = None
+        if not hold:
+            self.start()
+
+    def start(self, skip_through: Optional[int] = None) -> None:
+        """Start writing queued messages, skipping notifications up to id `skip_through`.
+
+        Those were already replayed, so a live copy queued meanwhile is a duplicate.
+        """
+        self.skip_through = skip_through
+        if self._sender is None:
+            self._sender = asyncio.create_task(self._drain())
+
+    def _replayed(self, message: dict) -> bool:
+        message_id = message.get("id")
+        return self.skip_through is not None and isinstance(message_id, int) and message_id <= self.skip_through
+
+    async def _drain(self) -> None:
+        try:
+            while True:
+                message = await self.queue.get()
+                if self._replayed(message):
+                    continue
+                await self.websocket.send_json(message)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # The client went away mid-send
+            logger.info(f"WebSocket send failed for user {self.user_id}: {e}")
+            self._manager.disconnect(self)
+
+    def touch(self) -> None:
+        """Record that the client said something, so it is not idle."""
+        self.last_seen = asyncio.get_running_loop().time()
+
+    def offer(self, message: dict) -> bool:
+        """Queue `message` without waiting; False when the queue is full."""
+        try:
+            self.queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    def stop(self) -> None:
+        if self._sender is not None and not self._sender.done() and self._sender is not asyncio.current_task():
+            self._sender.cancel()
+
+def format_event(message: dict) -> str:
+    """One Server-Sent Events frame for a message bound for a socket.
+
+    Notifications carry their id, which the browser sends back as
+    Last-Event-ID when it reconnects; pings become comments it ignores.
+    """
+    if message == PING:
+        return ": ping\n\n"
+    data = json.dumps(message, default=str)
+    if "event" in message:
+        return f"event: {message['event']}\ndata: {data}\n\n"
+    if message.get("id") is not None:
+        return f"id: {message['id']}\ndata: {data}\n\n"
+    return f"data: {data}\n\n"
+
+class EventStream:
+    """The body of one Server-Sent Events response, held like a WebSocket.
+
+    send_json() waits until the response has taken the previous frame, so a
+    client that stops reading backs up its connection's queue exactly as a
+    stalled socket does.
+    """
+
+    def __init__(self):
+        self._frames: asyncio.Queue = asyncio.Queue(maxsize=1)
+        self.closed = False
+
+    async def accept(self) -> None:
+        pass
+
+    async def send_json(self, message: dict) -> None:
+        if self.closed:
+            raise RuntimeError("event stream closed")
+        await self._frames.put(format_event(message))
+
+    async def close(self, code: int = 1000) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        # Whatever was not taken yet is abandoned with the client
+        while not self._frames.empty():
+            self._frames.get_nowait()
+        self._frames.put_nowait(None)
+
+    async def frames(self) -> AsyncIterator[str]:
+        while True:
+            frame = await self._frames.get()
+            if frame is None:
+                return
+            yield frame
+
+class ConnectionManager:
+    """The sockets this worker holds, any number per user.
+
+    `overflow_policy` decides what happens when a client's queue is full:
+    "drop_oldest" discards its oldest queued message to make room, while
+    "disconnect" closes the socket so the client reconnects and catches up.
+
+    Once started, a single heartbeat task pings every socket each
+    `heartbeat_seconds` and closes those that have sent nothing for
+    `idle_timeout` seconds, which reclaims half-open connections.
+    """
+
+    def __init__(
+        self,
+        queue_size: Optional[int] = None,
+        overflow_policy: Optional[str] = None,
+        max_connections: Optional[int] = None,
+        max_per_user: Optional[int] = None,
+        heartbeat_seconds: Optional[float] = None,
+        idle_timeout: Optional[float] = None
+    ):
+        self.queue_size = settings.WS_SEND_QUEUE_SIZE if queue_size is None else queue_size
+        self.overflow_policy = overflow_policy or settings.WS_OVERFLOW_POLICY
+        if self.overflow_policy not in ("drop_oldest", "disconnect"):
+            raise ValueError(f"Unknown WS_OVERFLOW_POLICY {self.overflow_policy!r}")
+        self.max_connections = settings.WS_MAX_CONNECTIONS if max_connections is None else max_connections
+        self.max_per_user = settings.WS_MAX_CONNECTIONS_PER_USER if max_per_user is None else max_per_user
+        self.heartbeat_seconds = heartbeat_seconds or settings.WS_HEARTBEAT_SECONDS
+        self.idle_timeout = idle_timeout or settings.WS_IDLE_TIMEOUT_SECONDS
+        self.active_connections: Dict[str, Set[Connection]] = {}
+        self.dropped_messages = 0
+        self.slow_disconnects = 0
+        self.idle_disconnects = 0
+        self.rejected_connections = 0
+        self._count = 0
+        self._closing: Set[asyncio.Task] = set()
+        self._heartbeat: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def rejection(self, user_id: Optional[str] = None) -> Optional[int]:
+        """The close code to refuse a new socket with, or None to admit it.
+
+        Cheap enough to call before the token is even decoded, and again
+        once the user is known.
+        """
+        if self._count >= self.max_connections:
+            code = SLOW_CLIENT_CLOSE_CODE
+        elif user_id is not None and len(self.active_connections.get(user_id, ())) >= self.max_per_user:
+            code = POLICY_CLOSE_CODE
+        else:
+            return None
+        self.rejected_connections += 1
+        return code
+
+    async def connect(self, websocket, user_id: str, hold: bool = False, reap_idle: bool = True) -> Connection:
+        """Hold `websocket`, anything with accept(), send_json() and close().
+
+        `reap_idle=False` is for clients that cannot answer pings, such as
+        an EventStream; a dead one still fills its queue and is dropped.
+        """
+        await websocket.accept()
+        connection = Connection(websocket, user_id, self.queue_size, self, hold=hold, reap_idle=reap_idle)
+        self.active_connections.setdefault(user_id, set()).add(connection)
+        self._count += 1
+        logger.info(f"WebSocket connected for user {user_id}")
+        return connection
+
+    def disconnect(self, connection: Connection) -> None:
+        connections = self.active_connections.get(connection.user_id)
+        if connections is not None and connection in connections:
+            connections.discard(connection)
+            self._count -= 1
+            if not connections:
+                del self.active_connections[connection.user_id]
+            logger.info(f"WebSocket disconnected for user {connection.user_id}")
+        connection.stop()
+
+    async def close(self, connection: Connection, code: int = 1000) -> None:
+        self.disconnect(connection)
+        try:
+            # A stalled client may never take the close frame
+            await asyncio.wait_for(connection.websocket.close(code=code), timeout=5)
+        except Exception:
+            pass  # already gone
+
+    def _send(self, connection: Connection, message: dict) -> None:
+        if connection.offer(message):
+            return
+        if self.overflow_policy == "drop_oldest":
+            connection.queue.get_nowait()
+            connection.dropped += 1
+            self.dropped_messages += 1
+            connection.offer(message)
+        else:
+            self.slow_disconnects += 1
+            logger.warning(f"Closing slow WebSocket for user {connection.user_id}")
+            self._close_later(connection, SLOW_CLIENT_CLOSE_CODE)
+
+    def _close_later(self, connection: Connection, code: int) -> None:
+        # Stop queueing at once; the close itself must not hold up delivery
+        self.disconnect(connection)
+        task = asyncio.create_task(self.close(connection, code=code))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def deliver(self, user_id: str, message: dict) -> None:
+        """Broker handler: queue `message` on every socket this worker holds for the user.
+
+        Queueing never waits, so this is a plain loop; each socket's sender
+        task does the actual writes concurrently with the others.
+        """
+        for connection in list(self.active_connections.get(user_id, ())):
+            self._send(connection, message)
+
+    def sweep(self) -> None:
+        """Close sockets idle past `idle_timeout` and ping the rest."""
+        now = asyncio.get_running_loop().time()
+        for user_connections in list(self.active_connections.values()):
+            for connection in list(user_connections):
+                if connection.reap_idle and now - connection.last_seen > self.idle_timeout:
+                    self.idle_disconnects += 1
+                    logger.info(f"Closing idle WebSocket for user {connection.user_id}")
+                    self._close_later(connection, IDLE_CLOSE_CODE)
+                else:
+                    self._send(connection, PING)
+
+    async def _beat(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            try:
+                self.sweep()
+            except Exception:
+                logger.exception("WebSocket heartbeat failed")
+
+    def start(self) -> None:
+        """Start the heartbeat task; call once the event loop is running."""
+        if self._heartbeat is None or self._heartbeat.done():
+            self._heartbeat = asyncio.create_task(self._beat())
+
+    async def close_all(self, code: int = 1001) -> None:
+        """Stop the heartbeat and close every socket at once, e.g. when the worker shuts down."""
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            self._heartbeat = None
+        connections = [c for user_connections in self.active_connections.values() for c in user_connections]
+        await asyncio.gather(*(self.close(connection, code) for connection in connections))
+
+    async def send_notification(self, user_id: str, message: dict) -> None:
+        # Whichever worker holds the user's sockets delivers it
+        await broker.publish(user_id, message)
+
+manager = ConnectionManager()
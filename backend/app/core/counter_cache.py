@@ -0,0 +1,140 @@
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+try:
+    from redis import asyncio as aioredis
+except ImportError:  # only needed for COUNTER_CACHE=redis
+    aioredis = None
+
+from app.config import settings
+
+class CounterCache:
+    """Cached integer counters, e.g. a user's unread notifications.
+
+    The database stays the source of truth: a missing entry means "unknown",
+    so callers recount and set() it, and writers move a known count with
+    add() without ever creating one. Entries expire after `ttl_seconds`,
+    which bounds how long a count filled in a race with a writer stays off.
+    """
+
+    def __init__(self, namespace: str, ttl_seconds: int):
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> Optional[int]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: int) -> None:
+        raise NotImplementedError
+
+    async def add(self, key: str, delta: int) -> None:
+        """Move a known count by `delta`; does nothing for an unknown one."""
+        raise NotImplementedError
+
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+class InMemoryCounterCache(CounterCache):
+    """Counters in this process: one worker only, since writes on other
+    workers would not reach it."""
+
+    def __init__(self, namespace: str, ttl_seconds: int, max_entries: int = 100_000):
+        super().__init__(namespace, ttl_seconds)
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+
+    def _live(self, key: str) -> Optional[int]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    async def get(self, key: str) -> Optional[int]:
+        value = self._live(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: int) -> None:
+        self._entries[key] = (value, time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def add(self, key: str, delta: int) -> None:
+        value = self._live(key)
+        if value is None:
+            return
+        if value + delta < 0:
+            # Drifted from the database; recount on the next read
+            del self._entries[key]
+            return
+        self._entries[key] = (value + delta, self._entries[key][1])
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+# INCRBY only when the key exists, so a delta never invents a count; a
+# count that would go negative has drifted and is dropped instead
+_ADD_IF_PRESENT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then return nil end
+local value = redis.call('INCRBY', KEYS[1], ARGV[1])
+if value < 0 then redis.call('DEL', KEYS[1]) end
+return value
+"""
+
+class RedisCounterCache(CounterCache):
+    """Counters in Redis, shared by every worker."""
+
+    def __init__(self, namespace: str, ttl_seconds: int, client=None):
+        super().__init__(namespace, ttl_seconds)
+        self._client = client
+
+    def _connection(self):
+        if self._client is None:
+            if aioredis is None:
+                raise RuntimeError("COUNTER_CACHE=redis needs the redis package")
+            self._client = aioredis.Redis(
+                host=settings.REDIS_HOST,
+                port=settings.REDIS_PORT,
+                password=settings.REDIS_PASSWORD
+            )
+        return self._client
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    async def get(self, key: str) -> Optional[int]:
+        value = await self._connection().get(self._key(key))
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return int(value)
+
+    async def set(self, key: str, value: int) -> None:
+        await self._connection().set(self._key(key), value, ex=self.ttl_seconds)
+
+    async def add(self, key: str, delta: int) -> None:
+        await self._connection().eval(_ADD_IF_PRESENT, 1, self._key(key), delta)
+
+    async def delete(self, key: str) -> None:
+        await self._connection().delete(self._key(key))
+
+def create_counter_cache(namespace: str, ttl_seconds: int) -> CounterCache:
+    if settings.COUNTER_CACHE == "redis":
+        return RedisCounterCache(namespace, ttl_seconds)
+    if settings.COUNTER_CACHE == "memory":
+        return InMemoryCounterCache(namespace, ttl_seconds)
+    raise ValueError(f"Unknown COUNTER_CACHE {settings.COUNTER_CACHE!r}")
+
+unread_counts = create_counter_cache("unread", settings.UNREAD_COUNT_TTL_SECONDS)
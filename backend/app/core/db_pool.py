@@ -0,0 +1,129 @@
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+
+from app.config import settings
+
+class PoolMetrics:
+    """Counters for one engine's connection pool.
+
+    Wait time is measured around the pool's internal checkout, so it covers
+    both opening a new connection and queueing for a free one; a pool that is
+    starved shows up as a growing wait time and a non-zero timeout count.
+    """
+
+    def __init__(self, name: str, sample_size: int = 1000):
+        self.name = name
+        self.engine = None
+        self._lock = threading.Lock()
+        self._recent_waits = deque(maxlen=sample_size)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            self._recent_waits.append(seconds)
+
+    def attach(self, engine) -> None:
+        self.engine = engine
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "invalidate", self._on_invalidate)
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self._lock:
+            self.checkouts += 1
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connects += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            waits = sorted(self._recent_waits)
+            checkouts, timeouts = self.checkouts, self.timeouts
+            connects, invalidations = self.connects, self.invalidations
+            wait_total, wait_max = self.wait_total, self.wait_max
+        pool = self.engine.pool if self.engine is not None else None
+        queue_pool = isinstance(pool, QueuePool)
+        return {
+            "name": self.name,
+            "pool_class": type(pool).__name__ if pool is not None else None,
+            "size": pool.size() if queue_pool else None,
+            "checked_out": pool.checkedout() if queue_pool else None,
+            "checked_in": pool.checkedin() if queue_pool else None,
+            # QueuePool.overflow() starts at -pool_size; clamp to connections in use
+            "overflow": max(pool.overflow(), 0) if queue_pool else None,
+            "max_overflow": pool._max_overflow if queue_pool else None,
+            "checkouts": checkouts,
+            "timeouts": timeouts,
+            "connects": connects,
+            "invalidations": invalidations,
+            "wait_avg_ms": (sum(waits) / len(waits) * 1000) if waits else 0.0,
+            "wait_p95_ms": waits[max(0, round(len(waits) * 0.95) - 1)] * 1000 if waits else 0.0,
+            "wait_max_ms": wait_max * 1000,
+            "wait_total_ms": wait_total * 1000,
+        }
+
+class _TimedPoolMixin:
+    metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        self.metrics.record_wait(time.perf_counter() - start)
+        return connection
+
+_registry: Dict[str, PoolMetrics] = {}
+
+def _is_memory_sqlite(url: str) -> bool:
+    return url.startswith("sqlite") and (":memory:" in url or url.rstrip("/").endswith(":"))
+
+def pool_options(url: str, name: str, use_async: bool = False) -> dict:
+    """create_engine / create_async_engine keyword arguments for a pooled engine.
+
+    The pool class is a per-engine subclass carrying its PoolMetrics, so the
+    metrics survive Pool.recreate() on engine.dispose().
+    """
+    if _is_memory_sqlite(url):
+        # In-memory SQLite uses a singleton/static pool with no sizing options
+        return {}
+    metrics = _registry.setdefault(name, PoolMetrics(name))
+    base = AsyncAdaptedQueuePool if use_async else QueuePool
+    poolclass = type(f"Timed{base.__name__}", (_TimedPoolMixin, base), {"metrics": metrics})
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+def instrument(engine, name: str) -> None:
+    metrics = _registry.get(name)
+    if metrics is not None:
+        metrics.attach(engine.sync_engine if hasattr(engine, "sync_engine") else engine)
+
+def pool_snapshots() -> List[dict]:
+    return [metrics.snapshot() for metrics in _registry.values()]
@@ -0,0 +1,92 @@
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+# On a streaming replica: zero once everything received has been replayed,
+# otherwise the age of the last replayed transaction
+_PG_REPLICA_LAG = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+def measure_lag(connection) -> float:
+    """Replication lag of the database behind `connection`, in seconds.
+
+    Only PostgreSQL exposes replay progress; any other backend (such as the
+    SQLite file used as a stand-in replica in tests) reports no lag.
+    """
+    if connection.dialect.name == "postgresql":
+        return float(connection.execute(_PG_REPLICA_LAG).scalar() or 0)
+    return 0.0
+
+class ReplicaRouter:
+    """Decides whether read-only work may go to the replica.
+
+    The replica is used while its measured lag is within `max_lag`. A reading
+    is reused for `check_interval` seconds so the probe costs at most one query
+    per interval; an unreachable replica counts as infinitely behind, which
+    sends reads to the primary until the next probe succeeds.
+    """
+
+    def __init__(
+        self,
+        engine=None,
+        async_engine=None,
+        max_lag: float = 5.0,
+        check_interval: float = 2.0,
+        lag_probe: Callable = measure_lag
+    ):
+        self.engine = engine
+        self.async_engine = async_engine
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.lag_probe = lag_probe
+        self.lag: Optional[float] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.engine is not None or self.async_engine is not None
+
+    def _fresh(self) -> bool:
+        return self.lag is not None and time.monotonic() - self._checked_at < self.check_interval
+
+    def _record(self, lag: float) -> bool:
+        if lag > self.max_lag and (self.lag is None or self.lag <= self.max_lag):
+            logger.warning(f"Replica lag {lag:.1f}s exceeds {self.max_lag}s, reading from primary")
+        self.lag = lag
+        self._checked_at = time.monotonic()
+        return lag <= self.max_lag
+
+    def use_replica(self) -> bool:
+        if self.engine is None:
+            return False
+        with self._lock:
+            if self._fresh():
+                return self.lag <= self.max_lag
+            try:
+                with self.engine.connect() as connection:
+                    lag = self.lag_probe(connection)
+            except Exception as e:
+                logger.warning(f"Replica unavailable, reading from primary: {str(e)}")
+                lag = float("inf")
+            return self._record(lag)
+
+    async def use_replica_async(self) -> bool:
+        if self.async_engine is None:
+            return False
+        if self._fresh():
+            return self.lag <= self.max_lag
+        try:
+            async with self.async_engine.connect() as connection:
+                lag = await connection.run_sync(self.lag_probe)
+        except Exception as e:
+            logger.warning(f"Replica unavailable, reading from primary: {str(e)}")
+            lag = float("inf")
+        return self._record(lag)
@@ -0,0 +1,62 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from fastapi import HTTPException, status
+
+from app.config import settings
+from app.utils.password import get_password_hash, verify_password
+
+logger = logging.getLogger(__name__)
+
+class PasswordHasher:
+    """Runs bcrypt on a small thread pool so it never blocks the event loop.
+
+    bcrypt releases the GIL, so `workers` threads hash in parallel. At most
+    `queue_limit` hashes may be running or waiting; past that, callers get
+    an immediate 503 instead of queueing behind a login burst.
+    """
+
+    def __init__(self, workers: Optional[int] = None, queue_limit: Optional[int] = None):
+        self.workers = workers or settings.PASSWORD_HASH_WORKERS
+        self.queue_limit = queue_limit or settings.PASSWORD_HASH_QUEUE_LIMIT
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    async def _run(self, fn, *args):
+        # Only touched on the event loop, so a plain counter is enough
+        if self.pending >= self.queue_limit:
+            self.rejected += 1
+            logger.warning("Password hashing saturated, rejecting request")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many sign-ins in progress, try again shortly",
+                headers={"Retry-After": "1"}
+            )
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._pool(), fn, *args)
+        finally:
+            self.pending -= 1
+            self.completed += 1
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(get_password_hash, password)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+password_hasher = PasswordHasher()
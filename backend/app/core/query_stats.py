@@ -0,0 +1,145 @@
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Expanded IN lists differ only in their number of placeholders
+_IN_LIST = re.compile(r"IN \((?:\?|%\(\w+\)s|\$\d+|:\w+)(?:, *(?:\?|%\(\w+\)s|\$\d+|:\w+))*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+def statement_shape(statement: str) -> str:
+    """The statement with IN lists collapsed, so repeats of one query compare equal."""
+    return _IN_LIST.sub("IN (...)", _WHITESPACE.sub(" ", statement).strip())
+
+class RequestQueryStats:
+    """Statements and DB time for one request (or one `track()` block)."""
+
+    def __init__(self, n_plus_one_threshold: Optional[int] = None):
+        self.n_plus_one_threshold = n_plus_one_threshold or settings.N_PLUS_ONE_THRESHOLD
+        self.queries = 0
+        self.db_time = 0.0
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, duration: float) -> None:
+        self.queries += 1
+        self.db_time += duration
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self) -> Dict[str, int]:
+        """Statement shapes that ran more than the N+1 threshold."""
+        return {
+            shape: count for shape, count in self.shapes.items()
+            if count > self.n_plus_one_threshold
+        }
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.db_time * 1000:.2f};desc="{self.queries} queries"'
+
+_current: ContextVar[Optional[RequestQueryStats]] = ContextVar("query_stats", default=None)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_stats_start", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    starts = conn.info.get("query_stats_start")
+    if stats is not None and starts:
+        stats.record(statement, time.perf_counter() - starts.pop())
+
+def instrument(engine) -> None:
+    """Count statements run on `engine` against the active request."""
+    target = engine.sync_engine if hasattr(engine, "sync_engine") else engine
+    event.listen(target, "before_cursor_execute", _before_cursor_execute)
+    event.listen(target, "after_cursor_execute", _after_cursor_execute)
+
+@contextmanager
+def track(label: str = "block", n_plus_one_threshold: Optional[int] = None):
+    """Count statements issued inside the block and warn about N+1 patterns."""
+    stats = RequestQueryStats(n_plus_one_threshold)
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+        for shape, count in stats.repeated().items():
+            logger.warning(f"Possible N+1 in {label}: statement ran {count} times: {shape[:200]}")
+
+class EndpointQueryStats:
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint
+        self.requests = 0
+        self.queries = 0
+        self.queries_max = 0
+        self.db_time = 0.0
+        self.db_time_max = 0.0
+        self.n_plus_one_warnings = 0
+
+    def add(self, stats: RequestQueryStats) -> None:
+        self.requests += 1
+        self.queries += stats.queries
+        self.queries_max = max(self.queries_max, stats.queries)
+        self.db_time += stats.db_time
+        self.db_time_max = max(self.db_time_max, stats.db_time)
+        if stats.repeated():
+            self.n_plus_one_warnings += 1
+
+    def snapshot(self) -> dict:
+        return {
+            "endpoint": self.endpoint,
+            "requests": self.requests,
+            "queries": self.queries,
+            "queries_avg": self.queries / self.requests if self.requests else 0.0,
+            "queries_max": self.queries_max,
+            "db_time_ms": self.db_time * 1000,
+            "db_time_avg_ms": self.db_time * 1000 / self.requests if self.requests else 0.0,
+            "db_time_max_ms": self.db_time_max * 1000,
+            "n_plus_one_warnings": self.n_plus_one_warnings,
+        }
+
+def route_template(path: str, route_path: str) -> str:
+    """Group requests by route so /jobs/1 and /jobs/2 share one entry.
+
+    Depending on the FastAPI version the matched route's path may leave out
+    the include_router prefix; that prefix is taken from the request path.
+    """
+    extra = path.count("/") - route_path.count("/")
+    if extra <= 0:
+        return route_path
+    return "/".join(path.split("/")[:extra + 1]) + route_path
+
+_endpoints: Dict[str, EndpointQueryStats] = {}
+_endpoints_lock = threading.Lock()
+
+def record_request(endpoint: str, stats: RequestQueryStats) -> None:
+    with _endpoints_lock:
+        _endpoints.setdefault(endpoint, EndpointQueryStats(endpoint)).add(stats)
+
+def endpoint_snapshots() -> List[dict]:
+    """Per-endpoint totals, heaviest DB time first."""
+    with _endpoints_lock:
+        snapshots = [stats.snapshot() for stats in _endpoints.values()]
+    return sorted(snapshots, key=lambda s: s["db_time_ms"], reverse=True)
+
+def reset() -> None:
+    with _endpoints_lock:
+        _endpoints.clear()
+
+_SERVER_TIMING_DB = re.compile(r'db;dur=([\d.]+);desc="(\d+) queries"')
+
+def parse_server_timing(header: str) -> Optional[dict]:
+    """Read the DB entry written by `RequestQueryStats.server_timing`."""
+    match = _SERVER_TIMING_DB.search(header or "")
+    if not match:
+        return None
+    return {"db_time_ms": float(match.group(1)), "queries": int(match.group(2))}
@@ -0,0 +1,201 @@
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+
+try:
+    import greenlet
+except ImportError:  # only needed to attribute AsyncSession statements
+    greenlet = None
+
+from app.config import settings
+from app.core.query_stats import statement_shape
+
+_EXPLAINABLE = ("SELECT", "UPDATE", "DELETE", "WITH")
+_CALLER_PREFIXES = ("app.services.", "app.routes.")
+
+def _frame_label(frame) -> Optional[str]:
+    module = frame.f_globals.get("__name__", "")
+    if not module.startswith(_CALLER_PREFIXES):
+        return None
+    owner = frame.f_locals.get("self")
+    if owner is not None:
+        return f"{type(owner).__name__}.{frame.f_code.co_name}"
+    return f"{module}.{frame.f_code.co_name}"
+
+def _walk(frame) -> Optional[str]:
+    while frame is not None:
+        label = _frame_label(frame)
+        if label:
+            return label
+        frame = frame.f_back
+    return None
+
+def find_caller() -> Optional[str]:
+    """The innermost service method (or route) that issued the statement.
+
+    Statements from an AsyncSession run in a greenlet whose own stack stops
+    at SQLAlchemy; the awaiting service coroutine is on the stack of the
+    parent greenlet, which is suspended while the statement runs.
+    """
+    label = _walk(sys._getframe(1))
+    if label is None and greenlet is not None:
+        current = greenlet.getcurrent()
+        while label is None and current.parent is not None:
+            current = current.parent
+            label = _walk(current.gr_frame)
+    return label
+
+def explain(connection, statement: str, parameters) -> Optional[str]:
+    """The database's plan for `statement`, or None if it cannot be explained."""
+    if not statement.lstrip().upper().startswith(_EXPLAINABLE):
+        return None
+    prefix = "EXPLAIN QUERY PLAN " if connection.dialect.name == "sqlite" else "EXPLAIN "
+    cursor = connection.connection.cursor()
+    try:
+        cursor.execute(prefix + statement, parameters)
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+    if connection.dialect.name == "sqlite":
+        # (id, parent, notused, detail)
+        return "\n".join(row[-1] for row in rows)
+    return "\n".join(str(row[0]) for row in rows)
+
+class SlowStatement:
+    def __init__(self, shape: str):
+        self.shape = shape
+        self.count = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.callers: Dict[str, int] = {}
+        self.last_parameters: Optional[str] = None
+        self.last_plan: Optional[str] = None
+        self.last_seen: Optional[datetime] = None
+
+    def snapshot(self) -> dict:
+        return {
+            "statement": self.shape,
+            "count": self.count,
+            "total_ms": self.total_time * 1000,
+            "avg_ms": self.total_time * 1000 / self.count if self.count else 0.0,
+            "max_ms": self.max_time * 1000,
+            "callers": self.callers,
+            "last_parameters": self.last_parameters,
+            "last_plan": self.last_plan,
+            "last_seen": self.last_seen,
+        }
+
+class SlowQueryRecorder:
+    """Records statements slower than `threshold_ms`, with their plan.
+
+    Each slow statement is appended as one JSON line to a rotating file and
+    folded into per-statement totals for the admin endpoint. The plan is
+    taken right after the statement on the same connection, so it reflects
+    the data the statement actually ran against.
+    """
+
+    def __init__(
+        self,
+        threshold_ms: float,
+        log_file: Optional[str] = None,
+        max_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 5,
+        capture_plan: bool = True
+    ):
+        self.threshold = threshold_ms / 1000
+        self.capture_plan = capture_plan
+        self.statements: Dict[str, SlowStatement] = {}
+        self._lock = threading.Lock()
+        self._file_logger = None
+        if log_file:
+            directory = os.path.dirname(log_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            handler = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count)
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            self._file_logger = logging.getLogger(f"{__name__}.file.{id(self)}")
+            self._file_logger.propagate = False
+            self._file_logger.setLevel(logging.INFO)
+            self._file_logger.addHandler(handler)
+
+    def attach(self, engine) -> None:
+        target = engine.sync_engine if hasattr(engine, "sync_engine") else engine
+        event.listen(target, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(target, "after_cursor_execute", self._after_cursor_execute)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("slow_query_start", []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("slow_query_start")
+        if not starts:
+            return
+        duration = time.perf_counter() - starts.pop()
+        if duration < self.threshold:
+            return
+        plan = None
+        if self.capture_plan and not executemany:
+            try:
+                plan = explain(conn, statement, parameters)
+            except Exception as e:
+                plan = f"EXPLAIN failed: {str(e)}"
+        self.record(statement, parameters, duration, find_caller(), plan)
+
+    def record(self, statement: str, parameters, duration: float, caller: Optional[str], plan: Optional[str]) -> None:
+        now = datetime.utcnow()
+        params = repr(parameters)[:1000]
+        shape = statement_shape(statement)
+        with self._lock:
+            entry = self.statements.setdefault(shape, SlowStatement(shape))
+            entry.count += 1
+            entry.total_time += duration
+            entry.max_time = max(entry.max_time, duration)
+            caller_key = caller or "unknown"
+            entry.callers[caller_key] = entry.callers.get(caller_key, 0) + 1
+            entry.last_parameters = params
+            entry.last_plan = plan
+            entry.last_seen = now
+        if self._file_logger is not None:
+            self._file_logger.info(json.dumps({
+                "timestamp": now.isoformat(),
+                "duration_ms": round(duration * 1000, 3),
+                "caller": caller,
+                "statement": statement,
+                "parameters": params,
+                "plan": plan,
+            }))
+
+    def ranked(self, limit: int = 50) -> List[dict]:
+        """Slow statements ordered by the total time spent in them."""
+        with self._lock:
+            snapshots = [entry.snapshot() for entry in self.statements.values()]
+        snapshots.sort(key=lambda s: s["total_ms"], reverse=True)
+        return snapshots[:limit]
+
+    def reset(self) -> None:
+        with self._lock:
+            self.statements.clear()
+
+recorder: Optional[SlowQueryRecorder] = None
+
+def instrument(engine) -> None:
+    """Attach the shared recorder to `engine` when SLOW_QUERY_LOG_ENABLED is set."""
+    global recorder
+    if not settings.SLOW_QUERY_LOG_ENABLED:
+        return
+    if recorder is None:
+        recorder = SlowQueryRecorder(
+            settings.SLOW_QUERY_THRESHOLD_MS,
+            settings.SLOW_QUERY_LOG_FILE,
+            settings.SLOW_QUERY_LOG_MAX_BYTES,
+            settings.SLOW_QUERY_LOG_BACKUP_COUNT
+        )
+    recorder.attach(engine)
@@ -1,16 +1,85 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
+from app.core.db_pool import pool_options, instrument
+from app.core.db_router import ReplicaRouter
+from app.core import query_stats, slow_query_log
 
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 
+def to_async_url(url: str) -> str:
+    """Map a sync database URL onto the matching asyncio driver."""
+    if url.startswith("sqlite:"):
+        return url.replace("sqlite:", "sqlite+aiosqlite:", 1)
+    if url.startswith("postgresql:") or url.startswith("postgres:"):
+        return "postgresql+asyncpg:" + url.split(":", 1)[1]
+    if url.startswith("postgresql+psycopg2:"):
+        return url.replace("postgresql+psycopg2:", "postgresql+asyncpg:", 1)
+    return url
+
+ASYNC_DATABASE_URL = settings.ASYNC_DATABASE_URL or to_async_url(SQLALCHEMY_DATABASE_URL)
+
 # Create SQLAlchemy engine
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL, **pool_options(SQLALCHEMY_DATABASE_URL, "primary")
+)
+instrument(engine, "primary")
+query_stats.instrument(engine)
+slow_query_log.instrument(engine)
+
+# Create asyncio engine for routes that await their queries
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL, **pool_options(ASYNC_DATABASE_URL, "primary_async", use_async=True)
+)
+instrument(async_engine, "primary_async")
+query_stats.instrument(async_engine)
+slow_query_log.instrument(async_engine)
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Attributes stay loaded after commit: an expired attribute would need a
+# lazy refresh, which an AsyncSession cannot do implicitly
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+# Optional read replica for read-only endpoints
+REPLICA_DATABASE_URL = settings.REPLICA_DATABASE_URL
+replica_engine = None
+async_replica_engine = None
+if REPLICA_DATABASE_URL:
+    replica_engine = create_engine(
+        REPLICA_DATABASE_URL, **pool_options(REPLICA_DATABASE_URL, "replica")
+    )
+    instrument(replica_engine, "replica")
+    query_stats.instrument(replica_engine)
+    slow_query_log.instrument(replica_engine)
+    ASYNC_REPLICA_DATABASE_URL = (
+        settings.ASYNC_REPLICA_DATABASE_URL or to_async_url(REPLICA_DATABASE_URL)
+    )
+    async_replica_engine = create_async_engine(
+        ASYNC_REPLICA_DATABASE_URL,
+        **pool_options(ASYNC_REPLICA_DATABASE_URL, "replica_async", use_async=True)
+    )
+    instrument(async_replica_engine, "replica_async")
+    query_stats.instrument(async_replica_engine)
+    slow_query_log.instrument(async_replica_engine)
+
+ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+AsyncReplicaSessionLocal = async_sessionmaker(
+    bind=async_replica_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+replica_router = ReplicaRouter(
+    replica_engine,
+    async_replica_engine,
+    max_lag=settings.REPLICA_MAX_LAG_SECONDS,
+    check_interval=settings.REPLICA_LAG_CHECK_INTERVAL
+)
+
 # Create Base class
 Base = declarative_base()
 
@@ -20,4 +89,24 @@ def get_db():
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+# Dependency to get an asyncio DB session
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# Dependency for read-only work: the replica while it is within the lag
+# budget, the primary otherwise. Never use it where the request writes or
+# must see its own writes.
+def get_read_db():
+    db = ReplicaSessionLocal() if replica_router.use_replica() else SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_read_db():
+    factory = AsyncReplicaSessionLocal if await replica_router.use_replica_async() else AsyncSessionLocal
+    async with factory() as db:
+        yield db
@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
@@ -6,6 +7,7 @@ from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from app.routes import (
     auth,
+    user,
     provider,
     job,
     booking,
@@ -13,10 +15,16 @@ from app.routes import (
     analytics,
     review,
     earnings,
-    notifications
+    notifications,
+    admin,
+    search
 )
 from app.database import engine, Base
 from app.config import settings
+from app.core import query_stats
+from app.core.broker import broker
+from app.core.password_hasher import password_hasher
+from app.services.notification_writer import notification_writer
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
@@ -24,10 +32,24 @@ Base.metadata.create_all(bind=engine)
 # Initialize rate limiter
 limiter = Limiter(key_func=get_remote_address)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Each worker subscribes once and routes messages to its own sockets
+    await broker.start(notifications.manager.deliver)
+    notifications.manager.start()
+    notification_writer.start()
+    yield
+    # Buffered notifications are written and pushed before the broker goes
+    await notification_writer.stop()
+    await broker.stop()
+    await notifications.manager.close_all()
+    password_hasher.shutdown()
+
 app = FastAPI(
     title="Connectify Nigeria API",
     description="API for Connectify Nigeria - Service Provider Platform",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Add rate limiter to app state
@@ -41,7 +63,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
     allow_headers=["*"],
-    expose_headers=["Content-Type", "Authorization"],
+    expose_headers=["Content-Type", "Authorization", "X-Next-Cursor"],
     max_age=3600,
 )
 
@@ -53,6 +75,7 @@ app.add_middleware(
 
 # Include routers
 app.include_router(auth.router, prefix="/api/v1")
+app.include_router(user.router, prefix="/api/v1")
 app.include_router(provider.router, prefix="/api/v1")
 app.include_router(job.router, prefix="/api/v1")
 app.include_router(booking.router, prefix="/api/v1")
@@ -61,6 +84,8 @@ app.include_router(analytics.router, prefix="/api/v1")
 app.include_router(review.router, prefix="/api/v1")
 app.include_router(earnings.router, prefix="/api/v1")
 app.include_router(notifications.router, prefix="/api/v1")
+app.include_router(admin.router, prefix="/api/v1")
+app.include_router(search.router, prefix="/api/v1")
 
 # Add WebSocket CORS middleware
 @app.middleware("http")
@@ -80,6 +105,20 @@ async def root():
         "docs_url": "/docs"
     }
 
+@app.middleware("http")
+async def count_queries(request: Request, call_next):
+    if not settings.QUERY_STATS_ENABLED:
+        return await call_next(request)
+    label = f"{request.method} {request.url.path}"
+    with query_stats.track(label) as stats:
+        response = await call_next(request)
+    route = request.scope.get("route")
+    endpoint = f"{request.method} {query_stats.route_template(request.url.path, route.path)}" \
+        if route is not None else label
+    query_stats.record_request(endpoint, stats)
+    response.headers["Server-Timing"] = stats.server_timing()
+    return response
+
 @app.middleware("http")
 async def add_security_headers(request: Request, call_next):
     response = await call_next(request)
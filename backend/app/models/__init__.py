@@ -5,6 +5,12 @@ from .review import Review
 from .payment import Payment
 from .booking import Booking
 from .service import Service
+from .notification import Notification, ArchivedNotification
+from .provider_daily_stats import ProviderDailyStats
+from .provider_search_token import ProviderSearchToken
+from .provider_availability import ProviderAvailability
+from .booking_slot_claim import BookingSlotClaim
+from .refresh_token import RefreshToken
 
 __all__ = [
     'User',
@@ -15,5 +21,12 @@ __all__ = [
     'Review',
     'Payment',
     'Booking',
-    'Service'
+    'Service',
+    'Notification',
+    'ArchivedNotification',
+    'ProviderDailyStats',
+    'ProviderSearchToken',
+    'ProviderAvailability',
+    'BookingSlotClaim',
+    'RefreshToken'
 ] 
\ No newline at end of file
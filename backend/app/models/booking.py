@@ -1,12 +1,20 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
+import uuid
 
 class Booking(Base):
     __tablename__ = "bookings"
+    __table_args__ = (
+        Index("ix_bookings_provider_date", "provider_id", "date"),
+        Index("ix_bookings_customer_date", "customer_id", "date"),
+        # Keyset pages of GET /bookings, newest first
+        Index("ix_bookings_provider_created_id", "provider_id", "created_at", "id"),
+        Index("ix_bookings_customer_created_id", "customer_id", "created_at", "id"),
+    )
 
-    id = Column(String, primary_key=True, index=True)
+    id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
     service_id = Column(String, ForeignKey("services.id"), nullable=False)
     provider_id = Column(String, ForeignKey("providers.id"), nullable=False)
     customer_id = Column(String, ForeignKey("users.id"), nullable=False)
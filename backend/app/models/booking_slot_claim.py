@@ -0,0 +1,28 @@
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index
+from app.database import Base
+
+class BookingSlotClaim(Base):
+    """One SLOT_STEP_MINUTES slot of a provider's time, held or booked.
+
+    The primary key makes claiming atomic: two bookings or holds that
+    overlap share at least one slot, so only the first insert succeeds.
+    A hold has hold_id and expires_at set and no booking_id; confirming it
+    moves the rows over to the booking. Expired holds are deleted by the
+    next claim that wants their slots.
+    """
+    __tablename__ = "booking_slot_claims"
+
+    provider_id = Column(String, ForeignKey("providers.id"), primary_key=True)
+    slot_start = Column(DateTime, primary_key=True)
+    booking_id = Column(String, ForeignKey("bookings.id", ondelete="CASCADE"), nullable=True)
+    hold_id = Column(String, nullable=True)
+    customer_id = Column(String, ForeignKey("users.id"), nullable=False)
+    expires_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_booking_slot_claims_booking_id", "booking_id"),
+        Index("ix_booking_slot_claims_hold_id", "hold_id"),
+    )
+
+    def __repr__(self):
+        return f"<BookingSlotClaim {self.provider_id} {self.slot_start} booking={self.booking_id} hold={self.hold_id}>"
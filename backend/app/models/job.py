@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Float, DateTime, ForeignKey, Text
+from sqlalchemy import Column, String, Float, DateTime, ForeignKey, Text, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -15,11 +15,20 @@ class JobStatus(Enum):
 
 class Job(Base):
     __tablename__ = "jobs"
+    __table_args__ = (
+        # Provider dashboards filter by status and sort by creation time
+        Index("ix_jobs_provider_status_created", "provider_id", "status", "created_at"),
+        Index("ix_jobs_customer_id", "customer_id"),
+        # Keyset pages of /api/jobs/{provider,customer}/me, newest first
+        Index("ix_jobs_provider_created_id", "provider_id", "created_at", "id"),
+        Index("ix_jobs_customer_created_id", "customer_id", "created_at", "id"),
+    )
 
     id = Column(String, primary_key=True, index=True)
     title = Column(String, nullable=False)
     description = Column(Text, nullable=False)
     status = Column(String, nullable=False, default="pending")
+    service_type = Column(String)
     amount = Column(Float, nullable=False)
     
     # Foreign keys
@@ -34,6 +43,9 @@ class Job(Base):
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    completed_at = Column(DateTime)
+    # First move off pending; the provider's response time ends here
+    responded_at = Column(DateTime)
 
     def __repr__(self):
         return f"<Job {self.id} - {self.title}>" 
\ No newline at end of file
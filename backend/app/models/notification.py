@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, JSON, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -6,6 +6,13 @@ from app.database import Base
 
 class Notification(Base):
     __tablename__ = "notifications"
+    __table_args__ = (
+        # Unread lookups and the newest-first inbox for a user
+        Index("ix_notifications_user_read_created", "user_id", "is_read", "created_at"),
+        Index("ix_notifications_user_created_id", "user_id", "created_at", "id"),
+        # Replay of everything after the last id a reconnecting socket saw
+        Index("ix_notifications_user_id_id", "user_id", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(String(36), ForeignKey("users.id"))
@@ -16,4 +23,26 @@ class Notification(Base):
     is_read = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
 
-    user = relationship("User", back_populates="notifications") 
\ No newline at end of file
+    user = relationship("User", back_populates="notifications")
+
+
+class ArchivedNotification(Base):
+    """Cold storage for read notifications compacted out of `notifications`.
+
+    Rows keep their original id; nothing in the app reads them, so only the
+    per-user history index is kept.
+    """
+    __tablename__ = "notification_archive"
+    __table_args__ = (
+        Index("ix_notification_archive_user_created_id", "user_id", "created_at", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    user_id = Column(String(36), nullable=False)
+    title = Column(String)
+    message = Column(String)
+    type = Column(String)
+    data = Column(JSON, nullable=True)
+    is_read = Column(Boolean, default=True)
+    created_at = Column(DateTime)
+    archived_at = Column(DateTime, default=datetime.utcnow, nullable=False)
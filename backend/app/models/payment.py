@@ -1,10 +1,17 @@
-from sqlalchemy import Column, String, Float, ForeignKey, DateTime
+from sqlalchemy import Column, String, Float, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
 
 class Payment(Base):
     __tablename__ = "payments"
+    __table_args__ = (
+        Index("ix_payments_user_id", "user_id"),
+        # Earnings join payments to a provider's jobs
+        Index("ix_payments_job_id", "job_id"),
+        # Keyset pages of GET /payments, newest first
+        Index("ix_payments_user_created_id", "user_id", "created_at", "id"),
+    )
 
     id = Column(String, primary_key=True, index=True)
     amount = Column(Float, nullable=False)
@@ -12,6 +19,7 @@ class Payment(Base):
     status = Column(String, nullable=False, default="pending")
     payment_method = Column(String, nullable=False)
     user_id = Column(String, ForeignKey("users.id"), nullable=False)
+    job_id = Column(String, ForeignKey("jobs.id"))
     
     # Relationships
     user = relationship("User", back_populates="payments")
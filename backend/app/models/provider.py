@@ -1,13 +1,21 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, JSON, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, JSON, ForeignKey, Text, Index, event
 from sqlalchemy.orm import relationship
 from app.database import Base
+from app.utils.geo import geohash_encode
 import uuid
 
 class Provider(Base):
     __tablename__ = "providers"
 
-    id = Column(String, primary_key=True, index=True)
+    __table_args__ = (
+        # Search filters on verification and orders by rating
+        Index("ix_providers_verified_rating", "is_verified", "rating"),
+        # Nearby search scans geohash prefix ranges
+        Index("ix_providers_geohash", "geohash"),
+    )
+
+    id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(String, ForeignKey("users.id"), nullable=False, unique=True)
     business_name = Column(String, nullable=False)
     business_address = Column(String, nullable=False)
@@ -17,9 +25,20 @@ class Provider(Base):
     service_categories = Column(JSON, nullable=False)  # Store as JSON array
     service_areas = Column(JSON, nullable=False)  # Store as JSON array
     availability = Column(Text, nullable=False)  # JSON string of availability
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+    geohash = Column(String(12), nullable=True)  # Derived from latitude/longitude
     is_verified = Column(Boolean, default=False)
     rating = Column(Float, default=0.0)
     total_reviews = Column(Integer, default=0)
+    # Running aggregates of the provider's reviews, kept by
+    # ProviderRatingService; rating is rating_sum / total_reviews
+    rating_sum = Column(Float, nullable=False, default=0.0)
+    rating_1_count = Column(Integer, nullable=False, default=0)
+    rating_2_count = Column(Integer, nullable=False, default=0)
+    rating_3_count = Column(Integer, nullable=False, default=0)
+    rating_4_count = Column(Integer, nullable=False, default=0)
+    rating_5_count = Column(Integer, nullable=False, default=0)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -31,4 +50,12 @@ class Provider(Base):
     services = relationship("Service", back_populates="provider")
 
     def __repr__(self):
-        return f"<Provider {self.id} - {self.business_name}>" 
\ No newline at end of file
+        return f"<Provider {self.id} - {self.business_name}>"
+
+@event.listens_for(Provider, "before_insert")
+@event.listens_for(Provider, "before_update")
+def _set_geohash(mapper, connection, target):
+    if target.latitude is None or target.longitude is None:
+        target.geohash = None
+    else:
+        target.geohash = geohash_encode(target.latitude, target.longitude)
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
+from app.database import Base
+
+class ProviderAvailability(Base):
+    """One weekly opening window of a provider, e.g. Saturday 09:00-13:00.
+
+    Normalized from the Provider.availability JSON by AvailabilityService
+    whenever it is saved; the JSON column keeps the canonical form.
+    """
+    __tablename__ = "provider_availability"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    provider_id = Column(String, ForeignKey("providers.id", ondelete="CASCADE"), nullable=False)
+    weekday = Column(Integer, nullable=False)  # 0 = Monday
+    start_minute = Column(Integer, nullable=False)  # minutes after midnight
+    end_minute = Column(Integer, nullable=False)  # exclusive, at most 24 * 60
+
+    __table_args__ = (
+        Index("ix_provider_availability_provider_id", "provider_id"),
+        Index("ix_provider_availability_weekday_start", "weekday", "start_minute"),
+    )
+
+    def __repr__(self):
+        return f"<ProviderAvailability {self.provider_id} {self.weekday} {self.start_minute}-{self.end_minute}>"
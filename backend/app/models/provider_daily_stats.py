@@ -0,0 +1,35 @@
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, ForeignKey
+from datetime import datetime
+from app.database import Base
+
+class ProviderDailyStats(Base):
+    """Per-provider, per-day rollup of jobs, reviews and payments.
+
+    Rows are maintained incrementally by ProviderDailyStatsService in the same
+    transaction as the underlying write, and can be rebuilt from the base
+    tables with scripts/backfill_provider_daily_stats.py.
+    """
+    __tablename__ = "provider_daily_stats"
+
+    provider_id = Column(String, ForeignKey("providers.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+
+    # Jobs created on this day
+    booking_count = Column(Integer, nullable=False, default=0)
+    # Jobs completed on this day
+    completed_count = Column(Integer, nullable=False, default=0)
+    completed_revenue = Column(Float, nullable=False, default=0.0)
+    # Reviews created on this day
+    review_count = Column(Integer, nullable=False, default=0)
+    review_sum = Column(Float, nullable=False, default=0.0)
+    # Hours from creation to first status change, for jobs created on this day
+    response_count = Column(Integer, nullable=False, default=0)
+    response_time_sum = Column(Float, nullable=False, default=0.0)
+    # Payments created on this day, by current status
+    paid_amount = Column(Float, nullable=False, default=0.0)
+    pending_amount = Column(Float, nullable=False, default=0.0)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<ProviderDailyStats {self.provider_id} {self.day}>"
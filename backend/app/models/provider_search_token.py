@@ -0,0 +1,25 @@
+from sqlalchemy import Column, String, ForeignKey, Index
+from app.database import Base
+
+class ProviderSearchToken(Base):
+    """Inverted index from category and service-area words to providers.
+
+    Provider.service_categories and Provider.service_areas are JSON columns
+    that cannot be indexed, so every word of every entry gets a row here,
+    and so does every whole entry, normalised, under "<kind>_exact".
+    Rows are rewritten by ProviderSearchService whenever a provider is saved
+    and can be rebuilt with scripts/rebuild_provider_search_index.py.
+    """
+    __tablename__ = "provider_search_tokens"
+
+    # token first so both exact and prefix lookups are index range scans
+    token = Column(String, primary_key=True)
+    kind = Column(String, primary_key=True)  # "category", "area", "category_exact" or "area_exact"
+    provider_id = Column(String, ForeignKey("providers.id", ondelete="CASCADE"), primary_key=True)
+
+    __table_args__ = (
+        Index("ix_provider_search_tokens_provider_id", "provider_id"),
+    )
+
+    def __repr__(self):
+        return f"<ProviderSearchToken {self.kind}:{self.token} -> {self.provider_id}>"
@@ -0,0 +1,29 @@
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index
+from app.database import Base
+
+class RefreshToken(Base):
+    """One refresh token, keyed by the HMAC of the token itself.
+
+    Tokens are single use: refreshing marks the row used and issues the next
+    token of the same family. A used token coming back means a copy leaked,
+    so the whole family is revoked.
+    """
+    __tablename__ = "refresh_tokens"
+
+    token_hash = Column(String(64), primary_key=True)
+    user_id = Column(String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    # Every token rotated from the same login
+    family_id = Column(String(36), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+    used_at = Column(DateTime, nullable=True)
+    revoked_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_refresh_tokens_family_id", "family_id"),
+        Index("ix_refresh_tokens_user_id", "user_id"),
+    )
+
+    def __repr__(self):
+        return f"<RefreshToken user={self.user_id} family={self.family_id}>"
@@ -1,18 +1,27 @@
-from sqlalchemy import Column, Float, String, ForeignKey, DateTime, Text
+from sqlalchemy import Column, Float, String, ForeignKey, DateTime, Text, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database import Base
+import uuid
+from datetime import datetime
 
 class Review(Base):
     __tablename__ = "reviews"
+    __table_args__ = (
+        Index("ix_reviews_provider_created", "provider_id", "created_at"),
+        # Keyset pages of a provider's reviews, newest first
+        Index("ix_reviews_provider_created_id", "provider_id", "created_at", "id"),
+    )
 
-    id = Column(String, primary_key=True, index=True)
+    id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
     job_id = Column(String, ForeignKey("jobs.id", ondelete="CASCADE"), nullable=False)
     provider_id = Column(String, ForeignKey("providers.id", ondelete="CASCADE"), nullable=False)
     customer_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     rating = Column(Float, nullable=False)
     comment = Column(Text, nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Set in Python: SQLite's CURRENT_TIMESTAMP drops the fraction, and the
+    # keyset cursor compares against a value bound with one
+    created_at = Column(DateTime(timezone=True), default=datetime.utcnow)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relationships
@@ -0,0 +1,66 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import List
+
+from app.models.user import User
+from app.auth.auth import get_current_active_user
+from app.auth.principal_cache import principal_cache
+from app.core.db_pool import pool_snapshots
+from app.core import slow_query_log
+from app.core.query_stats import endpoint_snapshots
+from app.schemas.admin import PoolStats, EndpointQueryStats, SlowQueryStats, PrincipalCacheStats
+
+router = APIRouter(prefix="/api/admin", tags=["admin"])
+
+@router.get("/db/pool", response_model=List[PoolStats])
+async def get_pool_stats(
+    current_user: User = Depends(get_current_active_user)
+):
+    """Live connection pool usage for every engine the app has created"""
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=403,
+            detail="Not authorized to access pool metrics"
+        )
+    return pool_snapshots()
+
+@router.get("/db/queries", response_model=List[EndpointQueryStats])
+async def get_query_stats(
+    current_user: User = Depends(get_current_active_user)
+):
+    """Statement counts and DB time per endpoint since the worker started"""
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=403,
+            detail="Not authorized to access query metrics"
+        )
+    return endpoint_snapshots()
+
+@router.get("/db/slow-queries", response_model=List[SlowQueryStats])
+async def get_slow_queries(
+    limit: int = Query(20, ge=1, le=200),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Statements over SLOW_QUERY_THRESHOLD_MS, ranked by total time spent in them"""
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=403,
+            detail="Not authorized to access query metrics"
+        )
+    if slow_query_log.recorder is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Slow query log is disabled, set SLOW_QUERY_LOG_ENABLED to turn it on"
+        )
+    return slow_query_log.recorder.ranked(limit)
+
+@router.get("/cache/principals", response_model=PrincipalCacheStats)
+async def get_principal_cache_stats(
+    current_user: User = Depends(get_current_active_user)
+):
+    """Hit and miss counts of this worker's authenticated-user cache"""
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=403,
+            detail="Not authorized to access cache metrics"
+        )
+    return principal_cache.snapshot()
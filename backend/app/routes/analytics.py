@@ -4,7 +4,7 @@ from typing import List, Dict
 from datetime import datetime, timedelta
 from sqlalchemy import func
 
-from app.database import get_db
+from app.database import get_read_db
 from app.models.user import User
 from app.models.job import Job
 from app.models.review import Review
@@ -23,7 +23,7 @@ router = APIRouter(prefix="/api/analytics", tags=["analytics"])
 @router.get("/dashboard", response_model=DashboardStats)
 async def get_dashboard_stats(
     time_range: TimeRange = TimeRange.MONTH,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     if current_user.role != "admin":
@@ -75,7 +75,7 @@ async def get_dashboard_stats(
 @router.get("/revenue", response_model=RevenueStats)
 async def get_revenue_stats(
     time_range: TimeRange = TimeRange.MONTH,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     if current_user.role != "admin":
@@ -129,7 +129,7 @@ async def get_revenue_stats(
 @router.get("/jobs", response_model=JobStats)
 async def get_job_stats(
     time_range: TimeRange = TimeRange.MONTH,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     if current_user.role != "admin":
@@ -181,7 +181,7 @@ async def get_job_stats(
 @router.get("/users", response_model=UserStats)
 async def get_user_stats(
     time_range: TimeRange = TimeRange.MONTH,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     if current_user.role != "admin":
@@ -1,4 +1,5 @@
 from datetime import timedelta
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
@@ -9,6 +10,7 @@ from app.models.user import User
 from app.schemas.user import UserCreate, UserResponse, Token
 from app.auth.auth import create_access_token, get_current_active_user
 from app.services.user_service import UserService
+from app.services.refresh_token_service import RefreshTokenService
 from app.config import settings
 
 router = APIRouter(tags=["auth"])
@@ -17,13 +19,25 @@ class LoginRequest(BaseModel):
     email: str
     password: str
 
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+class LogoutRequest(BaseModel):
+    refresh_token: Optional[str] = None
+
+def _access_token(user_id: str) -> str:
+    return create_access_token(
+        data={"sub": user_id},
+        expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+
 @router.post("/auth/register", response_model=UserResponse)
 async def register(
     user_data: UserCreate,
     db: Session = Depends(get_db)
 ):
     user_service = UserService(db)
-    return user_service.create_user(user_data)
+    return await user_service.create_user(user_data)
 
 @router.post("/auth/token", response_model=Token)
 async def login(
@@ -31,15 +45,21 @@ async def login(
     db: Session = Depends(get_db)
 ):
     user_service = UserService(db)
-    user = user_service.authenticate_user(login_data.email, login_data.password)
-    
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": user.id},
-        expires_delta=access_token_expires
-    )
+    user = await user_service.authenticate_user(login_data.email, login_data.password)
+    access_token = _access_token(user.id)
+    refresh_token = RefreshTokenService(db).issue(user.id)
     
-    return {"access_token": access_token, "token_type": "bearer"}
+    return {"access_token": access_token, "token_type": "bearer", "refresh_token": refresh_token}
+
+@router.post("/auth/refresh", response_model=Token)
+async def refresh(
+    refresh_data: RefreshRequest,
+    db: Session = Depends(get_db)
+):
+    """Swap a refresh token for a new access token and refresh token, without
+    the password. Each refresh token works once."""
+    user_id, refresh_token = RefreshTokenService(db).rotate(refresh_data.refresh_token)
+    return {"access_token": _access_token(user_id), "token_type": "bearer", "refresh_token": refresh_token}
 
 @router.get("/users/me", response_model=UserResponse)
 async def read_users_me(
@@ -48,7 +68,12 @@ async def read_users_me(
     return current_user
 
 @router.post("/auth/logout")
-async def logout():
+async def logout(
+    logout_data: Optional[LogoutRequest] = None,
+    db: Session = Depends(get_db)
+):
+    if logout_data is not None and logout_data.refresh_token:
+        RefreshTokenService(db).revoke(logout_data.refresh_token)
     return {"message": "Successfully logged out"}
 
 @router.post("/auth/verify-email")
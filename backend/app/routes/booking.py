@@ -1,13 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 from typing import List
-from datetime import datetime
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.booking import Booking
-from app.schemas.booking import BookingCreate, BookingResponse, BookingUpdate
+from app.schemas.booking import BookingCreate, BookingResponse, BookingUpdate, BookingHoldCreate, BookingHold
 from app.auth.auth import get_current_user
 from app.models.user import User
+from app.services.booking_service import BookingService
+from app.utils.pagination import PageParams, page_params, paginate, send_page
 
 router = APIRouter(
     prefix="/bookings",
@@ -20,32 +21,43 @@ async def create_booking(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Create a new booking"""
-    db_booking = Booking(
-        service_id=booking.service_id,
-        provider_id=booking.provider_id,
-        customer_id=current_user.id,
-        date=booking.date,
-        time=booking.time,
-        status="pending",
-        notes=booking.notes
+    """Create a new booking, confirming a hold if one is given"""
+    return BookingService(db).create_booking(booking, current_user.id, hold_id=booking.hold_id)
+
+@router.post("/holds", response_model=BookingHold)
+async def hold_slot(
+    hold: BookingHoldCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Hold a provider's slot for BOOKING_HOLD_SECONDS while the customer confirms"""
+    return BookingService(db).hold_slot(
+        hold.provider_id, hold.service_id, hold.date, hold.time, current_user.id
     )
-    db.add(db_booking)
-    db.commit()
-    db.refresh(db_booking)
-    return db_booking
+
+@router.delete("/holds/{hold_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def release_hold(
+    hold_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Give a held slot back before it expires"""
+    BookingService(db).release_hold(hold_id, current_user.id)
+    return None
 
 @router.get("/", response_model=List[BookingResponse])
 async def get_bookings(
-    db: Session = Depends(get_db),
+    response: Response,
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get all bookings for the current user"""
+    """Get the current user's bookings, newest first, one page at a time"""
     if current_user.role == "provider":
-        bookings = db.query(Booking).filter(Booking.provider_id == current_user.id).all()
+        bookings = db.query(Booking).filter(Booking.provider_id == current_user.id)
     else:
-        bookings = db.query(Booking).filter(Booking.customer_id == current_user.id).all()
-    return bookings
+        bookings = db.query(Booking).filter(Booking.customer_id == current_user.id)
+    return send_page(paginate(bookings, Booking, page, status_column=Booking.status).all(), page, response)
 
 @router.get("/{booking_id}", response_model=BookingResponse)
 async def get_booking(
@@ -83,13 +95,7 @@ async def update_booking(
             detail="Booking not found"
         )
     
-    for field, value in booking_update.dict(exclude_unset=True).items():
-        setattr(booking, field, value)
-    
-    booking.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(booking)
-    return booking
+    return BookingService(db).update_booking(booking, booking_update.dict(exclude_unset=True))
 
 @router.delete("/{booking_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_booking(
@@ -108,6 +114,5 @@ async def delete_booking(
             detail="Booking not found"
         )
     
-    db.delete(booking)
-    db.commit()
+    BookingService(db).delete_booking(booking)
     return None 
\ No newline at end of file
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import Optional
-from ..database import get_db
+from ..database import get_read_db
 from app.models.user import User
 from app.models.job import Job
 from app.models.payment import Payment
@@ -24,7 +24,7 @@ router = APIRouter(
 async def get_provider_earnings(
     time_range: str = Query("month", description="Time range for earnings data (week/month/year)"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get earnings statistics for the current provider
@@ -41,7 +41,7 @@ async def get_provider_earnings(
 @router.get("/earnings/report")
 async def download_earnings_report(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Download earnings report as PDF
@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
 from app.models.user import User
 from app.schemas.job import JobCreate, JobUpdate, JobResponse, JobStats
 from app.services.job_service import JobService
 from app.utils.auth import get_current_active_user
+from app.utils.pagination import PageParams, page_params, send_page
 from typing import List
 
 router = APIRouter(prefix="/api/jobs", tags=["jobs"])
@@ -13,19 +14,19 @@ router = APIRouter(prefix="/api/jobs", tags=["jobs"])
 async def create_job(
     job_data: JobCreate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     job_service = JobService(db)
-    return job_service.create_job(job_data, current_user.id)
+    return await job_service.create_job(job_data, current_user.id)
 
 @router.get("/{job_id}", response_model=JobResponse)
 async def get_job(
     job_id: str,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     job_service = JobService(db)
-    job = job_service.get_job(job_id)
+    job = await job_service.get_job(job_id)
     
     # Check if user has permission to view this job
     if current_user.role == "provider" and job.provider_id != current_user.id:
@@ -46,10 +47,10 @@ async def update_job(
     job_id: str,
     job_data: JobUpdate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     job_service = JobService(db)
-    job = job_service.get_job(job_id)
+    job = await job_service.get_job(job_id)
     
     # Check if user has permission to update this job
     if current_user.role == "provider" and job.provider_id != current_user.id:
@@ -63,16 +64,16 @@ async def update_job(
             detail="You don't have permission to update this job"
         )
     
-    return job_service.update_job(job_id, job_data)
+    return await job_service.update_job(job_id, job_data)
 
 @router.delete("/{job_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_job(
     job_id: str,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     job_service = JobService(db)
-    job = job_service.get_job(job_id)
+    job = await job_service.get_job(job_id)
     
     # Check if user has permission to delete this job
     if current_user.role == "provider" and job.provider_id != current_user.id:
@@ -86,12 +87,14 @@ async def delete_job(
             detail="You don't have permission to delete this job"
         )
     
-    job_service.delete_job(job_id)
+    await job_service.delete_job(job_id)
 
 @router.get("/provider/me", response_model=List[JobResponse])
 async def get_my_provider_jobs(
+    response: Response,
+    page: PageParams = Depends(page_params),
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user.role != "provider":
         raise HTTPException(
@@ -100,12 +103,14 @@ async def get_my_provider_jobs(
         )
     
     job_service = JobService(db)
-    return job_service.get_provider_jobs(current_user.id)
+    return send_page(await job_service.get_provider_jobs(current_user.id, page), page, response)
 
 @router.get("/customer/me", response_model=List[JobResponse])
 async def get_my_customer_jobs(
+    response: Response,
+    page: PageParams = Depends(page_params),
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user.role != "customer":
         raise HTTPException(
@@ -114,17 +119,17 @@ async def get_my_customer_jobs(
         )
     
     job_service = JobService(db)
-    return job_service.get_customer_jobs(current_user.id)
+    return send_page(await job_service.get_customer_jobs(current_user.id, page), page, response)
 
 @router.patch("/{job_id}/status", response_model=JobResponse)
 async def update_job_status(
     job_id: str,
     status: str,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     job_service = JobService(db)
-    job = job_service.get_job(job_id)
+    job = await job_service.get_job(job_id)
     
     # Check if user has permission to update job status
     if current_user.role == "provider" and job.provider_id != current_user.id:
@@ -138,12 +143,12 @@ async def update_job_status(
             detail="You don't have permission to update this job's status"
         )
     
-    return job_service.update_job_status(job_id, status)
+    return await job_service.update_job_status(job_id, status)
 
 @router.get("/provider/dashboard/stats", response_model=JobStats)
 async def get_provider_job_stats(
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user.role != "provider":
         raise HTTPException(
@@ -152,4 +157,4 @@ async def get_provider_job_stats(
         )
     
     job_service = JobService(db)
-    return job_service.get_provider_stats(current_user.id) 
\ No newline at end of file
+    return await job_service.get_provider_stats(current_user.id) 
\ No newline at end of file
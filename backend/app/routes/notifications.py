@@ -1,16 +1,21 @@
-from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect, HTTPException, Query
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, Header, Request, WebSocket, WebSocketDisconnect, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+import asyncio
+from contextlib import asynccontextmanager
+from typing import List, Optional
 from datetime import datetime
 from jose import JWTError, jwt
 import logging
 
-from app.database import get_db
+from app.database import get_async_db, get_async_read_db
 from app.models.user import User
 from app.auth.auth import get_current_active_user
 from app.schemas.notification import NotificationCreate, NotificationResponse
 from app.services.notification_service import NotificationService
 from app.config import settings
+from app.core.connections import RESYNC, EventStream, manager
+from app.utils.pagination import PageParams, page_params, send_page
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -18,91 +23,200 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["notifications"])
 
-# WebSocket connection manager
-class ConnectionManager:
-    def __init__(self):
-        self.active_connections: dict[int, WebSocket] = {}
+# How long an EventSource waits before reconnecting
+SSE_RETRY_MS = 3000
 
-    async def connect(self, websocket: WebSocket, user_id: int):
-        await websocket.accept()
-        self.active_connections[user_id] = websocket
-        logger.info(f"WebSocket connected for user {user_id}")
+def _session(app):
+    # Short-lived sessions only: holding one for the socket's lifetime would
+    # pin a pooled connection per connected user
+    get_session = app.dependency_overrides.get(get_async_db, get_async_db)
+    return asynccontextmanager(get_session)()
 
-    def disconnect(self, user_id: int):
-        if user_id in self.active_connections:
-            del self.active_connections[user_id]
-            logger.info(f"WebSocket disconnected for user {user_id}")
+def _token_user_id(token: str) -> Optional[str]:
+    try:
+        payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+    except JWTError as e:
+        logger.error(f"Token validation failed: {str(e)}")
+        return None
+    user_id = payload.get("sub")
+    if user_id is None:
+        logger.error("Token validation failed: no user_id in payload")
+    return user_id
+
+async def _active_user(app, user_id: str):
+    async with _session(app) as db:
+        user = await db.get(User, user_id)
+        return user if user is not None and user.is_active else None
 
-    async def send_notification(self, user_id: int, message: dict):
-        if user_id in self.active_connections:
-            await self.active_connections[user_id].send_json(message)
-            logger.info(f"Notification sent to user {user_id}")
+async def _replay(websocket, app, user_id: str, last_seen_id: int) -> int:
+    """Send the user's notifications after `last_seen_id` straight to the socket.
 
-manager = ConnectionManager()
+    Returns the newest id sent. Each batch is read in its own session, which
+    is closed before the batch is written to the client.
+    """
+    remaining = settings.WS_REPLAY_LIMIT
+    while True:
+        # Once the limit is spent, one more row tells whether anything was left out
+        limit = min(settings.WS_REPLAY_BATCH_SIZE, remaining) or 1
+        async with _session(app) as db:
+            batch = await NotificationService(db).get_notifications_after(user_id, last_seen_id, limit)
+        if batch and remaining == 0:
+            # More were missed than is worth replaying
+            await websocket.send_json(RESYNC)
+            return last_seen_id
+        for notification in batch:
+            await websocket.send_json(NotificationService.message(notification))
+            last_seen_id = notification.id
+        remaining -= len(batch)
+        if len(batch) < limit:
+            return last_seen_id
 
 @router.websocket("/ws")
 async def websocket_endpoint(
     websocket: WebSocket,
-    token: str = Query(..., description="JWT token for authentication")
+    token: str = Query(..., description="JWT token for authentication"),
+    last_seen_id: Optional[int] = Query(None, description="Newest notification id the client already has")
 ):
+    # Refuse before any token or database work when the worker is full
+    code = manager.rejection()
+    if code is not None:
+        logger.warning("WebSocket refused: worker at its connection cap")
+        await websocket.close(code=code)
+        return
+
     logger.info(f"WebSocket connection attempt with token: {token[:20]}...")
     try:
-        # Validate token
-        try:
-            payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
-            user_id: str = payload.get("sub")
-            if user_id is None:
-                logger.error("Token validation failed: no user_id in payload")
-                await websocket.close()
-                return
-            logger.info(f"Token validated for user {user_id}")
-        except JWTError as e:
-            logger.error(f"Token validation failed: {str(e)}")
+        user_id = _token_user_id(token)
+        if user_id is None:
             await websocket.close()
             return
+        logger.info(f"Token validated for user {user_id}")
 
-        # Get user from database
-        db = next(get_db())
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user or not user.is_active:
+        code = manager.rejection(user_id)
+        if code is not None:
+            logger.warning(f"WebSocket refused for user {user_id}: connection cap reached")
+            await websocket.close(code=code)
+            return
+
+        user = await _active_user(websocket.app, user_id)
+        if user is None:
             logger.error(f"User not found or inactive: {user_id}")
             await websocket.close()
             return
         logger.info(f"User found and active: {user_id}")
 
-        await manager.connect(websocket, user.id)
+        # Other sockets may have been admitted while the user was loading
+        code = manager.rejection(user_id)
+        if code is not None:
+            await websocket.close(code=code)
+            return
+
+        # With last_seen_id, live messages wait in the queue while the missed
+        # ones are replayed, then follow them without duplicates
+        connection = await manager.connect(websocket, user_id, hold=last_seen_id is not None)
         try:
+            if last_seen_id is not None:
+                connection.start(skip_through=await _replay(websocket, websocket.app, user_id, last_seen_id))
             while True:
-                # Keep connection alive
+                # Anything the client sends, pongs included, shows it is alive
                 await websocket.receive_text()
+                connection.touch()
         except WebSocketDisconnect:
-            logger.info(f"WebSocket disconnected for user {user.id}")
-            manager.disconnect(user.id)
+            logger.info(f"WebSocket disconnected for user {user_id}")
+        finally:
+            manager.disconnect(connection)
     except Exception as e:
         logger.error(f"WebSocket error: {str(e)}")
         await websocket.close()
 
+@router.get("/notifications/stream")
+async def notification_stream(
+    request: Request,
+    token: str = Query(..., description="JWT token for authentication"),
+    last_event_id: Optional[int] = Query(None, description="Newest notification id the client already has"),
+    last_event_header: Optional[int] = Header(None, alias="Last-Event-ID")
+):
+    """Server-Sent Events fallback for clients whose network breaks WebSockets.
+
+    One long-lived response per client, fed exactly like a /ws socket: same
+    caps, send queue and overflow policy, and the same replay of missed
+    notifications from Last-Event-ID (sent by the browser on reconnect) or
+    `last_event_id`.
+    """
+    if manager.rejection() is not None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many open connections", headers={"Retry-After": "30"}
+        )
+    user_id = _token_user_id(token)
+    if user_id is None or await _active_user(request.app, user_id) is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Could not validate credentials")
+    if manager.rejection(user_id) is not None:
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail="Too many open connections")
+
+    last_seen_id = last_event_header if last_event_header is not None else last_event_id
+    stream = EventStream()
+
+    async def replay_then_go_live(connection):
+        connection.start(skip_through=await _replay(stream, request.app, user_id, last_seen_id))
+
+    async def frames():
+        yield f"retry: {SSE_RETRY_MS}\n\n"
+        # Connected only once the response is being sent: a client gone
+        # before then never runs this generator, and so never reaches the
+        # finally below that would have to disconnect it
+        if manager.rejection(user_id) is not None:
+            return  # filled up meanwhile; the client retries after SSE_RETRY_MS
+        connection = await manager.connect(stream, user_id, hold=last_seen_id is not None, reap_idle=False)
+        replay = asyncio.create_task(replay_then_go_live(connection)) if last_seen_id is not None else None
+        try:
+            async for frame in stream.frames():
+                yield frame
+        finally:
+            if replay is not None:
+                replay.cancel()
+            manager.disconnect(connection)
+            logger.info(f"Event stream closed for user {user_id}")
+
+    return StreamingResponse(
+        frames(),
+        media_type="text/event-stream",
+        # Proxies must pass frames through as they come
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.get("/notifications", response_model=List[NotificationResponse])
 async def get_notifications(
+    response: Response,
+    page: PageParams = Depends(page_params),
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    notification_service = NotificationService(db)
+    return send_page(await notification_service.get_user_notifications(current_user.id, page), page, response)
+
+@router.get("/notifications/unread-count")
+async def get_unread_count(
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
+    # The primary, not a replica: a lagging recount would be cached
     notification_service = NotificationService(db)
-    return notification_service.get_user_notifications(current_user.id)
+    return {"unread_count": await notification_service.get_unread_count(current_user.id)}
 
 @router.post("/notifications/{notification_id}/read")
 async def mark_notification_as_read(
     notification_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     notification_service = NotificationService(db)
-    return notification_service.mark_as_read(notification_id, current_user.id)
+    return await notification_service.mark_as_read(notification_id, current_user.id)
 
 @router.post("/notifications/read-all")
 async def mark_all_notifications_as_read(
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     notification_service = NotificationService(db)
-    return notification_service.mark_all_as_read(current_user.id) 
\ No newline at end of file
+    return await notification_service.mark_all_as_read(current_user.id) 
\ No newline at end of file
@@ -1,13 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 from typing import List
 from datetime import datetime
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.payment import Payment
 from app.schemas.payment import PaymentCreate, PaymentResponse
 from app.auth.auth import get_current_user
 from app.models.user import User
+from app.services.provider_stats_service import ProviderDailyStatsService
+from app.utils.pagination import PageParams, page_params, paginate, send_page
 
 router = APIRouter(
     prefix="/payments",
@@ -26,21 +28,25 @@ async def create_payment(
         currency=payment.currency,
         status="pending",
         payment_method=payment.payment_method,
-        user_id=current_user.id
+        user_id=current_user.id,
+        job_id=payment.job_id
     )
     db.add(db_payment)
+    ProviderDailyStatsService(db).record_payment_status_change(db_payment, None)
     db.commit()
     db.refresh(db_payment)
     return db_payment
 
 @router.get("/", response_model=List[PaymentResponse])
 async def get_payments(
-    db: Session = Depends(get_db),
+    response: Response,
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get all payments for the current user"""
-    payments = db.query(Payment).filter(Payment.user_id == current_user.id).all()
-    return payments
+    """Get the current user's payments, newest first, one page at a time"""
+    payments = db.query(Payment).filter(Payment.user_id == current_user.id)
+    return send_page(paginate(payments, Payment, page, status_column=Payment.status).all(), page, response)
 
 @router.get("/{payment_id}", response_model=PaymentResponse)
 async def get_payment(
@@ -78,8 +84,10 @@ async def update_payment_status(
             detail="Payment not found"
         )
     
+    old_status = payment.status
     payment.status = status
     payment.updated_at = datetime.utcnow()
+    ProviderDailyStatsService(db).record_payment_status_change(payment, old_status)
     db.commit()
     db.refresh(payment)
     return payment 
\ No newline at end of file
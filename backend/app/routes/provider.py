@@ -8,7 +8,9 @@ from app.models.user import User
 from app.schemas.provider import ProviderResponse, ProviderUpdate
 from app.schemas.job import JobResponse
 from app.auth import get_current_user
-from app.core.errors import NotFoundError, ValidationError, DatabaseError
+from app.core.errors import NotFoundError, DatabaseError
+from app.services.provider_search_service import ProviderSearchService
+from app.services.availability_service import AvailabilityService, availability_index
 
 router = APIRouter(prefix="/api/providers", tags=["providers"])
 
@@ -40,11 +42,17 @@ async def update_provider_profile(
 
         for field, value in provider_data.dict(exclude_unset=True).items():
             setattr(provider, field, value)
+        ProviderSearchService(db).index_provider(provider)
+        windows = None
+        if provider_data.availability is not None:
+            windows = AvailabilityService(db).set_availability(provider, provider_data.availability)
         
         db.commit()
         db.refresh(provider)
+        if windows is not None:
+            availability_index.set_windows(provider.id, windows)
         return provider
-    except ValidationError as e:
+    except HTTPException as e:
         raise e
     except Exception as e:
         raise DatabaseError(f"Failed to update provider profile: {str(e)}")
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from typing import List
 from ..database import get_db
@@ -8,6 +8,7 @@ from app.models.job import Job
 from ..schemas.review import ReviewResponse, ReviewStats
 from ..auth import get_current_user
 from ..services.review_service import ReviewService
+from ..utils.pagination import NEXT_CURSOR_HEADER, PageParams, page_params
 
 router = APIRouter(
     prefix="/api/providers",
@@ -31,6 +32,21 @@ async def get_provider_reviews(
     review_service = ReviewService(db)
     return await review_service.get_provider_reviews(current_user.id)
 
+@router.get("/{provider_id}/reviews", response_model=List[ReviewResponse])
+async def list_provider_reviews(
+    provider_id: str,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(get_db)
+):
+    """
+    Page through a provider's reviews, newest first
+    """
+    reviews, next_cursor = ReviewService(db).list_provider_reviews(provider_id, page)
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return reviews
+
 @router.post("/reviews/{review_id}/respond")
 async def respond_to_review(
     review_id: str,
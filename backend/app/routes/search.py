@@ -0,0 +1,89 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from datetime import datetime
+
+from app.database import get_read_db
+from app.schemas.provider import ProviderSearchResults, ProviderResponse, NearbyProvider, NearbyProviders
+from app.schemas.availability import FreeSlot, FreeSlots
+from app.services.provider_geo_service import ProviderGeoService
+from app.services.availability_service import AvailabilityService
+from app.services.provider_search_service import ProviderSearchService
+
+router = APIRouter(
+    prefix="/providers",
+    tags=["search"]
+)
+
+@router.get("/search", response_model=ProviderSearchResults)
+async def search_providers(
+    q: Optional[str] = Query(None, description="Words matched against service categories and areas"),
+    category: Optional[str] = Query(None, description="Service category, e.g. plumbing"),
+    area: Optional[str] = Query(None, description="Service area, e.g. Ikeja"),
+    verified: Optional[bool] = None,
+    min_rating: Optional[float] = Query(None, ge=0, le=5),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=50),
+    db: Session = Depends(get_read_db)
+):
+    """Search providers by category and service area"""
+    total, providers = ProviderSearchService(db).search(
+        q=q,
+        category=category,
+        area=area,
+        verified=verified,
+        min_rating=min_rating,
+        page=page,
+        page_size=page_size
+    )
+    return ProviderSearchResults(items=providers, total=total, page=page, page_size=page_size)
+
+@router.get("/nearby", response_model=NearbyProviders)
+async def nearby_providers(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(5.0, gt=0, le=50),
+    k: int = Query(10, ge=1, le=50),
+    category: Optional[str] = Query(None, description="Service category, e.g. plumbing"),
+    verified: Optional[bool] = None,
+    db: Session = Depends(get_read_db)
+):
+    """Nearest providers to a point, closest first"""
+    results = ProviderGeoService(db).nearby(
+        lat, lng, k=k, radius_km=radius_km, category=category, verified=verified
+    )
+    return NearbyProviders(items=[
+        NearbyProvider(
+            **ProviderResponse.model_validate(provider).model_dump(),
+            distance_km=round(distance, 3)
+        )
+        for distance, provider in results
+    ])
+
+@router.get("/available", response_model=List[ProviderResponse])
+async def available_providers(
+    at: datetime = Query(..., description="Start of the wanted slot, e.g. 2026-10-24T10:00"),
+    duration_minutes: Optional[int] = Query(None, ge=15, le=12 * 60),
+    area: Optional[str] = Query(None, description="Service area, e.g. Ikeja"),
+    category: Optional[str] = Query(None, description="Service category, e.g. plumbing"),
+    limit: int = Query(20, ge=1, le=50),
+    db: Session = Depends(get_read_db)
+):
+    """Providers open and unbooked for the whole slot, best rated first"""
+    return AvailabilityService(db).providers_free_at(
+        at, minutes=duration_minutes, area=area, category=category, limit=limit
+    )
+
+@router.get("/{provider_id}/free-slots", response_model=FreeSlots)
+async def provider_free_slots(
+    provider_id: str,
+    count: int = Query(5, ge=1, le=50),
+    duration_minutes: Optional[int] = Query(None, ge=15, le=12 * 60),
+    after: Optional[datetime] = None,
+    db: Session = Depends(get_read_db)
+):
+    """Next free slots of a provider within the booking horizon"""
+    slots = AvailabilityService(db).next_free_slots(
+        provider_id, count=count, minutes=duration_minutes, after=after
+    )
+    return FreeSlots(provider_id=provider_id, items=[FreeSlot(start=start, end=end) for start, end in slots])
@@ -5,6 +5,9 @@ from app.database import get_db
 from app.models.user import User
 from app.schemas.user import UserResponse, UserUpdate
 from app.auth import get_current_user
+from app.auth.principal_cache import principal_cache
+from app.core.password_hasher import password_hasher
+from app.services.refresh_token_service import RefreshTokenService
 
 router = APIRouter(prefix="/api/users", tags=["users"])
 
@@ -23,16 +26,25 @@ async def update_current_user_profile(
     db: Session = Depends(get_db)
 ):
     """Update the current user's profile"""
+    # current_user may come from the principal cache, detached from `db`
+    user = db.query(User).filter(User.id == current_user.id).first()
     for field, value in user_data.dict(exclude_unset=True).items():
-        setattr(current_user, field, value)
+        if field == "password":
+            user.hashed_password = await password_hasher.hash(value)
+            # Sessions elsewhere have to log in with the new password
+            RefreshTokenService(db).revoke_user(user.id)
+        else:
+            setattr(user, field, value)
     
     db.commit()
-    db.refresh(current_user)
-    return current_user
+    principal_cache.invalidate(user.id)
+    db.refresh(user)
+    return user
 
 @router.get("/{user_id}", response_model=UserResponse)
 async def get_user_profile(
-    user_id: int,
+    user_id: str,
+    current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get a user's profile by ID"""
@@ -0,0 +1,52 @@
+from pydantic import BaseModel
+from typing import Dict, Optional
+from datetime import datetime
+
+class PoolStats(BaseModel):
+    name: str
+    pool_class: Optional[str] = None
+    size: Optional[int] = None
+    checked_out: Optional[int] = None
+    checked_in: Optional[int] = None
+    overflow: Optional[int] = None
+    max_overflow: Optional[int] = None
+    checkouts: int
+    timeouts: int
+    connects: int
+    invalidations: int
+    wait_avg_ms: float
+    wait_p95_ms: float
+    wait_max_ms: float
+    wait_total_ms: float
+
+class EndpointQueryStats(BaseModel):
+    endpoint: str
+    requests: int
+    queries: int
+    queries_avg: float
+    queries_max: int
+    db_time_ms: float
+    db_time_avg_ms: float
+    db_time_max_ms: float
+    n_plus_one_warnings: int
+
+class SlowQueryStats(BaseModel):
+    statement: str
+    count: int
+    total_ms: float
+    avg_ms: float
+    max_ms: float
+    callers: Dict[str, int]
+    last_parameters: Optional[str] = None
+    last_plan: Optional[str] = None
+    last_seen: Optional[datetime] = None
+
+class PrincipalCacheStats(BaseModel):
+    entries: int
+    max_entries: int
+    ttl_seconds: float
+    hits: int
+    misses: int
+    hit_ratio: float
+    evictions: int
+    invalidations: int
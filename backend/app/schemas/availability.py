@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+from typing import List
+from datetime import datetime
+
+class FreeSlot(BaseModel):
+    start: datetime
+    end: datetime
+
+class FreeSlots(BaseModel):
+    provider_id: str
+    items: List[FreeSlot]
@@ -10,7 +10,20 @@ class BookingBase(BaseModel):
     notes: Optional[str] = None
 
 class BookingCreate(BookingBase):
-    pass
+    hold_id: Optional[str] = None  # from POST /bookings/holds
+
+class BookingHoldCreate(BaseModel):
+    service_id: str
+    provider_id: str
+    date: datetime
+    time: str
+
+class BookingHold(BaseModel):
+    id: str
+    provider_id: str
+    start: datetime
+    end: datetime
+    expires_at: datetime
 
 class BookingUpdate(BaseModel):
     date: Optional[datetime] = None
@@ -6,6 +6,7 @@ class PaymentBase(BaseModel):
     amount: float
     currency: str = "NGN"
     payment_method: str
+    job_id: Optional[str] = None
 
 class PaymentCreate(PaymentBase):
     pass
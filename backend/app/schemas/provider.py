@@ -4,19 +4,30 @@ from datetime import datetime
 
 class ProviderBase(BaseModel):
     business_name: str
-    business_description: Optional[str] = None
-    service_category: str
-    years_of_experience: Optional[float] = None
-    hourly_rate: Optional[float] = None
-    availability: Optional[str] = None  # JSON string of availability schedule
-    location: Optional[str] = None
+    business_address: str
+    business_phone: str
+    business_email: EmailStr
+    business_description: str = ""
+    service_categories: List[str] = []
+    service_areas: List[str] = []
+    availability: str = "{}"  # JSON string of availability schedule
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
 
 class ProviderCreate(ProviderBase):
     pass
 
-class ProviderUpdate(ProviderBase):
+class ProviderUpdate(BaseModel):
     business_name: Optional[str] = None
-    service_category: Optional[str] = None
+    business_address: Optional[str] = None
+    business_phone: Optional[str] = None
+    business_email: Optional[EmailStr] = None
+    business_description: Optional[str] = None
+    service_categories: Optional[List[str]] = None
+    service_areas: Optional[List[str]] = None
+    availability: Optional[str] = None
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
 
 class ProviderResponse(ProviderBase):
     id: str
@@ -33,4 +44,16 @@ class ProviderResponse(ProviderBase):
 class ProviderProfile(ProviderResponse):
     user: dict  # Will contain user information
     jobs: List[dict]  # Will contain provider's jobs
-    reviews: List[dict]  # Will contain provider's reviews 
\ No newline at end of file
+    reviews: List[dict]  # Will contain provider's reviews
+
+class ProviderSearchResults(BaseModel):
+    items: List[ProviderResponse]
+    total: int
+    page: int
+    page_size: int
+
+class NearbyProvider(ProviderResponse):
+    distance_km: float
+
+class NearbyProviders(BaseModel):
+    items: List[NearbyProvider]
@@ -37,6 +37,8 @@ class UserResponse(UserBase):
 class Token(BaseModel):
     access_token: str
     token_type: str = "bearer"
+    # Single use: POST /auth/refresh exchanges it for a new pair
+    refresh_token: Optional[str] = None
 
 class TokenData(BaseModel):
     user_id: Optional[str] = None 
\ No newline at end of file
@@ -1,174 +1,231 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, extract
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func, and_, case, literal
 from datetime import datetime, timedelta
 from typing import List, Dict
-from ..models import User, Job, Review, Payment
+from ..models import User, Job, Review, Payment, Provider
+from ..models.provider_daily_stats import ProviderDailyStats as Stats
+from .provider_rating_service import STARS, star_column
 from ..schemas.analytics import (
     AnalyticsResponse, WeeklyBooking, MonthlyRevenue,
     ServiceDistribution, RatingDistribution, RecentActivity,
     PaymentMethod
 )
+from ..utils.sql import day_bucket, month_bucket
+
+def _percent_change(current: float, previous: float) -> float:
+    return ((current - previous) / previous * 100) if previous else 0
+
+def _ratio(total, count) -> float:
+    return (total or 0.0) / count if count else 0.0
+
+def _last_months(now: datetime, count: int) -> List[datetime]:
+    # First day of each of the last `count` calendar months, oldest first
+    months = []
+    year, month = now.year, now.month
+    for _ in range(count):
+        months.append(datetime(year, month, 1))
+        year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+    months.reverse()
+    return months
 
 class AnalyticsService:
     def __init__(self, db: Session):
         self.db = db
 
+    @property
+    def dialect(self) -> str:
+        return self.db.get_bind().dialect.name
+
     async def get_provider_analytics(self, provider_id: str) -> AnalyticsResponse:
-        # Get total bookings and revenue
-        total_bookings = self.db.query(func.count(Job.id)).filter(
-            Job.provider_id == provider_id
-        ).scalar()
+        # The dashboard is served by a fixed number of round trips regardless
+        # of how many jobs or reviews the provider has: one conditional
+        # aggregate over provider_daily_stats for every scalar, one UNION ALL
+        # of GROUP BYs for every series, and two bounded queries for recent
+        # activity.
+        now = datetime.utcnow()
+        stats = self._scalar_stats(provider_id, now)
+        series = self._series(provider_id, now)
 
-        total_revenue = self.db.query(func.sum(Job.amount)).filter(
-            Job.provider_id == provider_id,
-            Job.status == "completed"
-        ).scalar() or 0.0
+        # Weekly bookings (last 7 days including today)
+        days = [now - timedelta(days=i) for i in range(6, -1, -1)]
+        weekly_bookings = [
+            WeeklyBooking(
+                day=day.strftime("%a"),
+                count=int(series["weekly_bookings"].get(day.strftime("%Y-%m-%d"), 0))
+            ) for day in days
+        ]
 
-        # Get average rating
-        reviews = self.db.query(Review).filter(
-            Review.provider_id == provider_id
-        ).all()
-        average_rating = sum(review.rating for review in reviews) / len(reviews) if reviews else 0.0
+        # Monthly revenue (last 6 calendar months)
+        monthly_revenue = [
+            MonthlyRevenue(
+                month=month.strftime("%b"),
+                amount=float(series["monthly_revenue"].get(month.strftime("%Y-%m"), 0.0))
+            ) for month in _last_months(now, 6)
+        ]
 
-        # Calculate average response time (time between job creation and first provider response)
-        response_times = []
-        jobs = self.db.query(Job).filter(
-            Job.provider_id == provider_id,
-            Job.status != "pending"
-        ).all()
-        for job in jobs:
-            if job.updated_at and job.created_at:
-                response_time = (job.updated_at - job.created_at).total_seconds() / 3600  # Convert to hours
-                response_times.append(response_time)
-        average_response_time = sum(response_times) / len(response_times) if response_times else 0.0
+        service_distribution = [
+            ServiceDistribution(service_type=service_type, count=int(count))
+            for service_type, count in series["service_distribution"].items()
+        ]
 
-        # Calculate trends
-        now = datetime.utcnow()
-        week_ago = now - timedelta(days=7)
-        month_ago = now - timedelta(days=30)
-
-        # Bookings trend
-        current_week_bookings = self.db.query(func.count(Job.id)).filter(
-            Job.provider_id == provider_id,
-            Job.created_at >= week_ago
-        ).scalar()
-        previous_week_bookings = self.db.query(func.count(Job.id)).filter(
-            Job.provider_id == provider_id,
-            Job.created_at >= week_ago - timedelta(days=7),
-            Job.created_at < week_ago
-        ).scalar()
-        bookings_trend = ((current_week_bookings - previous_week_bookings) / previous_week_bookings * 100) if previous_week_bookings else 0
-
-        # Revenue trend
-        current_month_revenue = self.db.query(func.sum(Job.amount)).filter(
-            Job.provider_id == provider_id,
-            Job.status == "completed",
-            Job.completed_at >= month_ago
-        ).scalar() or 0.0
-        previous_month_revenue = self.db.query(func.sum(Job.amount)).filter(
-            Job.provider_id == provider_id,
-            Job.status == "completed",
-            Job.completed_at >= month_ago - timedelta(days=30),
-            Job.completed_at < month_ago
-        ).scalar() or 0.0
-        revenue_trend = ((current_month_revenue - previous_month_revenue) / previous_month_revenue * 100) if previous_month_revenue else 0
-
-        # Rating trend
-        current_month_avg = self.db.query(func.avg(Review.rating)).filter(
-            Review.provider_id == provider_id,
-            Review.created_at >= month_ago
-        ).scalar() or 0.0
-        previous_month_avg = self.db.query(func.avg(Review.rating)).filter(
-            Review.provider_id == provider_id,
-            Review.created_at >= month_ago - timedelta(days=30),
-            Review.created_at < month_ago
-        ).scalar() or 0.0
-        rating_trend = current_month_avg - previous_month_avg
-
-        # Response time trend
-        current_week_avg = self.db.query(
-            func.avg(extract('epoch', Job.updated_at - Job.created_at)) / 3600
+        rating_distribution = [
+            RatingDistribution(rating=int(rating), count=int(count))
+            for rating, count in series["rating_distribution"].items()
+            if count
+        ]
+
+        total_payments = sum(series["payment_methods"].values())
+        payment_methods = [
+            PaymentMethod(
+                method=method,
+                percentage=(count / total_payments * 100) if total_payments else 0
+            ) for method, count in series["payment_methods"].items()
+        ]
+
+        return AnalyticsResponse(
+            total_bookings=stats.total_bookings or 0,
+            total_revenue=stats.total_revenue or 0.0,
+            average_rating=_ratio(stats.review_sum, stats.review_count),
+            average_response_time=_ratio(stats.response_time_sum, stats.response_count),
+            bookings_trend=_percent_change(
+                stats.current_week_bookings or 0, stats.previous_week_bookings or 0
+            ),
+            revenue_trend=_percent_change(
+                stats.current_month_revenue or 0.0, stats.previous_month_revenue or 0.0
+            ),
+            rating_trend=(
+                _ratio(stats.current_month_review_sum, stats.current_month_review_count)
+                - _ratio(stats.previous_month_review_sum, stats.previous_month_review_count)
+            ),
+            response_time_trend=(
+                _ratio(stats.current_week_response_sum, stats.current_week_response_count)
+                - _ratio(stats.previous_week_response_sum, stats.previous_week_response_count)
+            ),
+            weekly_bookings=weekly_bookings,
+            monthly_revenue=monthly_revenue,
+            service_distribution=service_distribution,
+            rating_distribution=rating_distribution,
+            recent_activity=self._recent_activity(provider_id),
+            payment_methods=payment_methods
+        )
+
+    def _scalar_stats(self, provider_id: str, now: datetime):
+        """Totals, averages and trend windows for a provider in a single row."""
+        today = now.date()
+        week_start = today - timedelta(days=6)
+        previous_week_start = week_start - timedelta(days=7)
+        month_start = today - timedelta(days=29)
+        previous_month_start = month_start - timedelta(days=30)
+
+        def windowed(column, start, end=None):
+            in_window = Stats.day >= start if end is None else and_(Stats.day >= start, Stats.day < end)
+            return func.sum(case((in_window, column), else_=0))
+
+        return self.db.query(
+            func.sum(Stats.booking_count).label("total_bookings"),
+            func.sum(Stats.completed_revenue).label("total_revenue"),
+            func.sum(Stats.review_sum).label("review_sum"),
+            func.sum(Stats.review_count).label("review_count"),
+            func.sum(Stats.response_time_sum).label("response_time_sum"),
+            func.sum(Stats.response_count).label("response_count"),
+            windowed(Stats.booking_count, week_start).label("current_week_bookings"),
+            windowed(Stats.booking_count, previous_week_start, week_start).label("previous_week_bookings"),
+            windowed(Stats.completed_revenue, month_start).label("current_month_revenue"),
+            windowed(Stats.completed_revenue, previous_month_start, month_start).label("previous_month_revenue"),
+            windowed(Stats.review_sum, month_start).label("current_month_review_sum"),
+            windowed(Stats.review_count, month_start).label("current_month_review_count"),
+            windowed(Stats.review_sum, previous_month_start, month_start).label("previous_month_review_sum"),
+            windowed(Stats.review_count, previous_month_start, month_start).label("previous_month_review_count"),
+            windowed(Stats.response_time_sum, week_start).label("current_week_response_sum"),
+            windowed(Stats.response_count, week_start).label("current_week_response_count"),
+            windowed(Stats.response_time_sum, previous_week_start, week_start).label("previous_week_response_sum"),
+            windowed(Stats.response_count, previous_week_start, week_start).label("previous_week_response_count"),
         ).filter(
-            Job.provider_id == provider_id,
-            Job.status != "pending",
-            Job.created_at >= week_ago
-        ).scalar() or 0.0
-        previous_week_avg = self.db.query(
-            func.avg(extract('epoch', Job.updated_at - Job.created_at)) / 3600
+            Stats.provider_id == provider_id
+        ).one()
+
+    def _series(self, provider_id: str, now: datetime) -> Dict[str, Dict[str, float]]:
+        """Every grouped series for a provider, fetched as one UNION ALL."""
+        week_start = now.date() - timedelta(days=6)
+        months_start = _last_months(now, 6)[0].date()
+        month = month_bucket(Stats.day, self.dialect)
+
+        # Time series come from the daily rollup, so their cost depends on
+        # the number of days shown rather than on the provider's history
+        weekly_bookings = self.db.query(
+            literal("weekly_bookings").label("series"),
+            day_bucket(Stats.day, self.dialect).label("bucket"),
+            Stats.booking_count.label("value")
         ).filter(
-            Job.provider_id == provider_id,
-            Job.status != "pending",
-            Job.created_at >= week_ago - timedelta(days=7),
-            Job.created_at < week_ago
-        ).scalar() or 0.0
-        response_time_trend = current_week_avg - previous_week_avg
-
-        # Weekly bookings
-        weekly_bookings = []
-        for i in range(7):
-            day = now - timedelta(days=i)
-            count = self.db.query(func.count(Job.id)).filter(
-                Job.provider_id == provider_id,
-                func.date(Job.created_at) == day.date()
-            ).scalar()
-            weekly_bookings.append(WeeklyBooking(
-                day=day.strftime("%a"),
-                count=count
-            ))
-        weekly_bookings.reverse()
-
-        # Monthly revenue
-        monthly_revenue = []
-        for i in range(6):
-            month = now - timedelta(days=30*i)
-            amount = self.db.query(func.sum(Job.amount)).filter(
-                Job.provider_id == provider_id,
-                Job.status == "completed",
-                extract('month', Job.completed_at) == month.month,
-                extract('year', Job.completed_at) == month.year
-            ).scalar() or 0.0
-            monthly_revenue.append(MonthlyRevenue(
-                month=month.strftime("%b"),
-                amount=amount
-            ))
-        monthly_revenue.reverse()
+            Stats.provider_id == provider_id,
+            Stats.day >= week_start
+        )
+
+        monthly_revenue = self.db.query(
+            literal("monthly_revenue"),
+            month,
+            func.sum(Stats.completed_revenue)
+        ).filter(
+            Stats.provider_id == provider_id,
+            Stats.day >= months_start
+        ).group_by(month)
 
-        # Service distribution
-        service_counts = self.db.query(
+        service_distribution = self.db.query(
+            literal("service_distribution"),
             Job.service_type,
             func.count(Job.id)
         ).filter(
             Job.provider_id == provider_id
-        ).group_by(Job.service_type).all()
-        service_distribution = [
-            ServiceDistribution(
-                service_type=service_type,
-                count=count
-            ) for service_type, count in service_counts
-        ]
+        ).group_by(Job.service_type)
 
-        # Rating distribution
-        rating_counts = self.db.query(
-            Review.rating,
-            func.count(Review.id)
-        ).filter(
-            Review.provider_id == provider_id
-        ).group_by(Review.rating).all()
+        # The star histogram is kept on the provider row, one column per star
         rating_distribution = [
-            RatingDistribution(
-                rating=rating,
-                count=count
-            ) for rating, count in rating_counts
+            self.db.query(
+                literal("rating_distribution"),
+                literal(str(value)),
+                star_column(value)
+            ).filter(
+                Provider.id == provider_id
+            )
+            for value in STARS
         ]
 
-        # Recent activity
-        recent_jobs = self.db.query(Job).filter(
+        payment_methods = self.db.query(
+            literal("payment_methods"),
+            Payment.payment_method,
+            func.count(Payment.id)
+        ).join(
+            Job, Payment.job_id == Job.id
+        ).filter(
+            Job.provider_id == provider_id
+        ).group_by(Payment.payment_method)
+
+        series: Dict[str, Dict[str, float]] = {
+            "weekly_bookings": {},
+            "monthly_revenue": {},
+            "service_distribution": {},
+            "rating_distribution": {},
+            "payment_methods": {},
+        }
+        rows = weekly_bookings.union_all(
+            monthly_revenue, service_distribution, *rating_distribution, payment_methods
+        ).all()
+        for name, bucket, value in rows:
+            series[name][bucket] = value or 0
+        return series
+
+    def _recent_activity(self, provider_id: str) -> List[RecentActivity]:
+        recent_jobs = self.db.query(Job).options(
+            joinedload(Job.customer)
+        ).filter(
             Job.provider_id == provider_id
         ).order_by(Job.created_at.desc()).limit(5).all()
-        recent_reviews = self.db.query(Review).filter(
+        recent_reviews = self.db.query(Review).options(
+            joinedload(Review.customer)
+        ).filter(
             Review.provider_id == provider_id
         ).order_by(Review.created_at.desc()).limit(5).all()
-        
+
         recent_activity = []
         for job in recent_jobs:
             recent_activity.append(RecentActivity(
@@ -183,36 +240,4 @@ class AnalyticsService:
                 timestamp=review.created_at
             ))
         recent_activity.sort(key=lambda x: x.timestamp, reverse=True)
-        recent_activity = recent_activity[:5]
-
-        # Payment methods
-        payment_counts = self.db.query(
-            Payment.payment_method,
-            func.count(Payment.id)
-        ).filter(
-            Payment.provider_id == provider_id
-        ).group_by(Payment.payment_method).all()
-        total_payments = sum(count for _, count in payment_counts)
-        payment_methods = [
-            PaymentMethod(
-                method=method,
-                percentage=(count / total_payments * 100) if total_payments else 0
-            ) for method, count in payment_counts
-        ]
-
-        return AnalyticsResponse(
-            total_bookings=total_bookings,
-            total_revenue=total_revenue,
-            average_rating=average_rating,
-            average_response_time=average_response_time,
-            bookings_trend=bookings_trend,
-            revenue_trend=revenue_trend,
-            rating_trend=rating_trend,
-            response_time_trend=response_time_trend,
-            weekly_bookings=weekly_bookings,
-            monthly_revenue=monthly_revenue,
-            service_distribution=service_distribution,
-            rating_distribution=rating_distribution,
-            recent_activity=recent_activity,
-            payment_methods=payment_methods
-        ) 
\ No newline at end of file
+        return recent_activity[:5]
@@ -0,0 +1,403 @@
+import json
+import re
+import threading
+import time
+from datetime import date, datetime, timedelta
+from sqlalchemy.orm import Session
+from sqlalchemy import select, delete, insert
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from fastapi import HTTPException, status
+from app.config import settings
+from app.models.booking import Booking
+from app.models.provider import Provider
+from app.models.provider_availability import ProviderAvailability
+from app.models.service import Service
+from app.services.provider_search_service import ProviderSearchService, normalize
+from app.utils.intervals import IntervalTree
+
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+# Bookings in these states no longer hold their slot
+RELEASED_STATUSES = ("cancelled", "rejected")
+# Free slots start on this grid, so a gap after a 10:20 booking offers 10:30
+SLOT_STEP_MINUTES = 15
+# Larger candidate sets are ranked by streaming providers instead of IN (...)
+_MAX_IN_LIST = 500
+
+_CLOCK = re.compile(r"^(\d{1,2}):(\d{2})$")
+
+Window = Tuple[int, int, int]  # (weekday, start_minute, end_minute)
+
+def parse_clock(value: str) -> int:
+    """Minutes after midnight of "HH:MM"; "24:00" is the end of the day."""
+    match = _CLOCK.match((value or "").strip())
+    if not match:
+        raise ValueError(f"Invalid time {value!r}")
+    hours, minutes = int(match.group(1)), int(match.group(2))
+    if minutes >= 60 or hours * 60 + minutes > 24 * 60:
+        raise ValueError(f"Invalid time {value!r}")
+    return hours * 60 + minutes
+
+def format_clock(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+def _weekday(name: str) -> int:
+    name = name.strip().lower()
+    for i, weekday in enumerate(WEEKDAYS):
+        if name == weekday or name == weekday[:3]:
+            return i
+    raise ValueError(f"Invalid weekday {name!r}")
+
+def _merge(windows: Iterable[Window]) -> List[Window]:
+    merged: List[Window] = []
+    for weekday, start, end in sorted(windows):
+        if merged and merged[-1][0] == weekday and start <= merged[-1][2]:
+            merged[-1] = (weekday, merged[-1][1], max(merged[-1][2], end))
+        else:
+            merged.append((weekday, start, end))
+    return merged
+
+def parse_availability(value: str) -> List[Window]:
+    """Weekly windows of an availability JSON string.
+
+    Accepts an object keyed by weekday ("saturday" or "sat") whose values are
+    lists of "HH:MM-HH:MM" strings or {"start": "HH:MM", "end": "HH:MM"}
+    objects. Overlapping windows on the same day are merged. Raises
+    ValueError for anything else.
+    """
+    data = json.loads(value or "{}")
+    if not isinstance(data, dict):
+        raise ValueError("Availability must be an object keyed by weekday")
+    windows = []
+    for day, entries in data.items():
+        weekday = _weekday(day)
+        if not isinstance(entries, list):
+            raise ValueError(f"Availability for {day} must be a list")
+        for entry in entries:
+            if isinstance(entry, str) and "-" in entry:
+                start, end = (parse_clock(part) for part in entry.split("-", 1))
+            elif isinstance(entry, dict):
+                start, end = parse_clock(entry.get("start")), parse_clock(entry.get("end"))
+            else:
+                raise ValueError(f"Invalid availability window {entry!r}")
+            if start >= end:
+                raise ValueError(f"Window {entry!r} ends before it starts")
+            windows.append((weekday, start, end))
+    return _merge(windows)
+
+def format_availability(windows: Iterable[Window]) -> str:
+    """Canonical JSON for `windows`, the inverse of parse_availability."""
+    data: Dict[str, List[str]] = {}
+    for weekday, start, end in sorted(windows):
+        data.setdefault(WEEKDAYS[weekday], []).append(f"{format_clock(start)}-{format_clock(end)}")
+    return json.dumps(data)
+
+def duration_minutes(duration: Optional[str]) -> int:
+    """Length of a Service.duration "HH:MM", falling back to DEFAULT_BOOKING_MINUTES."""
+    try:
+        minutes = parse_clock(duration)
+    except ValueError:
+        minutes = 0
+    return minutes or settings.DEFAULT_BOOKING_MINUTES
+
+def booking_span(booking_date: datetime, booking_time: str, minutes: int) -> Tuple[datetime, datetime]:
+    """Start and end of a booking stored as a date plus an "HH:MM" time."""
+    start = datetime.combine(booking_date.date(), datetime.min.time()) + timedelta(minutes=parse_clock(booking_time))
+    return start, start + timedelta(minutes=minutes)
+
+def _ceil_to_step(moment: datetime) -> datetime:
+    moment = moment.replace(second=0, microsecond=0) + (
+        timedelta(minutes=1) if moment.second or moment.microsecond else timedelta()
+    )
+    remainder = (moment.hour * 60 + moment.minute) % SLOT_STEP_MINUTES
+    return moment + timedelta(minutes=(SLOT_STEP_MINUTES - remainder) % SLOT_STEP_MINUTES)
+
+class AvailabilityIndex:
+    """Per-process view of when providers are free.
+
+    Weekly windows live in one interval tree per weekday (for "who is free
+    at ..." across providers) and each provider's booked time in its own
+    interval tree of concrete datetimes; free time is the first minus the
+    second. Booking and availability writes in this process update it in
+    place; everything is reloaded at most every `refresh_seconds` to pick up
+    writes made by other workers.
+    """
+
+    def __init__(self, refresh_seconds: float = 60.0):
+        self.refresh_seconds = refresh_seconds
+        self.loaded_at: Optional[float] = None
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self.weekly: Dict[int, IntervalTree] = {weekday: IntervalTree() for weekday in range(7)}
+        self.windows: Dict[str, List[Window]] = {}
+        self.booked: Dict[str, IntervalTree] = {}
+        self.bookings: Dict[str, Tuple[str, datetime, datetime]] = {}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._reset()
+            self.loaded_at = None
+
+    def refresh(self, db: Session, force: bool = False) -> None:
+        fresh = lambda: self.loaded_at is not None and time.monotonic() - self.loaded_at < self.refresh_seconds
+        if not force and fresh():
+            return
+        with self._lock:
+            if not force and fresh():
+                return
+            self._reset()
+            windows: Dict[str, List[Window]] = {}
+            for provider_id, weekday, start, end in db.execute(select(
+                ProviderAvailability.provider_id, ProviderAvailability.weekday,
+                ProviderAvailability.start_minute, ProviderAvailability.end_minute
+            )):
+                windows.setdefault(provider_id, []).append((weekday, start, end))
+            for provider_id, provider_windows in windows.items():
+                self.set_windows(provider_id, provider_windows)
+
+            # Bookings that ended before today can no longer block a slot
+            today = datetime.combine(date.today(), datetime.min.time())
+            for booking_id, provider_id, booking_date, booking_time, duration in db.execute(
+                select(Booking.id, Booking.provider_id, Booking.date, Booking.time, Service.duration)
+                .outerjoin(Service, Service.id == Booking.service_id)
+                .filter(Booking.date >= today - timedelta(days=1), Booking.status.notin_(RELEASED_STATUSES))
+            ):
+                try:
+                    start, end = booking_span(booking_date, booking_time, duration_minutes(duration))
+                except ValueError:
+                    continue
+                self.add_booking(booking_id, provider_id, start, end)
+            self.loaded_at = time.monotonic()
+
+    def set_windows(self, provider_id: str, windows: Iterable[Window]) -> None:
+        with self._lock:
+            for weekday, start, end in self.windows.pop(provider_id, []):
+                self.weekly[weekday].remove(start, end, provider_id)
+            windows = _merge(windows)
+            if windows:
+                self.windows[provider_id] = windows
+            for weekday, start, end in windows:
+                self.weekly[weekday].add(start, end, provider_id)
+
+    def remove_provider(self, provider_id: str) -> None:
+        with self._lock:
+            self.set_windows(provider_id, [])
+            for booking_id in [b for b, (p, _, _) in self.bookings.items() if p == provider_id]:
+                self.remove_booking(booking_id)
+
+    def add_booking(self, booking_id: str, provider_id: str, start: datetime, end: datetime) -> None:
+        with self._lock:
+            self.remove_booking(booking_id)
+            self.bookings[booking_id] = (provider_id, start, end)
+            self.booked.setdefault(provider_id, IntervalTree()).add(start, end, booking_id)
+
+    def remove_booking(self, booking_id: str) -> None:
+        with self._lock:
+            entry = self.bookings.pop(booking_id, None)
+            if entry is not None:
+                provider_id, start, end = entry
+                self.booked[provider_id].remove(start, end, booking_id)
+
+    def _is_open(self, provider_id: str, start: datetime, end: datetime) -> bool:
+        """Whether a weekly window of `provider_id` covers [start, end) (same day)."""
+        begin = start.hour * 60 + start.minute
+        finish = begin + int((end - start).total_seconds() // 60)
+        return any(
+            weekday == start.weekday() and window_start <= begin and finish <= window_end
+            for weekday, window_start, window_end in self.windows.get(provider_id, ())
+        )
+
+    def is_free(self, provider_id: str, start: datetime, end: datetime) -> bool:
+        with self._lock:
+            booked = self.booked.get(provider_id)
+            return self._is_open(provider_id, start, end) and (
+                booked is None or next(booked.overlapping(start, end), None) is None
+            )
+
+    def free_at(self, start: datetime, end: datetime, among: Optional[Iterable[str]] = None) -> Set[str]:
+        """Providers open for the whole of [start, end) with nothing booked in it.
+
+        With `among`, only those providers are checked; otherwise the
+        weekday's window tree yields every provider open at that time.
+        """
+        begin = start.hour * 60 + start.minute
+        finish = begin + int((end - start).total_seconds() // 60)
+        if finish > 24 * 60:
+            # Weekly windows end at midnight
+            return set()
+        with self._lock:
+            if among is None:
+                candidates = {provider_id for _, _, provider_id in self.weekly[start.weekday()].covering(begin, finish)}
+            else:
+                candidates = {provider_id for provider_id in among if self._is_open(provider_id, start, end)}
+            return {
+                provider_id for provider_id in candidates
+                if provider_id not in self.booked or next(self.booked[provider_id].overlapping(start, end), None) is None
+            }
+
+    def free_slots(
+        self,
+        provider_id: str,
+        after: datetime,
+        count: int,
+        minutes: int,
+        horizon_days: int
+    ) -> List[Tuple[datetime, datetime]]:
+        """The next `count` free slots of `minutes` starting at or after `after`."""
+        slots: List[Tuple[datetime, datetime]] = []
+        length = timedelta(minutes=minutes)
+        after = _ceil_to_step(after)
+        with self._lock:
+            windows = self.windows.get(provider_id, [])
+            booked = self.booked.get(provider_id, IntervalTree())
+            for offset in range(horizon_days + 1):
+                day = datetime.combine(after.date() + timedelta(days=offset), datetime.min.time())
+                for weekday, window_start, window_end in windows:
+                    if weekday != day.weekday():
+                        continue
+                    cursor = max(day + timedelta(minutes=window_start), after)
+                    close = day + timedelta(minutes=window_end)
+                    # Walk the gaps between bookings that overlap the window
+                    for booked_start, booked_end, _ in list(booked.overlapping(cursor, close)) + [(close, close, None)]:
+                        while cursor + length <= min(booked_start, close):
+                            slots.append((cursor, cursor + length))
+                            if len(slots) == count:
+                                return slots
+                            cursor += length
+                        cursor = max(cursor, _ceil_to_step(booked_end))
+        return slots
+
+availability_index = AvailabilityIndex(settings.AVAILABILITY_INDEX_REFRESH_SECONDS)
+
+class AvailabilityService:
+    """Structured provider availability and free-slot queries.
+
+    set_availability only stages statements; after committing, the caller
+    hands the returned windows to availability_index.set_windows (and calls
+    booking_saved/booking_removed after booking writes) so the in-process
+    index follows committed state.
+    """
+
+    def __init__(self, db: Session, index: Optional[AvailabilityIndex] = None):
+        self.db = db
+        self.index = index if index is not None else availability_index
+
+    def set_availability(self, provider: Provider, availability: str) -> List[Window]:
+        try:
+            windows = parse_availability(availability)
+        except (ValueError, TypeError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid availability format"
+            )
+        provider.availability = format_availability(windows)
+        self.db.execute(delete(ProviderAvailability).filter(ProviderAvailability.provider_id == provider.id))
+        if windows:
+            self.db.execute(insert(ProviderAvailability), [
+                {"provider_id": provider.id, "weekday": weekday, "start_minute": start, "end_minute": end}
+                for weekday, start, end in windows
+            ])
+        return windows
+
+    def rebuild(self) -> Tuple[int, List[str]]:
+        """Normalize every provider's availability JSON into provider_availability.
+
+        Returns the number of providers normalized and the ids of those whose
+        JSON could not be parsed; those keep their JSON and get no windows.
+        """
+        self.db.execute(delete(ProviderAvailability))
+        rows, invalid, normalized = [], [], 0
+        for provider_id, availability in self.db.execute(select(Provider.id, Provider.availability)).all():
+            try:
+                windows = parse_availability(availability)
+            except (ValueError, TypeError):
+                invalid.append(provider_id)
+                continue
+            normalized += 1
+            rows.extend(
+                {"provider_id": provider_id, "weekday": weekday, "start_minute": start, "end_minute": end}
+                for weekday, start, end in windows
+            )
+        if rows:
+            self.db.execute(insert(ProviderAvailability), rows)
+        self.db.commit()
+        self.index.clear()
+        return normalized, invalid
+
+    def remove_provider(self, provider_id: str) -> None:
+        self.db.execute(delete(ProviderAvailability).filter(ProviderAvailability.provider_id == provider_id))
+        self.index.remove_provider(provider_id)
+
+    def booking_span(self, booking: Booking) -> Tuple[datetime, datetime]:
+        duration = self.db.scalar(select(Service.duration).filter(Service.id == booking.service_id))
+        return booking_span(booking.date, booking.time, duration_minutes(duration))
+
+    def booking_saved(self, booking: Booking) -> None:
+        if booking.status in RELEASED_STATUSES:
+            self.index.remove_booking(booking.id)
+            return
+        try:
+            start, end = self.booking_span(booking)
+        except ValueError:
+            self.index.remove_booking(booking.id)
+            return
+        self.index.add_booking(booking.id, booking.provider_id, start, end)
+
+    def booking_removed(self, booking_id: str) -> None:
+        self.index.remove_booking(booking_id)
+
+    def next_free_slots(
+        self,
+        provider_id: str,
+        count: int = 5,
+        minutes: Optional[int] = None,
+        after: Optional[datetime] = None
+    ) -> List[Tuple[datetime, datetime]]:
+        self.index.refresh(self.db)
+        return self.index.free_slots(
+            provider_id,
+            after or datetime.now(),
+            count,
+            minutes or settings.DEFAULT_BOOKING_MINUTES,
+            settings.AVAILABILITY_HORIZON_DAYS
+        )
+
+    def providers_free_at(
+        self,
+        start: datetime,
+        minutes: Optional[int] = None,
+        area: Optional[str] = None,
+        category: Optional[str] = None,
+        limit: int = 20
+    ) -> List[Provider]:
+        """Providers free for `minutes` from `start`, best rated first."""
+        self.index.refresh(self.db)
+        end = start + timedelta(minutes=minutes or settings.DEFAULT_BOOKING_MINUTES)
+        search = ProviderSearchService(self.db)
+        conditions = []
+        for kind, value in (("area", area), ("category", category)):
+            if normalize(value):
+                conditions.append(Provider.id.in_(search._matching(normalize(value), kind=f"{kind}_exact")))
+        among = self.db.scalars(select(Provider.id).filter(*conditions)).all() if conditions else None
+        provider_ids = self.index.free_at(start, end, among)
+        if not provider_ids:
+            return []
+
+        ranked = select(Provider).order_by(Provider.rating.desc(), Provider.total_reviews.desc(), Provider.id)
+        if len(provider_ids) <= _MAX_IN_LIST:
+            return self.db.scalars(ranked.filter(Provider.id.in_(provider_ids)).limit(limit)).all()
+        # Too many to list in the query: walk providers best rated first instead
+        ids = self.db.execute(
+            select(Provider.id).filter(*conditions)
+            .order_by(Provider.rating.desc(), Provider.total_reviews.desc(), Provider.id)
+            .execution_options(yield_per=1000)
+        ).scalars()
+        chosen = []
+        for provider_id in ids:
+            if provider_id in provider_ids:
+                chosen.append(provider_id)
+                if len(chosen) == limit:
+                    break
+        ids.close()
+        return self.db.scalars(ranked.filter(Provider.id.in_(chosen))).all()
@@ -0,0 +1,245 @@
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+from sqlalchemy import select, delete, insert, update, or_
+from sqlalchemy.exc import IntegrityError
+from typing import List, Optional, Tuple
+from fastapi import HTTPException, status
+from app.config import settings
+from app.models.booking import Booking
+from app.models.booking_slot_claim import BookingSlotClaim
+from app.models.service import Service
+from app.schemas.booking import BookingCreate
+from app.services.availability_service import (
+    AvailabilityService, RELEASED_STATUSES, SLOT_STEP_MINUTES, booking_span, duration_minutes
+)
+
+# SQLite has no row locks and reports concurrent writers as "database is
+# locked", so claims for one provider are serialized in-process; the primary
+# key on booking_slot_claims still decides between processes
+_STRIPES = [threading.Lock() for _ in range(64)]
+
+def claim_slots(start: datetime, end: datetime) -> List[datetime]:
+    """Starts of the SLOT_STEP_MINUTES slots that [start, end) touches."""
+    step = timedelta(minutes=SLOT_STEP_MINUTES)
+    midnight = datetime.combine(start.date(), datetime.min.time())
+    slot = midnight + step * ((start - midnight) // step)
+    slots = []
+    while slot < end:
+        slots.append(slot)
+        slot += step
+    return slots
+
+def _slot_taken() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="This time slot is no longer available"
+    )
+
+class BookingService:
+    """Booking writes that never let two live bookings of a provider overlap.
+
+    Every booking and hold claims the provider's slots in
+    booking_slot_claims within the same transaction as the booking row;
+    an overlapping claim fails on the primary key and the whole write is
+    rolled back with 409.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    @contextmanager
+    def _serialized(self, provider_id: str):
+        if self.db.get_bind().dialect.name != "sqlite":
+            yield
+            return
+        with _STRIPES[hash(provider_id) % len(_STRIPES)]:
+            yield
+
+    def _span(self, service_id: str, booking_date: datetime, booking_time: str) -> Tuple[datetime, datetime]:
+        duration = self.db.scalar(select(Service.duration).filter(Service.id == service_id))
+        try:
+            return booking_span(booking_date, booking_time, duration_minutes(duration))
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Booking time must be HH:MM"
+            )
+
+    def _claim(
+        self,
+        provider_id: str,
+        slots: List[datetime],
+        customer_id: str,
+        booking_id: Optional[str] = None,
+        hold_id: Optional[str] = None,
+        expires_at: Optional[datetime] = None
+    ) -> None:
+        # Expired holds give their slots up to whoever asks next
+        self.db.execute(delete(BookingSlotClaim).filter(
+            BookingSlotClaim.provider_id == provider_id,
+            BookingSlotClaim.slot_start.in_(slots),
+            BookingSlotClaim.booking_id.is_(None),
+            BookingSlotClaim.expires_at < datetime.utcnow()
+        ))
+        try:
+            self.db.execute(insert(BookingSlotClaim), [
+                {"provider_id": provider_id, "slot_start": slot, "booking_id": booking_id,
+                 "hold_id": hold_id, "customer_id": customer_id, "expires_at": expires_at}
+                for slot in slots
+            ])
+        except IntegrityError:
+            self.db.rollback()
+            raise _slot_taken()
+
+    def _taken(self, provider_id: str, slots: List[datetime]) -> bool:
+        """Cheap read-only check, so losing attempts skip the write transaction."""
+        return self.db.scalar(select(BookingSlotClaim.slot_start).filter(
+            BookingSlotClaim.provider_id == provider_id,
+            BookingSlotClaim.slot_start.in_(slots),
+            or_(BookingSlotClaim.booking_id.isnot(None), BookingSlotClaim.expires_at >= datetime.utcnow())
+        ).limit(1)) is not None
+
+    def _release(self, booking_id: str) -> None:
+        self.db.execute(delete(BookingSlotClaim).filter(BookingSlotClaim.booking_id == booking_id))
+
+    def hold_slot(self, provider_id: str, service_id: str, booking_date: datetime, booking_time: str, customer_id: str) -> dict:
+        """Reserve a slot for BOOKING_HOLD_SECONDS while the customer confirms."""
+        start, end = self._span(service_id, booking_date, booking_time)
+        hold_id = str(uuid.uuid4())
+        expires_at = datetime.utcnow() + timedelta(seconds=settings.BOOKING_HOLD_SECONDS)
+        slots = claim_slots(start, end)
+        with self._serialized(provider_id):
+            if self._taken(provider_id, slots):
+                self.db.rollback()
+                raise _slot_taken()
+            self._claim(provider_id, slots, customer_id, hold_id=hold_id, expires_at=expires_at)
+            self.db.commit()
+        return {"id": hold_id, "provider_id": provider_id, "start": start, "end": end, "expires_at": expires_at}
+
+    def release_hold(self, hold_id: str, customer_id: str) -> None:
+        self.db.execute(delete(BookingSlotClaim).filter(
+            BookingSlotClaim.hold_id == hold_id,
+            BookingSlotClaim.customer_id == customer_id,
+            BookingSlotClaim.booking_id.is_(None)
+        ))
+        self.db.commit()
+
+    def _confirm_hold(self, hold_id: str, booking: Booking, slots: List[datetime]) -> None:
+        confirmed = self.db.execute(
+            update(BookingSlotClaim)
+            .filter(
+                BookingSlotClaim.hold_id == hold_id,
+                BookingSlotClaim.customer_id == booking.customer_id,
+                BookingSlotClaim.provider_id == booking.provider_id,
+                BookingSlotClaim.slot_start.in_(slots),
+                BookingSlotClaim.booking_id.is_(None),
+                BookingSlotClaim.expires_at >= datetime.utcnow()
+            )
+            .values(booking_id=booking.id, hold_id=None, expires_at=None)
+        ).rowcount
+        if confirmed != len(slots):
+            self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Hold has expired or does not cover this booking"
+            )
+        # Slots the hold covered beyond the booking are released
+        self.db.execute(delete(BookingSlotClaim).filter(
+            BookingSlotClaim.hold_id == hold_id, BookingSlotClaim.booking_id.is_(None)
+        ))
+
+    def create_booking(self, data: BookingCreate, customer_id: str, hold_id: Optional[str] = None) -> Booking:
+        start, end = self._span(data.service_id, data.date, data.time)
+        slots = claim_slots(start, end)
+        booking = Booking(
+            service_id=data.service_id,
+            provider_id=data.provider_id,
+            customer_id=customer_id,
+            date=data.date,
+            time=data.time,
+            status="pending",
+            notes=data.notes
+        )
+        with self._serialized(data.provider_id):
+            if not hold_id and self._taken(data.provider_id, slots):
+                # The claim below still decides; this only spares the write
+                self.db.rollback()
+                raise _slot_taken()
+            self.db.add(booking)
+            self.db.flush()
+            if hold_id:
+                self._confirm_hold(hold_id, booking, slots)
+            else:
+                self._claim(data.provider_id, slots, customer_id, booking_id=booking.id)
+            self.db.commit()
+        self.db.refresh(booking)
+        AvailabilityService(self.db).booking_saved(booking)
+        return booking
+
+    def update_booking(self, booking: Booking, changes: dict) -> Booking:
+        moved = any(field in changes for field in ("date", "time"))
+        for field, value in changes.items():
+            setattr(booking, field, value)
+        booking.updated_at = datetime.utcnow()
+
+        with self._serialized(booking.provider_id):
+            if booking.status in RELEASED_STATUSES:
+                self._release(booking.id)
+            elif moved or "status" in changes:
+                # Re-claim: moved, or brought back from a released status
+                self._release(booking.id)
+                start, end = self._span(booking.service_id, booking.date, booking.time)
+                self._claim(booking.provider_id, claim_slots(start, end), booking.customer_id, booking_id=booking.id)
+            self.db.commit()
+        self.db.refresh(booking)
+        AvailabilityService(self.db).booking_saved(booking)
+        return booking
+
+    def delete_booking(self, booking: Booking) -> None:
+        booking_id = booking.id
+        self._release(booking_id)
+        self.db.delete(booking)
+        self.db.commit()
+        AvailabilityService(self.db).booking_removed(booking_id)
+
+    def rebuild_claims(self) -> Tuple[int, List[str]]:
+        """Recreate the booking claims of every live booking, oldest first.
+
+        Returns the number of bookings claimed and the ids of bookings that
+        overlap an older one; those are left unclaimed for someone to sort out.
+        """
+        self.db.execute(delete(BookingSlotClaim).filter(BookingSlotClaim.booking_id.isnot(None)))
+        taken = set(self.db.execute(select(BookingSlotClaim.provider_id, BookingSlotClaim.slot_start)).all())
+        rows, conflicts, claimed = [], [], 0
+        for booking_id, provider_id, customer_id, booking_date, booking_time, duration in self.db.execute(
+            select(
+                Booking.id, Booking.provider_id, Booking.customer_id,
+                Booking.date, Booking.time, Service.duration
+            )
+            .outerjoin(Service, Service.id == Booking.service_id)
+            .filter(Booking.status.notin_(RELEASED_STATUSES))
+            .order_by(Booking.created_at, Booking.id)
+        ):
+            try:
+                start, end = booking_span(booking_date, booking_time, duration_minutes(duration))
+            except ValueError:
+                conflicts.append(booking_id)
+                continue
+            keys = [(provider_id, slot) for slot in claim_slots(start, end)]
+            if any(key in taken for key in keys):
+                conflicts.append(booking_id)
+                continue
+            taken.update(keys)
+            claimed += 1
+            rows.extend(
+                {"provider_id": provider_id, "slot_start": slot, "booking_id": booking_id,
+                 "hold_id": None, "customer_id": customer_id, "expires_at": None}
+                for provider_id, slot in keys
+            )
+        for start in range(0, len(rows), 5000):
+            self.db.execute(insert(BookingSlotClaim), rows[start:start + 5000])
+        self.db.commit()
+        return claimed, conflicts
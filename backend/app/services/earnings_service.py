@@ -1,10 +1,12 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func, extract
+from sqlalchemy import func
 from typing import List, Dict
 from datetime import datetime, timedelta
 from app.models.job import Job
 from app.models.payment import Payment
 from app.models.user import User
+from app.models.provider_daily_stats import ProviderDailyStats
+from app.utils.sql import month_bucket
 from ..schemas.earnings import EarningsStats, Transaction, MonthlyEarnings, ServiceEarnings
 
 class EarningsService:
@@ -21,52 +23,35 @@ class EarningsService:
         else:  # year
             start_date = end_date - timedelta(days=365)
 
-        # Get total earnings
-        total_earnings = self.db.query(func.sum(Payment.amount))\
-            .join(Job, Payment.job_id == Job.id)\
-            .filter(
-                Job.provider_id == provider_id,
-                Payment.status == "completed"
-            ).scalar() or 0.0
-
-        # Get pending earnings
-        pending_earnings = self.db.query(func.sum(Payment.amount))\
-            .join(Job, Payment.job_id == Job.id)\
-            .filter(
-                Job.provider_id == provider_id,
-                Payment.status == "pending"
-            ).scalar() or 0.0
-
-        # Get completed jobs count
-        completed_jobs = self.db.query(func.count(Job.id))\
-            .filter(
-                Job.provider_id == provider_id,
-                Job.status == "completed"
-            ).scalar() or 0
+        # Totals and the monthly series come from the daily rollup
+        totals = self.db.query(
+            func.sum(ProviderDailyStats.paid_amount).label('total_earnings'),
+            func.sum(ProviderDailyStats.pending_amount).label('pending_earnings'),
+            func.sum(ProviderDailyStats.completed_count).label('completed_jobs')
+        ).filter(
+            ProviderDailyStats.provider_id == provider_id
+        ).one()
+        total_earnings = totals.total_earnings or 0.0
+        pending_earnings = totals.pending_earnings or 0.0
+        completed_jobs = totals.completed_jobs or 0
 
         # Calculate average job value
         average_job_value = total_earnings / completed_jobs if completed_jobs > 0 else 0.0
 
         # Get earnings by month
+        month = month_bucket(ProviderDailyStats.day, self.db.get_bind().dialect.name)
         monthly_earnings = self.db.query(
-            func.date_trunc('month', Payment.created_at).label('month'),
-            func.sum(Payment.amount).label('amount')
-        ).join(
-            Job, Payment.job_id == Job.id
+            month.label('month'),
+            func.sum(ProviderDailyStats.paid_amount).label('amount')
         ).filter(
-            Job.provider_id == provider_id,
-            Payment.status == "completed",
-            Payment.created_at >= start_date
-        ).group_by(
-            func.date_trunc('month', Payment.created_at)
-        ).order_by(
-            func.date_trunc('month', Payment.created_at)
-        ).all()
+            ProviderDailyStats.provider_id == provider_id,
+            ProviderDailyStats.day >= start_date.date()
+        ).group_by(month).order_by(month).all()
 
         earnings_by_month = [
             MonthlyEarnings(
-                month=earnings.month.strftime("%B %Y"),
-                amount=float(earnings.amount)
+                month=datetime.strptime(earnings.month, "%Y-%m").strftime("%B %Y"),
+                amount=float(earnings.amount or 0.0)
             ) for earnings in monthly_earnings
         ]
 
@@ -1,30 +1,32 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from app.models.job import Job, JobStatus
 from app.schemas.job import JobCreate, JobUpdate, JobStats
 from datetime import datetime, timedelta
-from sqlalchemy import func
+from sqlalchemy import func, select
 from app.models.user import User
 from fastapi import HTTPException, status
+from app.services.provider_stats_service import ProviderDailyStatsService
+from app.utils.pagination import PageParams, paginate
 
 class JobService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def create_job(self, job_data: JobCreate, customer_id: str) -> Job:
+    async def create_job(self, job_data: JobCreate, customer_id: str) -> Job:
         # Verify provider exists and is active
-        provider = self.db.query(User).filter(
+        provider = await self.db.scalar(select(User).filter(
             User.id == job_data.provider_id,
             User.role == "provider",
             User.is_active == True
-        ).first()
-        
+        ))
+
         if not provider:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Provider not found or inactive"
             )
-        
+
         # Create new job
         job = Job(
             customer_id=customer_id,
@@ -37,14 +39,17 @@ class JobService:
             amount=job_data.amount,
             status="pending"
         )
-        
+
         self.db.add(job)
-        self.db.commit()
-        self.db.refresh(job)
+        await self.db.run_sync(
+            lambda session: ProviderDailyStatsService(session).record_job_created(job)
+        )
+        await self.db.commit()
+        await self.db.refresh(job)
         return job
 
-    def get_job(self, job_id: str) -> Job:
-        job = self.db.query(Job).filter(Job.id == job_id).first()
+    async def get_job(self, job_id: str) -> Job:
+        job = await self.db.scalar(select(Job).filter(Job.id == job_id))
         if not job:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -52,95 +57,109 @@ class JobService:
             )
         return job
 
-    def update_job(self, job_id: str, job_data: JobUpdate) -> Job:
-        job = self.get_job(job_id)
-        
+    async def update_job(self, job_id: str, job_data: JobUpdate) -> Job:
+        job = await self.get_job(job_id)
+
         # Update job fields
         for field, value in job_data.dict(exclude_unset=True).items():
             setattr(job, field, value)
-        
-        self.db.commit()
-        self.db.refresh(job)
-        return job
 
-    def delete_job(self, job_id: str) -> None:
-        job = self.get_job(job_id)
-        self.db.delete(job)
-        self.db.commit()
-
-    def get_provider_jobs(self, provider_id: str) -> List[Job]:
-        return self.db.query(Job).filter(Job.provider_id == provider_id).all()
-
-    def get_customer_jobs(self, customer_id: str) -> List[Job]:
-        return self.db.query(Job).filter(Job.customer_id == customer_id).all()
+        await self.db.commit()
+        await self.db.refresh(job)
+        return job
 
-    def update_job_status(self, job_id: str, status: str) -> Job:
+    async def delete_job(self, job_id: str) -> None:
+        job = await self.get_job(job_id)
+        await self.db.delete(job)
+        await self.db.commit()
+
+    async def get_provider_jobs(self, provider_id: str, page: Optional[PageParams] = None) -> List[Job]:
+        """A provider's jobs; with `page`, one keyset page plus a lookahead row."""
+        statement = select(Job).filter(Job.provider_id == provider_id)
+        if page is not None:
+            statement = paginate(statement, Job, page, status_column=Job.status)
+        result = await self.db.scalars(statement)
+        return result.all()
+
+    async def get_customer_jobs(self, customer_id: str, page: Optional[PageParams] = None) -> List[Job]:
+        """A customer's jobs; with `page`, one keyset page plus a lookahead row."""
+        statement = select(Job).filter(Job.customer_id == customer_id)
+        if page is not None:
+            statement = paginate(statement, Job, page, status_column=Job.status)
+        result = await self.db.scalars(statement)
+        return result.all()
+
+    async def update_job_status(self, job_id: str, status: str) -> Job:
         valid_statuses = ["pending", "accepted", "in_progress", "completed", "cancelled"]
         if status not in valid_statuses:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Invalid status. Must be one of: {', '.join(valid_statuses)}"
             )
-        
-        job = self.get_job(job_id)
+
+        job = await self.get_job(job_id)
+        old_status = job.status
         job.status = status
-        
+
         if status == "completed":
             job.completed_at = datetime.utcnow()
-        
-        self.db.commit()
-        self.db.refresh(job)
+
+        await self.db.run_sync(
+            lambda session: ProviderDailyStatsService(session).record_job_status_change(job, old_status)
+        )
+        await self.db.commit()
+        await self.db.refresh(job)
         return job
 
-    def get_provider_stats(self, provider_id: str) -> JobStats:
+    async def get_provider_stats(self, provider_id: str) -> JobStats:
         # Get total jobs
-        total_jobs = self.db.query(func.count(Job.id)).filter(
+        total_jobs = await self.db.scalar(select(func.count(Job.id)).filter(
             Job.provider_id == provider_id
-        ).scalar()
-        
+        ))
+
         # Get completed jobs
-        completed_jobs = self.db.query(func.count(Job.id)).filter(
+        completed_jobs = await self.db.scalar(select(func.count(Job.id)).filter(
             Job.provider_id == provider_id,
             Job.status == "completed"
-        ).scalar()
-        
+        ))
+
         # Get total earnings
-        total_earnings = self.db.query(func.sum(Job.amount)).filter(
+        total_earnings = await self.db.scalar(select(func.sum(Job.amount)).filter(
             Job.provider_id == provider_id,
             Job.status == "completed"
-        ).scalar() or 0
-        
+        )) or 0
+
         # Get jobs by status
-        jobs_by_status = {}
-        for status in ["pending", "accepted", "in_progress", "completed", "cancelled"]:
-            count = self.db.query(func.count(Job.id)).filter(
-                Job.provider_id == provider_id,
-                Job.status == status
-            ).scalar()
-            jobs_by_status[status] = count
-        
+        jobs_by_status = dict.fromkeys(["pending", "accepted", "in_progress", "completed", "cancelled"], 0)
+        counts = await self.db.execute(select(Job.status, func.count(Job.id)).filter(
+            Job.provider_id == provider_id
+        ).group_by(Job.status))
+        for job_status, count in counts:
+            if job_status in jobs_by_status:
+                jobs_by_status[job_status] = count
+
         # Get recent jobs (last 5)
-        recent_jobs = self.db.query(Job).filter(
+        recent_jobs = await self.db.scalars(select(Job).filter(
             Job.provider_id == provider_id
-        ).order_by(Job.created_at.desc()).limit(5).all()
-        
+        ).order_by(Job.created_at.desc()).limit(5))
+
         return JobStats(
             total_jobs=total_jobs,
             completed_jobs=completed_jobs,
             total_earnings=total_earnings,
             jobs_by_status=jobs_by_status,
-            recent_jobs=recent_jobs
+            recent_jobs=recent_jobs.all()
         )
 
-    def get_job_stats(self, provider_id: int, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> dict:
-        query = self.db.query(Job).filter(Job.provider_id == provider_id)
-        
+    async def get_job_stats(self, provider_id: int, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> dict:
+        query = select(Job).filter(Job.provider_id == provider_id)
+
         if start_date:
             query = query.filter(Job.scheduled_date >= start_date)
         if end_date:
             query = query.filter(Job.scheduled_date <= end_date)
 
-        jobs = query.all()
+        jobs = (await self.db.scalars(query)).all()
 
         stats = {
             "total_jobs": len(jobs),
@@ -153,18 +172,18 @@ class JobService:
 
         return stats
 
-    def get_earnings_overview(self, provider_id: int, days: int = 7) -> List[dict]:
+    async def get_earnings_overview(self, provider_id: int, days: int = 7) -> List[dict]:
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days)
 
-        jobs = self.db.query(Job)\
-            .filter(
+        jobs = (await self.db.scalars(
+            select(Job).filter(
                 Job.provider_id == provider_id,
                 Job.scheduled_date >= start_date,
                 Job.scheduled_date <= end_date,
                 Job.status == JobStatus.COMPLETED
-            )\
-            .all()
+            )
+        )).all()
 
         # Create a dictionary to store earnings by date
         earnings_by_date = {}
@@ -184,4 +203,4 @@ class JobService:
             for date, amount in earnings_by_date.items()
         ]
 
-        return earnings_list 
\ No newline at end of file
+        return earnings_list
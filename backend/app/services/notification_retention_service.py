@@ -0,0 +1,90 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import delete, func, insert, literal, or_, select
+from typing import List, Optional
+from datetime import datetime, timedelta
+import logging
+
+from app.config import settings
+from app.models import ArchivedNotification, Notification
+
+logger = logging.getLogger(__name__)
+
+ARCHIVED_COLUMNS = ("id", "user_id", "title", "message", "type", "data", "is_read", "created_at")
+
+class NotificationRetentionService:
+    """Moves read notifications out of the hot `notifications` table.
+
+    A read notification is archived once it is older than `retention_days`,
+    or once its user has `keep_per_user` newer notifications, which bounds
+    every user's hot set. Unread notifications always stay, so unread counts
+    and reconnect replay never see a difference.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def candidates(self, retention_days: int, keep_per_user: int, now: Optional[datetime] = None) -> List[int]:
+        """Ids of the notifications to archive, oldest first."""
+        cutoff = (now or datetime.utcnow()) - timedelta(days=retention_days)
+        rank = func.row_number().over(
+            partition_by=Notification.user_id,
+            order_by=(Notification.created_at.desc(), Notification.id.desc())
+        )
+        ranked = select(
+            Notification.id, Notification.is_read, Notification.created_at, rank.label("rank")
+        ).subquery()
+        # SQLite hands the highest deleted id out again; keeping the newest
+        # row keeps ids increasing, which replay and the archive rely on
+        newest = select(func.max(Notification.id)).scalar_subquery()
+        return list(self.db.scalars(
+            select(ranked.c.id)
+            .where(
+                ranked.c.is_read == True,
+                or_(ranked.c.created_at < cutoff, ranked.c.rank > keep_per_user),
+                ranked.c.id < newest
+            )
+            .order_by(ranked.c.id)
+        ))
+
+    def archive(self, notification_ids: List[int]) -> None:
+        """Copy the notifications to the archive and delete them, in one transaction."""
+        columns = [getattr(Notification, name) for name in ARCHIVED_COLUMNS]
+        self.db.execute(
+            insert(ArchivedNotification).from_select(
+                [*ARCHIVED_COLUMNS, "archived_at"],
+                select(*columns, literal(datetime.utcnow())).where(Notification.id.in_(notification_ids))
+            )
+        )
+        self.db.execute(delete(Notification).where(Notification.id.in_(notification_ids)))
+        self.db.commit()
+
+    def compact(
+        self,
+        retention_days: Optional[int] = None,
+        keep_per_user: Optional[int] = None,
+        batch_size: int = 1000
+    ) -> int:
+        """Archive everything past the retention rules, a batch per transaction.
+
+        Returns the number of notifications archived.
+        """
+        retention_days = settings.NOTIFICATION_RETENTION_DAYS if retention_days is None else retention_days
+        keep_per_user = settings.NOTIFICATION_HOT_LIMIT if keep_per_user is None else keep_per_user
+        notification_ids = self.candidates(retention_days, keep_per_user)
+        for start in range(0, len(notification_ids), batch_size):
+            self.archive(notification_ids[start:start + batch_size])
+        logger.info(f"Archived {len(notification_ids)} notifications")
+        return len(notification_ids)
+
+    def vacuum(self) -> None:
+        """Give the space back and refresh planner statistics after a compaction."""
+        with self.db.get_bind().connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            if connection.dialect.name == "sqlite":
+                # Rebuilds the whole file, indexes included
+                connection.exec_driver_sql("VACUUM")
+                connection.exec_driver_sql("ANALYZE notifications")
+            elif connection.dialect.name == "postgresql":
+                connection.exec_driver_sql("VACUUM (ANALYZE) notifications")
+                connection.exec_driver_sql("REINDEX TABLE CONCURRENTLY notifications")
+            else:
+                connection.exec_driver_sql("ANALYZE notifications")
@@ -1,14 +1,24 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, insert, select, update
 from app.models.notification import Notification
-from app.schemas.notification import NotificationCreate
-from typing import List
+from app.schemas.notification import NotificationCreate, NotificationResponse
+import logging
+from collections import Counter
+from typing import List, Optional
+from dataclasses import replace
 from datetime import datetime
+from fastapi import HTTPException, status
+from app.core.broker import broker
+from app.core.counter_cache import unread_counts
+from app.utils.pagination import PageParams, paginate
+
+logger = logging.getLogger(__name__)
 
 class NotificationService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def create_notification(self, notification: NotificationCreate) -> Notification:
+    async def create_notification(self, notification: NotificationCreate) -> Notification:
         db_notification = Notification(
             user_id=notification.user_id,
             title=notification.title,
@@ -17,33 +27,140 @@ class NotificationService:
             data=notification.data
         )
         self.db.add(db_notification)
-        self.db.commit()
-        self.db.refresh(db_notification)
+        await self.db.commit()
+        await self.db.refresh(db_notification)
+        await self._count_unread(db_notification.user_id, 1)
+        await self.push(db_notification)
         return db_notification
 
-    def get_user_notifications(self, user_id: str) -> List[Notification]:
-        return self.db.query(Notification)\
-            .filter(Notification.user_id == user_id)\
-            .order_by(Notification.created_at.desc())\
-            .all()
-
-    def mark_as_read(self, notification_id: int, user_id: str) -> Notification:
-        notification = self.db.query(Notification)\
-            .filter(Notification.id == notification_id, Notification.user_id == user_id)\
-            .first()
-        
+    async def create_notifications(self, notifications: List[NotificationCreate]) -> List[Notification]:
+        """Store many notifications in one transaction, then push each to its user.
+
+        The rows go in as multi-row INSERTs returning their ids, so a
+        broadcast costs a handful of statements rather than one commit per
+        recipient. Rows come back in whatever order the database returns
+        them; asking for parameter order makes SQLite insert one at a time.
+        """
+        if not notifications:
+            return []
+        result = await self.db.scalars(
+            insert(Notification).returning(Notification),
+            [notification.model_dump() for notification in notifications]
+        )
+        db_notifications = result.all()
+        await self.db.commit()
+        for user_id, added in Counter(n.user_id for n in db_notifications).items():
+            await self._count_unread(user_id, added)
+        for db_notification in db_notifications:
+            await self.push(db_notification)
+        return db_notifications
+
+    @staticmethod
+    def message(notification: Notification) -> dict:
+        """The JSON a realtime client receives for a notification."""
+        return NotificationResponse.model_validate(notification).model_dump(mode="json")
+
+    async def _count_unread(self, user_id: str, delta: int) -> None:
+        """Move the user's cached unread count after a committed change."""
+        try:
+            await unread_counts.add(user_id, delta)
+        except Exception:
+            # The count is only a cache; it expires and is recounted
+            logger.exception("Updating the unread count of user %s failed", user_id)
+
+    async def get_unread_count(self, user_id: str) -> int:
+        """The user's unread notifications, from the cache when it knows them."""
+        try:
+            cached = await unread_counts.get(user_id)
+        except Exception:
+            logger.exception("Reading the unread count of user %s failed", user_id)
+            cached = None
+        if cached is not None:
+            return cached
+        count = await self.db.scalar(
+            select(func.count())
+            .select_from(Notification)
+            .filter(Notification.user_id == user_id, Notification.is_read == False)
+        )
+        try:
+            await unread_counts.set(user_id, count)
+        except Exception:
+            logger.exception("Caching the unread count of user %s failed", user_id)
+        return count
+
+    async def push(self, notification: Notification) -> None:
+        """Send a stored notification to the user's open sockets on every worker."""
+        message = self.message(notification)
+        try:
+            await broker.publish(notification.user_id, message)
+        except Exception:
+            # The row is committed; the client still sees it on its next fetch
+            logger.exception("Publishing notification %s failed", notification.id)
+
+    async def get_user_notifications(self, user_id: str, page: Optional[PageParams] = None) -> List[Notification]:
+        """A user's notifications, newest first.
+
+        With `page`, one keyset page plus a lookahead row; its status filter
+        is "read" or "unread".
+        """
+        statement = select(Notification).filter(Notification.user_id == user_id)
+        if page is None:
+            statement = statement.order_by(Notification.created_at.desc())
+        else:
+            if page.status is not None:
+                if page.status not in ("read", "unread"):
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="Status must be read or unread"
+                    )
+                statement = statement.filter(Notification.is_read == (page.status == "read"))
+                page = replace(page, status=None)
+            statement = paginate(statement, Notification, page)
+        result = await self.db.scalars(statement)
+        return result.all()
+
+    async def get_notifications_after(self, user_id: str, last_seen_id: int, limit: int) -> List[Notification]:
+        """Up to `limit` of a user's notifications newer than `last_seen_id`, oldest first."""
+        result = await self.db.scalars(
+            select(Notification)
+            .filter(Notification.user_id == user_id, Notification.id > last_seen_id)
+            .order_by(Notification.id)
+            .limit(limit)
+        )
+        return result.all()
+
+    async def mark_as_read(self, notification_id: int, user_id: str) -> Notification:
+        # Only the request that actually flips is_read moves the unread count
+        result = await self.db.execute(
+            update(Notification)
+            .filter(
+                Notification.id == notification_id,
+                Notification.user_id == user_id,
+                Notification.is_read == False
+            )
+            .values(is_read=True)
+        )
+        notification = await self.db.scalar(
+            select(Notification)
+            .filter(Notification.id == notification_id, Notification.user_id == user_id)
+        )
+
         if not notification:
             raise ValueError("Notification not found")
-        
-        notification.is_read = True
-        self.db.commit()
-        self.db.refresh(notification)
+
+        await self.db.commit()
+        if result.rowcount:
+            await self._count_unread(user_id, -1)
         return notification
 
-    def mark_all_as_read(self, user_id: str) -> int:
-        result = self.db.query(Notification)\
-            .filter(Notification.user_id == user_id, Notification.is_read == False)\
-            .update({"is_read": True})
-        
-        self.db.commit()
-        return result 
\ No newline at end of file
+    async def mark_all_as_read(self, user_id: str) -> int:
+        result = await self.db.execute(
+            update(Notification)
+            .filter(Notification.user_id == user_id, Notification.is_read == False)
+            .values(is_read=True)
+        )
+
+        await self.db.commit()
+        if result.rowcount:
+            await self._count_unread(user_id, -result.rowcount)
+        return result.rowcount
@@ -0,0 +1,119 @@
+import asyncio
+import logging
+from typing import List, Optional
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.schemas.notification import NotificationCreate
+from app.services.notification_service import NotificationService
+
+logger = logging.getLogger(__name__)
+
+class NotificationWriter:
+    """Write-behind buffer for notifications nobody waits on, such as broadcasts.
+
+    add() only appends to an in-memory buffer. A background task writes the
+    buffer with NotificationService.create_notifications once it holds
+    `batch_size` notifications or `flush_seconds` after the first one arrived,
+    whichever comes first, and each row is pushed to its user as soon as its
+    batch is committed. When writes fall behind and the buffer reaches
+    `buffer_limit`, add() waits for a flush instead of growing it further.
+    """
+
+    def __init__(
+        self,
+        session_factory=None,
+        batch_size: Optional[int] = None,
+        flush_seconds: Optional[float] = None,
+        buffer_limit: Optional[int] = None
+    ):
+        self.session_factory = session_factory or AsyncSessionLocal
+        self.batch_size = batch_size or settings.NOTIFICATION_BATCH_SIZE
+        self.flush_seconds = flush_seconds or settings.NOTIFICATION_FLUSH_SECONDS
+        self.buffer_limit = buffer_limit or settings.NOTIFICATION_BUFFER_LIMIT
+        self.written = 0
+        self.flushes = 0
+        self.failed = 0
+        self._buffer: List[NotificationCreate] = []
+        self._pending: Optional[asyncio.Event] = None
+        self._flushed: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def start(self) -> None:
+        """Start the flushing task; call once the event loop is running."""
+        if self._task is None or self._task.done():
+            self._pending = asyncio.Event()
+            self._flushed = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Write whatever is still buffered, then stop the flushing task."""
+        if self._task is not None:
+            # Not cancelled: a batch being written must not be lost half way
+            self._stopping = True
+            self._pending.set()
+            await self._task
+            self._task = None
+            self._stopping = False
+        while self._buffer:
+            await self.flush()
+
+    async def add(self, notification: NotificationCreate) -> None:
+        while len(self._buffer) >= self.buffer_limit and self._task is not None:
+            self._flushed.clear()
+            await self._flushed.wait()
+        self._buffer.append(notification)
+        if self._pending is not None:
+            self._pending.set()
+
+    async def add_many(self, notifications: List[NotificationCreate]) -> None:
+        for notification in notifications:
+            await self.add(notification)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._pending.wait()
+            # Give the batch until flush_seconds to fill up
+            deadline = loop.time() + self.flush_seconds
+            while len(self._buffer) < self.batch_size and not self._stopping:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                self._pending.clear()
+                try:
+                    await asyncio.wait_for(self._pending.wait(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    break
+            await self.flush()
+            if self._buffer:
+                self._pending.set()
+            elif self._stopping:
+                return
+            else:
+                self._pending.clear()
+
+    async def flush(self) -> None:
+        """Write up to one batch from the buffer."""
+        batch = self._buffer[:self.batch_size]
+        if not batch:
+            return
+        del self._buffer[:self.batch_size]
+        try:
+            async with self.session_factory() as db:
+                await NotificationService(db).create_notifications(batch)
+            self.written += len(batch)
+        except Exception:
+            # Losing a broadcast beats wedging the writer on a bad batch
+            self.failed += len(batch)
+            logger.exception("Writing %s buffered notifications failed", len(batch))
+        finally:
+            self.flushes += 1
+            if self._flushed is not None:
+                self._flushed.set()
+
+notification_writer = NotificationWriter()
@@ -0,0 +1,197 @@
+import threading
+import time
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+from sqlalchemy import select, or_, and_
+from typing import List, Optional, Tuple
+from app.config import settings
+from app.models.provider import Provider
+from app.services.provider_search_service import normalize, _prefix_upper_bound
+from app.utils.geo import GridIndex, bounding_box, covering_geohashes, distance_km
+
+_VERIFIED, _UNVERIFIED = "verified", "unverified"
+# Most geohash prefix ranges the database path scans per query
+_MAX_DB_CELLS = 16
+
+def _tags(categories, is_verified) -> set:
+    tags = {_VERIFIED if is_verified else _UNVERIFIED}
+    tags.update(f"category:{normalize(category)}" for category in categories or [])
+    return tags
+
+def _query_tags(category: Optional[str], verified: Optional[bool]) -> set:
+    tags = {f"category:{normalize(category)}"} if normalize(category) else set()
+    if verified is not None:
+        tags.add(_VERIFIED if verified else _UNVERIFIED)
+    return tags
+
+class ProviderGeoIndex:
+    """Per-process grid of provider locations, the fast path for nearby search.
+
+    The first query loads every located provider; later queries pick up
+    providers changed since the last refresh (by updated_at) at most every
+    `refresh_seconds`. updated_at is stamped at flush, not at commit, so a
+    row can become visible with a timestamp older than ones already read:
+    each refresh re-reads `lag_seconds` behind the newest one, and the whole
+    grid is reloaded every `rebuild_seconds` for anything later still.
+    Deleted providers are dropped when a query finds that their row is gone,
+    or by the next reload.
+    """
+
+    def __init__(self, refresh_seconds: float = 5.0, rebuild_seconds: float = 300.0, lag_seconds: float = 60.0):
+        self.refresh_seconds = refresh_seconds
+        self.rebuild_seconds = rebuild_seconds
+        self.lag_seconds = lag_seconds
+        self.grid = GridIndex()
+        self.watermark: Optional[datetime] = None
+        self.refreshed_at: Optional[float] = None
+        self.rebuilt_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.grid)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.grid = GridIndex()
+            self.watermark = None
+            self.refreshed_at = None
+            self.rebuilt_at = None
+
+    def _is_fresh(self) -> bool:
+        return self.refreshed_at is not None and time.monotonic() - self.refreshed_at < self.refresh_seconds
+
+    def refresh(self, db: Session, force: bool = False) -> None:
+        if not force and self._is_fresh():
+            return
+        with self._lock:
+            if not force and self._is_fresh():
+                return
+            now = time.monotonic()
+            statement = select(
+                Provider.id, Provider.latitude, Provider.longitude,
+                Provider.service_categories, Provider.is_verified, Provider.updated_at
+            )
+            rebuild = self.rebuilt_at is None or now - self.rebuilt_at >= self.rebuild_seconds
+            if rebuild:
+                grid, watermark = GridIndex(), None
+            else:
+                grid, watermark = self.grid, self.watermark
+                if watermark is not None:
+                    statement = statement.filter(
+                        Provider.updated_at >= watermark - timedelta(seconds=self.lag_seconds)
+                    )
+            for provider_id, latitude, longitude, categories, is_verified, updated_at in db.execute(statement):
+                if latitude is None or longitude is None:
+                    grid.remove(provider_id)
+                else:
+                    grid.add(provider_id, latitude, longitude, _tags(categories, is_verified))
+                if updated_at is not None and (watermark is None or updated_at > watermark):
+                    watermark = updated_at
+            self.grid, self.watermark = grid, watermark
+            self.refreshed_at = now
+            if rebuild:
+                self.rebuilt_at = now
+
+    def remove(self, provider_id: str) -> None:
+        with self._lock:
+            self.grid.remove(provider_id)
+
+    def nearest(self, latitude: float, longitude: float, k: int, radius_km: float, tags) -> List[Tuple[float, str]]:
+        with self._lock:
+            return self.grid.nearest(latitude, longitude, k, radius_km, tags)
+
+geo_index = ProviderGeoIndex(
+    settings.GEO_INDEX_REFRESH_SECONDS, settings.GEO_INDEX_REBUILD_SECONDS, settings.GEO_INDEX_WATERMARK_LAG_SECONDS
+)
+
+class ProviderGeoService:
+    """Nearest providers to a point, from the in-process index or the database."""
+
+    def __init__(self, db: Session, index: Optional[ProviderGeoIndex] = None):
+        self.db = db
+        self.index = index if index is not None else geo_index
+
+    def nearby(
+        self,
+        latitude: float,
+        longitude: float,
+        k: int = 10,
+        radius_km: float = 5.0,
+        category: Optional[str] = None,
+        verified: Optional[bool] = None,
+        use_index: Optional[bool] = None
+    ) -> List[Tuple[float, Provider]]:
+        """Up to `k` (distance_km, provider) pairs within `radius_km`, nearest first."""
+        if use_index is None:
+            use_index = settings.GEO_INDEX_ENABLED
+        if not use_index:
+            return self._load(self._nearest_from_db(latitude, longitude, k, radius_km, category, verified))
+
+        self.index.refresh(self.db)
+        tags = _query_tags(category, verified)
+        while True:
+            ranked = self.index.nearest(latitude, longitude, k, radius_km, tags)
+            results = self._load(ranked)
+            if len(results) == len(ranked):
+                return results
+            # Some providers were deleted since the index last saw them
+            found = {provider.id for _, provider in results}
+            for _, provider_id in ranked:
+                if provider_id not in found:
+                    self.index.remove(provider_id)
+
+    def _load(self, ranked: List[Tuple[float, str]]) -> List[Tuple[float, Provider]]:
+        if not ranked:
+            return []
+        providers = {
+            provider.id: provider
+            for provider in self.db.scalars(
+                select(Provider).filter(Provider.id.in_([provider_id for _, provider_id in ranked]))
+            )
+        }
+        return [
+            (distance, providers[provider_id])
+            for distance, provider_id in ranked
+            if provider_id in providers
+        ]
+
+    def _nearest_from_db(
+        self,
+        latitude: float,
+        longitude: float,
+        k: int,
+        radius_km: float,
+        category: Optional[str],
+        verified: Optional[bool]
+    ) -> List[Tuple[float, str]]:
+        # The finest geohash precision whose cells cover the circle in a few ranges
+        for precision in range(6, 0, -1):
+            cells = covering_geohashes(latitude, longitude, radius_km, precision)
+            if len(cells) <= _MAX_DB_CELLS:
+                break
+        min_lat, min_lon, max_lat, max_lon = bounding_box(latitude, longitude, radius_km)
+        # Only the geohash ranges are indexed; verification and category are
+        # checked here so the planner cannot prefer ix_providers_verified_rating
+        # and walk every verified provider in the country
+        candidates = self.db.execute(
+            select(
+                Provider.id, Provider.latitude, Provider.longitude,
+                Provider.service_categories, Provider.is_verified
+            ).filter(
+                or_(*(
+                    and_(Provider.geohash >= cell, Provider.geohash < _prefix_upper_bound(cell))
+                    for cell in cells
+                )),
+                Provider.latitude.between(min_lat, max_lat),
+                Provider.longitude.between(min_lon, max_lon)
+            )
+        ).all()
+
+        wanted = _query_tags(category, verified)
+        ranked = []
+        for provider_id, lat, lon, categories, is_verified in candidates:
+            distance = distance_km(latitude, longitude, lat, lon)
+            if distance <= radius_km and wanted <= _tags(categories, is_verified):
+                ranked.append((distance, provider_id))
+        ranked.sort()
+        return ranked[:k]
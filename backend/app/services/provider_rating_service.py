@@ -0,0 +1,106 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import case, func, select, update
+from typing import Dict, Iterable, List, Optional, Tuple
+from app.models import Provider, Review
+
+STARS = (1, 2, 3, 4, 5)
+
+def star(rating: float) -> int:
+    """The histogram bucket of a rating: rounded to the nearest whole star."""
+    return min(5, max(1, int(rating + 0.5)))
+
+def star_column(value: int):
+    return getattr(Provider, f"rating_{value}_count")
+
+def histogram(provider: Provider) -> Dict[int, int]:
+    return {value: getattr(provider, f"rating_{value}_count") or 0 for value in STARS}
+
+def rating_update(provider_id: str, added: Iterable[float] = (), removed: Iterable[float] = ()):
+    """One UPDATE that moves a provider's aggregates by the given ratings.
+
+    Every SET expression reads the row as it was before the statement, so
+    concurrent writers each apply their own delta and none is lost.
+    """
+    added, removed = list(added), list(removed)
+    count_delta = len(added) - len(removed)
+    sum_delta = sum(added) - sum(removed)
+    stars = {}
+    for rating in added:
+        stars[star(rating)] = stars.get(star(rating), 0) + 1
+    for rating in removed:
+        stars[star(rating)] = stars.get(star(rating), 0) - 1
+
+    count = func.coalesce(Provider.total_reviews, 0) + count_delta
+    total = Provider.rating_sum + sum_delta
+    values = {
+        "total_reviews": count,
+        "rating_sum": total,
+        "rating": case((count > 0, total / count), else_=0.0),
+    }
+    for value, delta in stars.items():
+        if delta:
+            values[f"rating_{value}_count"] = star_column(value) + delta
+    return (
+        update(Provider)
+        .filter(Provider.id == provider_id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+
+class ProviderRatingService:
+    """Keeps each provider's rating sum, review count and star histogram.
+
+    The record_* methods only stage the UPDATE on the caller's session; the
+    caller commits it together with the review write.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def record_review_created(self, review: Review) -> None:
+        self.db.execute(rating_update(review.provider_id, added=[review.rating]))
+
+    def record_review_updated(self, review: Review, old_rating: float) -> None:
+        if review.rating != old_rating:
+            self.db.execute(rating_update(review.provider_id, added=[review.rating], removed=[old_rating]))
+
+    def record_review_deleted(self, review: Review) -> None:
+        self.db.execute(rating_update(review.provider_id, removed=[review.rating]))
+
+    def distribution(self, provider_id: str) -> Optional[Tuple[int, float, Dict[int, int]]]:
+        """(total_reviews, average rating, star histogram), or None for an unknown provider."""
+        provider = self.db.get(Provider, provider_id)
+        if provider is None:
+            return None
+        return provider.total_reviews or 0, provider.rating or 0.0, histogram(provider)
+
+    def rebuild(self) -> int:
+        """Recompute every provider's aggregates from the reviews table.
+
+        Returns the number of providers that have reviews.
+        """
+        totals: Dict[str, dict] = {}
+        for provider_id, rating, count in self.db.execute(
+            select(Review.provider_id, Review.rating, func.count(Review.id))
+            .group_by(Review.provider_id, Review.rating)
+        ):
+            row = totals.setdefault(provider_id, {
+                "id": provider_id, "total_reviews": 0, "rating_sum": 0.0,
+                **{f"rating_{value}_count": 0 for value in STARS}
+            })
+            row["total_reviews"] += count
+            row["rating_sum"] += rating * count
+            row[f"rating_{star(rating)}_count"] += count
+
+        self.db.execute(
+            update(Provider)
+            .values(rating=0.0, total_reviews=0, rating_sum=0.0, **{f"rating_{value}_count": 0 for value in STARS})
+            .execution_options(synchronize_session=False)
+        )
+        rows: List[dict] = [
+            {**row, "rating": row["rating_sum"] / row["total_reviews"]} for row in totals.values()
+        ]
+        for start in range(0, len(rows), 5000):
+            self.db.execute(update(Provider), rows[start:start + 5000])
+        self.db.commit()
+        return len(rows)
@@ -0,0 +1,128 @@
+import re
+from sqlalchemy.orm import Session
+from sqlalchemy import select, delete, insert, func, and_
+from typing import Iterable, List, Optional, Tuple
+from app.models.provider import Provider
+from app.models.provider_search_token import ProviderSearchToken
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+def tokenize(value: Optional[str]) -> List[str]:
+    """Lowercase words of `value`; "Victoria Island" -> ["victoria", "island"]."""
+    return _WORD.findall((value or "").lower())
+
+def normalize(value: Optional[str]) -> str:
+    """A whole value as one token; "Victoria  Island!" -> "victoria island"."""
+    return " ".join(tokenize(value))
+
+def _tokens(categories: Iterable[str], areas: Iterable[str]) -> set:
+    # Words of each value for free-text search, plus the whole value as a
+    # "<kind>_exact" token for the structured filters
+    tokens = set()
+    for kind, values in (("category", categories), ("area", areas)):
+        for value in values or []:
+            tokens.update((token, kind) for token in tokenize(value))
+            if normalize(value):
+                tokens.add((normalize(value), f"{kind}_exact"))
+    return tokens
+
+def _rows(provider_id: str, categories, areas) -> List[dict]:
+    return [
+        {"token": token, "kind": kind, "provider_id": provider_id}
+        for token, kind in sorted(_tokens(categories, areas))
+    ]
+
+def _prefix_upper_bound(prefix: str) -> str:
+    # Every string starting with `prefix` sorts before this one
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+class ProviderSearchService:
+    """Provider discovery over the provider_search_tokens inverted index.
+
+    index_provider/remove_provider only stage statements on the caller's
+    session; the caller commits them together with the provider write.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def index_provider(self, provider: Provider) -> None:
+        self.remove_provider(provider.id)
+        rows = _rows(provider.id, provider.service_categories, provider.service_areas)
+        if rows:
+            self.db.execute(insert(ProviderSearchToken), rows)
+
+    def remove_provider(self, provider_id: str) -> None:
+        self.db.execute(delete(ProviderSearchToken).filter(
+            ProviderSearchToken.provider_id == provider_id
+        ))
+
+    def rebuild(self, batch_size: int = 5000) -> int:
+        """Recreate the whole index from the providers table."""
+        self.db.execute(delete(ProviderSearchToken))
+        providers = self.db.execute(
+            select(Provider.id, Provider.service_categories, Provider.service_areas)
+        ).all()
+        batch = []
+        for provider_id, categories, areas in providers:
+            batch.extend(_rows(provider_id, categories, areas))
+            if len(batch) >= batch_size:
+                self.db.execute(insert(ProviderSearchToken), batch)
+                batch = []
+        if batch:
+            self.db.execute(insert(ProviderSearchToken), batch)
+        self.db.commit()
+        return len(providers)
+
+    def _matching(self, token: str, kind: Optional[str] = None, prefix: bool = False):
+        """Provider ids whose index contains `token` (or a word starting with it)."""
+        if prefix:
+            condition = and_(
+                ProviderSearchToken.token >= token,
+                ProviderSearchToken.token < _prefix_upper_bound(token)
+            )
+        else:
+            condition = ProviderSearchToken.token == token
+        if kind is not None:
+            condition = and_(condition, ProviderSearchToken.kind == kind)
+        return select(ProviderSearchToken.provider_id).filter(condition)
+
+    def search(
+        self,
+        q: Optional[str] = None,
+        category: Optional[str] = None,
+        area: Optional[str] = None,
+        verified: Optional[bool] = None,
+        min_rating: Optional[float] = None,
+        page: int = 1,
+        page_size: int = 20
+    ) -> Tuple[int, List[Provider]]:
+        """Providers matching every given term, best rated first.
+
+        Each word of `q` must match a category or area word; the last one may
+        be a prefix so results update while the user is typing. `category`
+        and `area` must equal one of the provider's values of that kind,
+        ignoring case and punctuation: "Electrical" does not match
+        "Electrical Repairs".
+        """
+        conditions = []
+        words = tokenize(q)
+        for i, word in enumerate(words):
+            conditions.append(Provider.id.in_(self._matching(word, prefix=i == len(words) - 1)))
+        for kind, value in (("category", category), ("area", area)):
+            if normalize(value):
+                conditions.append(Provider.id.in_(self._matching(normalize(value), kind=f"{kind}_exact")))
+        if verified is not None:
+            conditions.append(Provider.is_verified == verified)
+        if min_rating is not None:
+            conditions.append(Provider.rating >= min_rating)
+
+        total = self.db.scalar(select(func.count(Provider.id)).filter(*conditions))
+        providers = self.db.scalars(
+            select(Provider)
+            .filter(*conditions)
+            .order_by(Provider.rating.desc(), Provider.total_reviews.desc(), Provider.id)
+            .offset((page - 1) * page_size)
+            .limit(page_size)
+        ).all()
+        return total, providers
@@ -1,20 +1,24 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
 from typing import List, Optional
 from app.models.provider import Provider
+from app.models.job import Job
 from app.schemas.provider import ProviderCreate, ProviderUpdate
 from app.schemas.job import JobStats
 from datetime import datetime, timedelta
-from app.models.user import User
+from app.services.provider_search_service import ProviderSearchService
+from app.services.availability_service import AvailabilityService, availability_index
+from app.services.provider_rating_service import rating_update
 from fastapi import HTTPException, status
-import json
 
 class ProviderService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def create_provider(self, provider_data: ProviderCreate, user_id: str) -> Provider:
+    async def create_provider(self, provider_data: ProviderCreate, user_id: str) -> Provider:
         # Check if user already has a provider profile
-        existing_provider = self.db.query(Provider).filter(Provider.user_id == user_id).first()
+        existing_provider = await self.db.scalar(select(Provider).filter(Provider.user_id == user_id))
         if existing_provider:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -27,12 +31,22 @@ class ProviderService:
             **provider_data.model_dump()
         )
         self.db.add(provider)
-        self.db.commit()
-        self.db.refresh(provider)
+        await self.db.flush()
+        await self.db.run_sync(
+            lambda session: ProviderSearchService(session).index_provider(provider)
+        )
+        windows = await self.db.run_sync(
+            lambda session: AvailabilityService(session).set_availability(provider, provider_data.availability)
+        )
+        await self.db.commit()
+        await self.db.refresh(provider)
+        availability_index.set_windows(provider.id, windows)
         return provider
 
-    def get_provider(self, provider_id: str) -> Provider:
-        provider = self.db.query(Provider).filter(Provider.id == provider_id).first()
+    async def get_provider(self, provider_id: str, *options) -> Provider:
+        provider = await self.db.scalar(
+            select(Provider).options(*options).filter(Provider.id == provider_id)
+        )
         if not provider:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -40,8 +54,8 @@ class ProviderService:
             )
         return provider
 
-    def get_provider_by_user_id(self, user_id: str) -> Provider:
-        provider = self.db.query(Provider).filter(Provider.user_id == user_id).first()
+    async def get_provider_by_user_id(self, user_id: str) -> Provider:
+        provider = await self.db.scalar(select(Provider).filter(Provider.user_id == user_id))
         if not provider:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -49,34 +63,57 @@ class ProviderService:
             )
         return provider
 
-    def update_provider(self, provider_id: str, provider_data: ProviderUpdate) -> Provider:
-        provider = self.get_provider(provider_id)
-        
+    async def update_provider(self, provider_id: str, provider_data: ProviderUpdate) -> Provider:
+        provider = await self.get_provider(provider_id)
+
         # Update provider fields
         for field, value in provider_data.model_dump(exclude_unset=True).items():
             setattr(provider, field, value)
-        
-        self.db.commit()
-        self.db.refresh(provider)
+        await self.db.run_sync(
+            lambda session: ProviderSearchService(session).index_provider(provider)
+        )
+        windows = None
+        if provider_data.availability is not None:
+            windows = await self.db.run_sync(
+                lambda session: AvailabilityService(session).set_availability(provider, provider_data.availability)
+            )
+
+        await self.db.commit()
+        await self.db.refresh(provider)
+        if windows is not None:
+            availability_index.set_windows(provider.id, windows)
         return provider
 
-    def delete_provider(self, provider_id: str):
-        provider = self.get_provider(provider_id)
-        self.db.delete(provider)
-        self.db.commit()
+    async def delete_provider(self, provider_id: str):
+        provider = await self.get_provider(provider_id)
+        await self.db.run_sync(
+            lambda session: ProviderSearchService(session).remove_provider(provider_id)
+        )
+        await self.db.run_sync(
+            lambda session: AvailabilityService(session).remove_provider(provider_id)
+        )
+        await self.db.delete(provider)
+        await self.db.commit()
+
+    async def get_provider_profile(self, provider_id: str) -> dict:
+        # Relationships cannot lazy-load on an AsyncSession, so the user, jobs
+        # and reviews are fetched up front
+        provider = await self.get_provider(
+            provider_id,
+            selectinload(Provider.user),
+            selectinload(Provider.jobs),
+            selectinload(Provider.reviews)
+        )
 
-    def get_provider_profile(self, provider_id: str) -> dict:
-        provider = self.get_provider(provider_id)
-        
         # Get user information
-        user = self.db.query(User).filter(User.id == provider.user_id).first()
-        
+        user = provider.user
+
         # Get provider's jobs
         jobs = provider.jobs
-        
+
         # Get provider's reviews
         reviews = provider.reviews
-        
+
         return {
             "provider": provider,
             "user": {
@@ -88,37 +125,29 @@ class ProviderService:
             "reviews": [review.__dict__ for review in reviews]
         }
 
-    def update_availability(self, provider_id: str, availability: str):
-        provider = self.get_provider(provider_id)
-        
-        # Validate availability JSON
-        try:
-            json.loads(availability)
-        except json.JSONDecodeError:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid availability format"
-            )
-        
-        provider.availability = availability
-        self.db.commit()
-        self.db.refresh(provider)
+    async def update_availability(self, provider_id: str, availability: str):
+        provider = await self.get_provider(provider_id)
+
+        # Normalize into weekly windows; invalid JSON or times are rejected
+        windows = await self.db.run_sync(
+            lambda session: AvailabilityService(session).set_availability(provider, availability)
+        )
+        await self.db.commit()
+        await self.db.refresh(provider)
+        availability_index.set_windows(provider.id, windows)
         return provider
 
-    def update_rating(self, provider_id: str, new_rating: float):
-        provider = self.get_provider(provider_id)
-        
-        # Update rating and total reviews
-        total_rating = provider.rating * provider.total_reviews
-        provider.total_reviews += 1
-        provider.rating = (total_rating + new_rating) / provider.total_reviews
-        
-        self.db.commit()
-        self.db.refresh(provider)
+    async def update_rating(self, provider_id: str, new_rating: float):
+        provider = await self.get_provider(provider_id)
+
+        # Applied in SQL so concurrent ratings are never lost
+        await self.db.execute(rating_update(provider_id, added=[new_rating]))
+        await self.db.commit()
+        await self.db.refresh(provider)
         return provider
 
-    def get_provider_stats(self, provider_id: int) -> JobStats:
-        provider = self.get_provider(provider_id)
+    async def get_provider_stats(self, provider_id: int) -> JobStats:
+        provider = await self.get_provider(provider_id, selectinload(Provider.jobs))
         if not provider:
             return None
 
@@ -131,10 +160,10 @@ class ProviderService:
         confirmed_jobs = len([j for j in jobs if j.status == "confirmed"])
         completed_jobs = len([j for j in jobs if j.status == "completed"])
         cancelled_jobs = len([j for j in jobs if j.status == "cancelled"])
-        
+
         # Calculate total earnings from completed jobs
         total_earnings = sum(j.cost for j in jobs if j.status == "completed")
-        
+
         # Get average rating from reviews
         average_rating = provider.rating
 
@@ -148,16 +177,18 @@ class ProviderService:
             average_rating=average_rating
         )
 
-    def get_recent_jobs(self, provider_id: int, limit: int = 5) -> List[dict]:
-        provider = self.get_provider(provider_id)
+    async def get_recent_jobs(self, provider_id: int, limit: int = 5) -> List[dict]:
+        provider = await self.get_provider(provider_id)
         if not provider:
             return []
 
-        recent_jobs = self.db.query(Provider.jobs)\
-            .filter(Provider.id == provider_id)\
-            .order_by(Provider.jobs.created_at.desc())\
-            .limit(limit)\
-            .all()
+        recent_jobs = (await self.db.scalars(
+            select(Job)
+            .options(selectinload(Job.customer))
+            .filter(Job.provider_id == provider_id)
+            .order_by(Job.created_at.desc())
+            .limit(limit)
+        )).all()
 
         return [
             {
@@ -172,12 +203,12 @@ class ProviderService:
             for job in recent_jobs
         ]
 
-    def update_services(self, provider_id: int, services: List[str]) -> Optional[Provider]:
-        provider = self.get_provider(provider_id)
+    async def update_services(self, provider_id: int, services: List[str]) -> Optional[Provider]:
+        provider = await self.get_provider(provider_id)
         if not provider:
             return None
 
         provider.services = services
-        self.db.commit()
-        self.db.refresh(provider)
-        return provider 
\ No newline at end of file
+        await self.db.commit()
+        await self.db.refresh(provider)
+        return provider
@@ -0,0 +1,190 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, delete, insert
+from sqlalchemy.dialects import postgresql, sqlite
+from typing import Dict, Optional, Tuple
+from datetime import datetime, date
+from app.models.job import Job
+from app.models.review import Review
+from app.models.payment import Payment
+from app.models.provider_daily_stats import ProviderDailyStats
+from app.utils.sql import hours_between, day_bucket
+
+def _day(value: Optional[datetime]) -> date:
+    return (value or datetime.utcnow()).date()
+
+def _payment_column(status: str) -> Optional[str]:
+    if status == "completed":
+        return "paid_amount"
+    if status == "pending":
+        return "pending_amount"
+    return None
+
+class ProviderDailyStatsService:
+    """Keeps provider_daily_stats in step with jobs, reviews and payments.
+
+    The record_* methods only stage an upsert on the caller's session; the
+    caller commits it together with the write that triggered it.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    @property
+    def dialect(self) -> str:
+        return self.db.get_bind().dialect.name
+
+    def _bump(self, provider_id: str, day: date, **deltas) -> None:
+        deltas = {column: value for column, value in deltas.items() if value}
+        if not provider_id or not deltas:
+            return
+        dialect_insert = postgresql.insert if self.dialect == "postgresql" else sqlite.insert
+        table = ProviderDailyStats.__table__
+        stmt = dialect_insert(table).values(provider_id=provider_id, day=day, **deltas)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.provider_id, table.c.day],
+            set_={
+                **{column: table.c[column] + stmt.excluded[column] for column in deltas},
+                "updated_at": datetime.utcnow(),
+            }
+        )
+        self.db.execute(stmt)
+
+    # Jobs
+
+    def record_job_created(self, job: Job) -> None:
+        self._bump(job.provider_id, _day(job.created_at), booking_count=1)
+
+    def record_job_status_change(self, job: Job, old_status: str) -> None:
+        """Also stamps job.responded_at when the job leaves pending, and
+        clears it when the job goes back, so rebuild() sees the same
+        response times."""
+        if old_status == job.status:
+            return
+        now = datetime.utcnow()
+        created_at = job.created_at or now
+        if old_status == "pending":
+            job.responded_at = now
+            self._bump(
+                job.provider_id, created_at.date(),
+                response_count=1,
+                response_time_sum=(now - created_at).total_seconds() / 3600
+            )
+        elif job.status == "pending":
+            # Moved back to pending: take back exactly what the response added
+            responded_at = job.responded_at or now
+            job.responded_at = None
+            self._bump(
+                job.provider_id, created_at.date(),
+                response_count=-1,
+                response_time_sum=-(responded_at - created_at).total_seconds() / 3600
+            )
+        if job.status == "completed":
+            self._bump(
+                job.provider_id, _day(job.completed_at),
+                completed_count=1, completed_revenue=job.amount or 0.0
+            )
+        elif old_status == "completed":
+            self._bump(
+                job.provider_id, _day(job.completed_at),
+                completed_count=-1, completed_revenue=-(job.amount or 0.0)
+            )
+
+    # Reviews
+
+    def record_review_created(self, review: Review) -> None:
+        self._bump(
+            review.provider_id, _day(review.created_at),
+            review_count=1, review_sum=review.rating
+        )
+
+    def record_review_updated(self, review: Review, old_rating: float) -> None:
+        self._bump(
+            review.provider_id, _day(review.created_at),
+            review_sum=review.rating - old_rating
+        )
+
+    def record_review_deleted(self, review: Review) -> None:
+        self._bump(
+            review.provider_id, _day(review.created_at),
+            review_count=-1, review_sum=-review.rating
+        )
+
+    # Payments
+
+    def record_payment_status_change(self, payment: Payment, old_status: Optional[str]) -> None:
+        # Payment.status defaults to "pending" but is only populated on flush
+        status = payment.status or "pending"
+        if not payment.job_id or old_status == status:
+            return
+        provider_id = self.db.query(Job.provider_id).filter(Job.id == payment.job_id).scalar()
+        day = _day(payment.created_at)
+        deltas: Dict[str, float] = {}
+        old_column = _payment_column(old_status) if old_status else None
+        new_column = _payment_column(status)
+        if old_column:
+            deltas[old_column] = deltas.get(old_column, 0.0) - payment.amount
+        if new_column:
+            deltas[new_column] = deltas.get(new_column, 0.0) + payment.amount
+        self._bump(provider_id, day, **deltas)
+
+    # Backfill
+
+    def rebuild(self, provider_id: Optional[str] = None) -> int:
+        """Recompute the rollup from the base tables. Returns rows written."""
+        rows: Dict[Tuple[str, str], Dict[str, float]] = {}
+
+        def add(provider, day, **values):
+            if provider is None or day is None:
+                return
+            row = rows.setdefault((provider, day), {})
+            for column, value in values.items():
+                row[column] = row.get(column, 0) + (value or 0)
+
+        def scoped(query, column):
+            return query.filter(column == provider_id) if provider_id else query
+
+        created_day = day_bucket(Job.created_at, self.dialect)
+        response_hours = hours_between(Job.created_at, Job.responded_at, self.dialect)
+        for provider, day, bookings, responses, response_sum in scoped(self.db.query(
+            Job.provider_id, created_day, func.count(Job.id),
+            func.count(Job.responded_at),
+            func.sum(response_hours)
+        ), Job.provider_id).group_by(Job.provider_id, created_day):
+            add(provider, day, booking_count=bookings,
+                response_count=responses, response_time_sum=response_sum)
+
+        completed_day = day_bucket(Job.completed_at, self.dialect)
+        for provider, day, completed, revenue in scoped(self.db.query(
+            Job.provider_id, completed_day, func.count(Job.id), func.sum(Job.amount)
+        ), Job.provider_id).filter(
+            Job.status == "completed"
+        ).group_by(Job.provider_id, completed_day):
+            add(provider, day, completed_count=completed, completed_revenue=revenue)
+
+        review_day = day_bucket(Review.created_at, self.dialect)
+        for provider, day, reviews, rating_sum in scoped(self.db.query(
+            Review.provider_id, review_day, func.count(Review.id), func.sum(Review.rating)
+        ), Review.provider_id).group_by(Review.provider_id, review_day):
+            add(provider, day, review_count=reviews, review_sum=rating_sum)
+
+        payment_day = day_bucket(Payment.created_at, self.dialect)
+        for provider, day, status, amount in scoped(self.db.query(
+            Job.provider_id, payment_day, Payment.status, func.sum(Payment.amount)
+        ).join(
+            Job, Payment.job_id == Job.id
+        ), Job.provider_id).group_by(Job.provider_id, payment_day, Payment.status):
+            column = _payment_column(status)
+            if column:
+                add(provider, day, **{column: amount})
+
+        stale = delete(ProviderDailyStats)
+        if provider_id:
+            stale = stale.where(ProviderDailyStats.provider_id == provider_id)
+        self.db.execute(stale)
+        if rows:
+            self.db.execute(insert(ProviderDailyStats), [
+                {"provider_id": provider, "day": date.fromisoformat(day), **values}
+                for (provider, day), values in rows.items()
+            ])
+        self.db.commit()
+        return len(rows)
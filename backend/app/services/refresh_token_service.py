@@ -0,0 +1,112 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import delete, update
+from fastapi import HTTPException, status
+from typing import Optional, Tuple
+from datetime import datetime, timedelta
+from uuid import uuid4
+import hashlib
+import hmac
+import logging
+import secrets
+
+from app.config import settings
+from app.models import RefreshToken, User
+
+logger = logging.getLogger(__name__)
+
+def hash_refresh_token(token: str) -> str:
+    """What a refresh token is stored and looked up under."""
+    return hmac.new(
+        settings.REFRESH_TOKEN_SECRET.encode("utf-8"), token.encode("utf-8"), hashlib.sha256
+    ).hexdigest()
+
+class RefreshTokenService:
+    """Rotating refresh tokens, so clients renew sessions without a password.
+
+    Clients hold a random token; the table keeps only its HMAC, which is
+    cheap to compute and is the primary key, so a refresh is one indexed
+    lookup instead of a bcrypt verify. Each refresh uses the token up and
+    issues the next one of its family. Presenting a used token again means
+    it was copied, so every token of that family is revoked and both the
+    thief and the owner have to log in again.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def issue(self, user_id: str, family_id: Optional[str] = None) -> str:
+        """Store and return a new refresh token; a new family unless one is given."""
+        token = secrets.token_urlsafe(32)
+        self.db.add(RefreshToken(
+            token_hash=hash_refresh_token(token),
+            user_id=user_id,
+            family_id=family_id or str(uuid4()),
+            expires_at=datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+        ))
+        self.db.commit()
+        return token
+
+    def rotate(self, token: str) -> Tuple[str, str]:
+        """Use up `token` and return its user's id with the token that replaces it."""
+        invalid = HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+        row = self.db.query(RefreshToken, User)\
+            .join(User, User.id == RefreshToken.user_id)\
+            .filter(RefreshToken.token_hash == hash_refresh_token(token))\
+            .first()
+        if row is None:
+            raise invalid
+        stored, user = row
+        now = datetime.utcnow()
+        if stored.revoked_at is not None or stored.expires_at <= now or not user.is_active:
+            raise invalid
+
+        # Conditional, so of two refreshes racing with one token only one wins
+        claimed = self.db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.token_hash == stored.token_hash, RefreshToken.used_at.is_(None))
+            .values(used_at=now)
+        ).rowcount
+        if not claimed:
+            self.revoke_family(stored.family_id)
+            self.db.commit()
+            logger.warning(f"Refresh token reused for user {user.id}, revoked its family")
+            raise invalid
+        # Read before issue() commits and expires the row
+        user_id, family_id = user.id, stored.family_id
+        return user_id, self.issue(user_id, family_id)
+
+    def revoke(self, token: str) -> None:
+        """Log a session out: revoke the family `token` belongs to, if any."""
+        stored = self.db.get(RefreshToken, hash_refresh_token(token))
+        if stored is not None:
+            self.revoke_family(stored.family_id)
+            self.db.commit()
+
+    def revoke_family(self, family_id: str) -> None:
+        """Revoke a family in the caller's transaction."""
+        self.db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=datetime.utcnow())
+        )
+
+    def revoke_user(self, user_id: str) -> None:
+        """Revoke every session of a user in the caller's transaction, e.g. on a
+        password change."""
+        self.db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=datetime.utcnow())
+        )
+
+    def purge_expired(self, now: Optional[datetime] = None) -> int:
+        """Delete expired tokens; returns how many went."""
+        deleted = self.db.execute(
+            delete(RefreshToken).where(RefreshToken.expires_at <= (now or datetime.utcnow()))
+        ).rowcount
+        self.db.commit()
+        return deleted
@@ -1,13 +1,15 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List, Dict, Optional
+from sqlalchemy import select
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 from app.models.user import User
 from app.models.job import Job
 from app.models.review import Review
 from app.schemas.review import ReviewCreate, ReviewUpdate, ReviewStats, RatingDistribution, ReviewResponse
-from app.models.provider import Provider
+from app.services.provider_stats_service import ProviderDailyStatsService
+from app.services.provider_rating_service import ProviderRatingService
 from fastapi import HTTPException
+from app.utils.pagination import PageParams, paginate, split_page
 
 class ReviewService:
     def __init__(self, db: Session):
@@ -29,12 +31,11 @@ class ReviewService:
         )
         
         self.db.add(review)
+        ProviderDailyStatsService(self.db).record_review_created(review)
+        ProviderRatingService(self.db).record_review_created(review)
         self.db.commit()
         self.db.refresh(review)
         
-        # Update provider's average rating
-        self._update_provider_rating(job.provider_id)
-        
         return review
 
     def get_review(self, review_id: str) -> Optional[Review]:
@@ -45,16 +46,16 @@ class ReviewService:
         if not review:
             return None
             
+        old_rating = review.rating
         for field, value in review_data.dict(exclude_unset=True).items():
             setattr(review, field, value)
             
         review.updated_at = datetime.utcnow()
+        ProviderDailyStatsService(self.db).record_review_updated(review, old_rating)
+        ProviderRatingService(self.db).record_review_updated(review, old_rating)
         self.db.commit()
         self.db.refresh(review)
         
-        # Update provider's average rating
-        self._update_provider_rating(review.provider_id)
-        
         return review
 
     def delete_review(self, review_id: str) -> bool:
@@ -62,58 +63,57 @@ class ReviewService:
         if not review:
             return False
             
+        ProviderDailyStatsService(self.db).record_review_deleted(review)
+        ProviderRatingService(self.db).record_review_deleted(review)
         self.db.delete(review)
         self.db.commit()
         
-        # Update provider's average rating
-        self._update_provider_rating(review.provider_id)
-        
         return True
 
-    def get_provider_reviews(self, provider_id: str) -> List[Review]:
-        return self.db.query(Review).filter(Review.provider_id == provider_id).all()
-
-    def _update_provider_rating(self, provider_id: int) -> None:
-        provider = self.db.query(Provider).filter(Provider.id == provider_id).first()
-        if not provider:
-            return
-
-        reviews = self.get_provider_reviews(str(provider_id))
-        if not reviews:
-            provider.rating = 0
-            provider.total_reviews = 0
-        else:
-            provider.rating = sum(r.rating for r in reviews) / len(reviews)
-            provider.total_reviews = len(reviews)
-
-        self.db.commit()
+    def list_provider_reviews(self, provider_id: str, page: PageParams) -> Tuple[List[ReviewResponse], Optional[str]]:
+        """One keyset page of a provider's reviews, newest first, and the next cursor."""
+        reviews, next_cursor = split_page(
+            self.db.scalars(paginate(select(Review).filter(Review.provider_id == provider_id), Review, page)).all(),
+            page
+        )
+        customers = dict(self.db.execute(
+            select(User.id, User.full_name).filter(User.id.in_({r.customer_id for r in reviews}))
+        ).all())
+        service_types = dict(self.db.execute(
+            select(Job.id, Job.service_type).filter(Job.id.in_({r.job_id for r in reviews}))
+        ).all())
+        return [
+            ReviewResponse(
+                id=str(review.id),
+                customer_id=str(review.customer_id),
+                customer_name=customers.get(review.customer_id) or "",
+                provider_id=str(review.provider_id),
+                job_id=str(review.job_id),
+                job_service_type=service_types.get(review.job_id) or "",
+                rating=review.rating,
+                comment=review.comment,
+                provider_response=getattr(review, "provider_response", None),
+                created_at=review.created_at,
+                updated_at=review.updated_at or review.created_at
+            )
+            for review in reviews
+        ], next_cursor
 
     async def get_provider_reviews(self, provider_id: str) -> ReviewStats:
-        # Get total reviews and average rating
-        stats = self.db.query(
-            func.count(Review.id).label('total_reviews'),
-            func.avg(Review.rating).label('average_rating')
-        ).filter(Review.provider_id == provider_id).first()
-        
-        # Get rating distribution
-        distribution = self.db.query(
-            Review.rating,
-            func.count(Review.id).label('count')
-        ).filter(
-            Review.provider_id == provider_id
-        ).group_by(Review.rating).all()
-        
-        # Get recent reviews
-        recent_reviews = self.db.query(Review).filter(
-            Review.provider_id == provider_id
-        ).order_by(Review.created_at.desc()).limit(5).all()
-        
+        # Totals and the star histogram are kept on the provider row by
+        # ProviderRatingService, so no aggregate over reviews is needed
+        total_reviews, average_rating, stars = (
+            ProviderRatingService(self.db).distribution(provider_id) or (0, 0.0, {})
+        )
+        recent_reviews, _ = self.list_provider_reviews(provider_id, PageParams(limit=5))
+
         return ReviewStats(
-            total_reviews=stats.total_reviews or 0,
-            average_rating=float(stats.average_rating or 0),
+            total_reviews=total_reviews,
+            average_rating=float(average_rating),
             rating_distribution=[
-                RatingDistribution(rating=r.rating, count=r.count)
-                for r in distribution
+                RatingDistribution(rating=rating, count=count)
+                for rating, count in stars.items()
+                if count
             ],
             recent_reviews=recent_reviews
         )
@@ -2,7 +2,10 @@ from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from app.models.user import User, UserRole
 from app.schemas.user import UserCreate, UserUpdate
-from app.utils.password import get_password_hash, verify_password
+from app.utils.password import get_password_hash, verify_password, needs_rehash
+from app.auth.principal_cache import principal_cache
+from app.core.password_hasher import password_hasher
+from app.services.refresh_token_service import RefreshTokenService
 
 class UserService:
     def __init__(self, db: Session):
@@ -14,7 +17,7 @@ class UserService:
     def get_user_by_id(self, user_id: str) -> User:
         return self.db.query(User).filter(User.id == user_id).first()
 
-    def create_user(self, user_data: UserCreate) -> User:
+    async def create_user(self, user_data: UserCreate) -> User:
         # Check if user already exists
         if self.get_user_by_email(user_data.email):
             raise HTTPException(
@@ -29,7 +32,7 @@ class UserService:
             phone_number=user_data.phone_number,
             role=user_data.role
         )
-        user.set_password(user_data.password)
+        user.hashed_password = await password_hasher.hash(user_data.password)
 
         self.db.add(user)
         self.db.commit()
@@ -53,10 +56,12 @@ class UserService:
             user.phone_number = user_data.phone_number
         if user_data.password is not None:
             user.set_password(user_data.password)
+            RefreshTokenService(self.db).revoke_user(user_id)
         if user_data.is_active is not None:
             user.is_active = user_data.is_active
 
         self.db.commit()
+        principal_cache.invalidate(user_id)
         self.db.refresh(user)
         return user
 
@@ -70,8 +75,9 @@ class UserService:
 
         self.db.delete(user)
         self.db.commit()
+        principal_cache.invalidate(user_id)
 
-    def authenticate_user(self, email: str, password: str) -> User:
+    async def authenticate_user(self, email: str, password: str) -> User:
         user = self.get_user_by_email(email)
         if not user:
             raise HTTPException(
@@ -80,12 +86,17 @@ class UserService:
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
-        if not user.check_password(password):
+        if not await password_hasher.verify(password, user.hashed_password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password",
                 headers={"WWW-Authenticate": "Bearer"},
             )
+
+        # Move hashes made at an older cost to SECURITY_BCRYPT_ROUNDS
+        if needs_rehash(user.hashed_password):
+            user.hashed_password = await password_hasher.hash(password)
+            self.db.commit()
             
         if not user.is_active:
             raise HTTPException(
@@ -105,5 +116,6 @@ class UserService:
 
         user.is_verified = True
         self.db.commit()
+        principal_cache.invalidate(user_id)
         self.db.refresh(user)
         return user 
\ No newline at end of file
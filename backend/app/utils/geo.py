@@ -0,0 +1,167 @@
+import heapq
+import math
+from typing import Dict, Hashable, Iterable, Iterator, List, Tuple
+
+# Geohash and distance helpers for "providers near me".
+#
+# Distances use an equirectangular projection around the query point; within
+# the few kilometres a nearby search covers, it differs from the haversine
+# distance by far less than the precision of a provider's address.
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+KM_PER_DEGREE_LAT = 110.574
+KM_PER_DEGREE_LON = 111.320
+
+def geohash_encode(latitude: float, longitude: float, precision: int = 9) -> str:
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        rng, coordinate = (lon_range, longitude) if even else (lat_range, latitude)
+        mid = (rng[0] + rng[1]) / 2
+        value <<= 1
+        if coordinate >= mid:
+            value |= 1
+            rng[0] = mid
+        else:
+            rng[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_BASE32[value])
+            bits, value = 0, 0
+    return "".join(chars)
+
+def geohash_cell_size(precision: int) -> Tuple[float, float]:
+    """(latitude, longitude) size in degrees of a geohash cell."""
+    lon_bits = (5 * precision + 1) // 2
+    lat_bits = (5 * precision) // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lon_bits
+
+def bounding_box(latitude: float, longitude: float, radius_km: float) -> Tuple[float, float, float, float]:
+    dlat = radius_km / KM_PER_DEGREE_LAT
+    dlon = radius_km / (KM_PER_DEGREE_LON * max(math.cos(math.radians(latitude)), 1e-6))
+    return latitude - dlat, longitude - dlon, latitude + dlat, longitude + dlon
+
+def covering_geohashes(latitude: float, longitude: float, radius_km: float, precision: int) -> List[str]:
+    """Geohash cells of `precision` that together cover the search circle."""
+    min_lat, min_lon, max_lat, max_lon = bounding_box(latitude, longitude, radius_km)
+    lat_step, lon_step = geohash_cell_size(precision)
+
+    def steps(low, high, step):
+        values, value = [], low
+        while value < high:
+            values.append(value)
+            value += step
+        values.append(high)
+        return values
+
+    return sorted({
+        geohash_encode(lat, lon, precision)
+        for lat in steps(min_lat, max_lat, lat_step)
+        for lon in steps(min_lon, max_lon, lon_step)
+    })
+
+def distance_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Distance from (lat1, lon1) to (lat2, lon2), projected around the first point."""
+    dx = (lon2 - lon1) * KM_PER_DEGREE_LON * math.cos(math.radians(lat1))
+    dy = (lat2 - lat1) * KM_PER_DEGREE_LAT
+    return math.sqrt(dx * dx + dy * dy)
+
+class GridIndex:
+    """In-memory uniform grid of points, searched ring by ring outwards.
+
+    Each point carries a set of tags (category words, "verified") and is
+    filed under every tag's grid as well as the untagged one, so a query
+    restricted to a tag only looks at points that have it.
+    """
+
+    ALL = "*"
+
+    def __init__(self, cell_degrees: float = 0.01):
+        self.cell = cell_degrees
+        self.grids: Dict[str, Dict[Tuple[int, int], list]] = {}
+        self.points: Dict[Hashable, tuple] = {}
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def _cell(self, latitude: float, longitude: float) -> Tuple[int, int]:
+        return int(math.floor(latitude / self.cell)), int(math.floor(longitude / self.cell))
+
+    def add(self, key: Hashable, latitude: float, longitude: float, tags: Iterable[str] = ()) -> None:
+        self.remove(key)
+        tags = frozenset(tags)
+        point = (key, latitude, longitude, tags)
+        self.points[key] = point
+        cell = self._cell(latitude, longitude)
+        for tag in tags | {self.ALL}:
+            self.grids.setdefault(tag, {}).setdefault(cell, []).append(point)
+
+    def remove(self, key: Hashable) -> None:
+        point = self.points.pop(key, None)
+        if point is None:
+            return
+        cell = self._cell(point[1], point[2])
+        for tag in point[3] | {self.ALL}:
+            bucket = self.grids[tag][cell]
+            bucket.remove(point)
+            if not bucket:
+                del self.grids[tag][cell]
+
+    @staticmethod
+    def _ring(ci: int, cj: int, r: int) -> Iterator[Tuple[int, int]]:
+        if r == 0:
+            yield ci, cj
+            return
+        for j in range(cj - r, cj + r + 1):
+            yield ci - r, j
+            yield ci + r, j
+        for i in range(ci - r + 1, ci + r):
+            yield i, cj - r
+            yield i, cj + r
+
+    def nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        k: int,
+        radius_km: float,
+        tags: Iterable[str] = ()
+    ) -> List[Tuple[float, Hashable]]:
+        """Up to `k` (distance_km, key) pairs within `radius_km`, nearest first.
+
+        Only points carrying every tag in `tags` are considered.
+        """
+        tags = set(tags)
+        # Scan the grid of the rarest tag; the others are checked per point
+        grid_tag = min(tags, key=lambda t: len(self.grids.get(t, ())), default=self.ALL)
+        grid = self.grids.get(grid_tag)
+        if not grid or k <= 0:
+            return []
+        others = tags - {grid_tag}
+
+        kx = KM_PER_DEGREE_LON * math.cos(math.radians(latitude))
+        ky = KM_PER_DEGREE_LAT
+        # Every point outside rings 0..r-1 is at least (r - 1) cells away
+        cell_km = self.cell * min(kx, ky)
+        ci, cj = self._cell(latitude, longitude)
+        best: List[Tuple[float, str]] = []  # max-heap of (-distance, key)
+        r = 0
+        while (r - 1) * cell_km <= radius_km:
+            if len(best) == k and -best[0][0] <= (r - 1) * cell_km:
+                break
+            for cell in self._ring(ci, cj, r):
+                for key, lat, lon, point_tags in grid.get(cell, ()):
+                    if others and not others <= point_tags:
+                        continue
+                    dx = (lon - longitude) * kx
+                    dy = (lat - latitude) * ky
+                    distance = math.sqrt(dx * dx + dy * dy)
+                    if distance > radius_km:
+                        continue
+                    if len(best) < k:
+                        heapq.heappush(best, (-distance, key))
+                    elif distance < -best[0][0]:
+                        heapq.heapreplace(best, (-distance, key))
+            r += 1
+        return sorted((-negative, key) for negative, key in best)
@@ -0,0 +1,132 @@
+import random
+from typing import Hashable, Iterator, List, Optional, Tuple
+
+# Half-open intervals [start, end) on any ordered scale (minutes, epoch
+# seconds). A point at `end` is outside the interval, so back-to-back slots
+# do not overlap.
+
+class _Node:
+    __slots__ = ("key", "end", "value", "priority", "max_end", "left", "right")
+
+    def __init__(self, start, end, value):
+        self.key = (start, end, value)
+        self.end = end
+        self.value = value
+        self.priority = random.random()
+        self.max_end = end
+        self.left: Optional["_Node"] = None
+        self.right: Optional["_Node"] = None
+
+    def update(self) -> None:
+        self.max_end = self.end
+        for child in (self.left, self.right):
+            if child is not None and child.max_end > self.max_end:
+                self.max_end = child.max_end
+
+def _rotate_right(node: _Node) -> _Node:
+    left = node.left
+    node.left, left.right = left.right, node
+    node.update()
+    left.update()
+    return left
+
+def _rotate_left(node: _Node) -> _Node:
+    right = node.right
+    node.right, right.left = right.left, node
+    node.update()
+    right.update()
+    return right
+
+def _insert(node: Optional[_Node], new: _Node) -> _Node:
+    if node is None:
+        return new
+    if new.key < node.key:
+        node.left = _insert(node.left, new)
+        if node.left.priority > node.priority:
+            node = _rotate_right(node)
+    else:
+        node.right = _insert(node.right, new)
+        if node.right.priority > node.priority:
+            node = _rotate_left(node)
+    node.update()
+    return node
+
+def _delete(node: Optional[_Node], key) -> Tuple[Optional[_Node], bool]:
+    if node is None:
+        return None, False
+    if key < node.key:
+        node.left, found = _delete(node.left, key)
+    elif key > node.key:
+        node.right, found = _delete(node.right, key)
+    else:
+        if node.left is None:
+            return node.right, True
+        if node.right is None:
+            return node.left, True
+        if node.left.priority > node.right.priority:
+            node = _rotate_right(node)
+            node.right, found = _delete(node.right, key)
+        else:
+            node = _rotate_left(node)
+            node.left, found = _delete(node.left, key)
+    node.update()
+    return node, found
+
+class IntervalTree:
+    """Mutable interval tree: a treap ordered by start, augmented with the
+    largest end in each subtree so overlap queries skip whole branches.
+
+    Entries are (start, end, value) triples; values must be orderable so
+    equal intervals can be told apart.
+    """
+
+    def __init__(self):
+        self._root: Optional[_Node] = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, start, end, value: Hashable = None) -> None:
+        self._root = _insert(self._root, _Node(start, end, value))
+        self._size += 1
+
+    def remove(self, start, end, value: Hashable = None) -> bool:
+        self._root, found = _delete(self._root, (start, end, value))
+        if found:
+            self._size -= 1
+        return found
+
+    def overlapping(self, start, end) -> Iterator[Tuple]:
+        """Entries overlapping [start, end), in start order."""
+        stack: List[Tuple[_Node, bool]] = [(self._root, False)] if self._root else []
+        while stack:
+            node, expanded = stack.pop()
+            if expanded:
+                if node.key[0] < end and node.end > start:
+                    yield node.key
+                continue
+            if node.max_end <= start:
+                continue
+            # In-order: left subtree, node, then right subtree if it can overlap
+            if node.right is not None and node.key[0] < end:
+                stack.append((node.right, False))
+            stack.append((node, True))
+            if node.left is not None:
+                stack.append((node.left, False))
+
+    def covering(self, start, end) -> Iterator[Tuple]:
+        """Entries that contain the whole of [start, end)."""
+        for entry in self.overlapping(start, end):
+            if entry[0] <= start and entry[1] >= end:
+                yield entry
+
+    def __iter__(self) -> Iterator[Tuple]:
+        stack, node = [], self._root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.key
+            node = node.right
@@ -0,0 +1,93 @@
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Query, Response, status
+from sqlalchemy import tuple_
+
+# Keyset pagination for list endpoints, newest first.
+#
+# A page is read with WHERE (created_at, id) < (:created_at, :id) ORDER BY
+# created_at DESC, id DESC LIMIT :limit + 1 against an index that starts with
+# the owner column and continues with (created_at, id), so every page costs
+# the same however deep it is. The cursor is the (created_at, id) of the last
+# row served, base64-encoded so clients treat it as opaque. The next cursor
+# is sent in the X-Next-Cursor header, which keeps the response bodies the
+# plain lists they always were.
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+@dataclass
+class PageParams:
+    cursor: Optional[str] = None
+    limit: int = DEFAULT_PAGE_SIZE
+    status: Optional[str] = None
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+
+def page_params(
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    status: Optional[str] = Query(None),
+    created_after: Optional[datetime] = Query(None, description="Inclusive"),
+    created_before: Optional[datetime] = Query(None, description="Exclusive")
+) -> PageParams:
+    """FastAPI dependency for the shared paging and filtering parameters."""
+    return PageParams(cursor, limit, status, created_after, created_before)
+
+def encode_cursor(created_at: datetime, row_id) -> str:
+    raw = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, object]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), row_id
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+def paginate(statement, model, page: PageParams, status_column=None):
+    """Apply `page`'s filters, keyset and limit to a select of `model` rows.
+
+    The statement fetches one row more than the page so split_page can tell
+    whether another page follows. `status_column` is what the status filter
+    compares against; endpoints without one reject the filter.
+    """
+    if page.status is not None:
+        if status_column is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="This list cannot be filtered by status"
+            )
+        statement = statement.filter(status_column == page.status)
+    if page.created_after is not None:
+        statement = statement.filter(model.created_at >= page.created_after)
+    if page.created_before is not None:
+        statement = statement.filter(model.created_at < page.created_before)
+    if page.cursor:
+        created_at, row_id = decode_cursor(page.cursor)
+        statement = statement.filter(tuple_(model.created_at, model.id) < tuple_(created_at, row_id))
+    return statement.order_by(model.created_at.desc(), model.id.desc()).limit(page.limit + 1)
+
+def split_page(rows: Sequence, page: PageParams) -> Tuple[List, Optional[str]]:
+    """The rows of this page and the cursor of the next one, if any."""
+    rows = list(rows)
+    if len(rows) <= page.limit:
+        return rows, None
+    rows = rows[:page.limit]
+    return rows, encode_cursor(rows[-1].created_at, rows[-1].id)
+
+def send_page(rows: Sequence, page: PageParams, response: Response) -> List:
+    """split_page, with the next cursor set on `response`."""
+    items, next_cursor = split_page(rows, page)
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return items
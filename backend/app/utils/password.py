@@ -1,10 +1,28 @@
-from passlib.context import CryptContext
+import bcrypt
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.config import settings
+
+# bcrypt reads at most 72 bytes of a password; passlib truncated longer ones
+# silently, so the same cut keeps hashes it produced verifying
+MAX_PASSWORD_BYTES = 72
+
+def _secret(password: str) -> bytes:
+    return password.encode("utf-8")[:MAX_PASSWORD_BYTES]
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    try:
+        return bcrypt.checkpw(_secret(plain_password), hashed_password.encode("utf-8"))
+    except (ValueError, AttributeError):
+        # Empty or not a bcrypt hash
+        return False
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password) 
\ No newline at end of file
+    salt = bcrypt.gensalt(rounds=settings.SECURITY_BCRYPT_ROUNDS)
+    return bcrypt.hashpw(_secret(password), salt).decode("ascii")
+
+def needs_rehash(hashed_password: str) -> bool:
+    """Whether a hash was made at another cost than SECURITY_BCRYPT_ROUNDS."""
+    try:
+        return int(hashed_password.split("$")[2]) != settings.SECURITY_BCRYPT_ROUNDS
+    except (IndexError, ValueError, AttributeError):
+        return True
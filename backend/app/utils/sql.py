@@ -0,0 +1,20 @@
+from sqlalchemy import func
+
+# Dialect-portable expressions used by the aggregate queries in app/services.
+# SQLite has no interval arithmetic or to_char, Postgres has no julianday or
+# strftime, so buckets are always rendered as text ("YYYY-MM-DD" / "YYYY-MM").
+
+def hours_between(start, end, dialect_name: str):
+    if dialect_name == "sqlite":
+        return (func.julianday(end) - func.julianday(start)) * 24
+    return func.extract("epoch", end - start) / 3600
+
+def day_bucket(column, dialect_name: str):
+    if dialect_name == "sqlite":
+        return func.strftime("%Y-%m-%d", column)
+    return func.to_char(column, "YYYY-MM-DD")
+
+def month_bucket(column, dialect_name: str):
+    if dialect_name == "sqlite":
+        return func.strftime("%Y-%m", column)
+    return func.to_char(column, "YYYY-MM")
@@ -0,0 +1,135 @@
+"""Throughput under concurrent clients: sync Session vs AsyncSession.
+
+Serves the notification list two ways from the same database and drives each
+with 200 concurrent clients over an in-process ASGI transport:
+
+* before - the old pattern, a sync Session queried inside an ``async def``
+  route, which blocks the event loop for the duration of every query;
+* after  - NotificationService on an AsyncSession from get_async_db.
+
+While each load runs, a probe client hits a DB-free endpoint to show how
+long unrelated requests wait on the event loop.
+
+    python -m benchmarks.async_concurrency [--clients 200] [--requests 10]
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+
+from app.database import to_async_url
+from app.models import User
+from app.models.notification import Notification
+from app.services.notification_service import NotificationService
+from benchmarks.common import make_session_factory, percentile
+
+USER_ID = "bench-user"
+
+def seed(session, notifications: int) -> None:
+    session.execute(insert(User), [{
+        "id": USER_ID, "email": "bench@example.com", "hashed_password": "x"
+    }])
+    now = datetime.utcnow()
+    session.execute(insert(Notification), [
+        {"user_id": USER_ID, "title": f"Notification {i}", "message": "New job request",
+         "type": "job_request", "created_at": now - timedelta(minutes=i)}
+        for i in range(notifications)
+    ])
+    session.commit()
+
+def build_app(SessionLocal, AsyncSessionLocal) -> FastAPI:
+    app = FastAPI()
+
+    def get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def get_async_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    @app.get("/before")
+    async def before(db: Session = Depends(get_db)):
+        rows = db.query(Notification)\
+            .filter(Notification.user_id == USER_ID)\
+            .order_by(Notification.created_at.desc())\
+            .all()
+        return {"count": len(rows)}
+
+    @app.get("/after")
+    async def after(db: AsyncSession = Depends(get_async_db)):
+        rows = await NotificationService(db).get_user_notifications(USER_ID)
+        return {"count": len(rows)}
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return app
+
+async def drive(app: FastAPI, path: str, clients: int, requests: int):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        done = asyncio.Event()
+        probe_samples = []
+
+        async def worker():
+            for _ in range(requests):
+                response = await client.get(path)
+                response.raise_for_status()
+
+        async def probe():
+            while not done.is_set():
+                start = time.perf_counter()
+                await client.get("/ping")
+                probe_samples.append((time.perf_counter() - start) * 1000)
+                await asyncio.sleep(0.01)
+
+        probe_task = asyncio.create_task(probe())
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(clients)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await probe_task
+    return clients * requests / elapsed, probe_samples
+
+async def run(args):
+    # Both sides get a pool as large as the client count, so the comparison
+    # measures event-loop blocking rather than pool starvation
+    engine, SessionLocal = make_session_factory(pool_size=args.clients, max_overflow=0)
+    with SessionLocal() as session:
+        seed(session, args.notifications)
+    async_engine = create_async_engine(
+        to_async_url(str(engine.url)), pool_size=args.clients, max_overflow=0
+    )
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+    app = build_app(SessionLocal, AsyncSessionLocal)
+
+    for label, path in (("before (sync Session)", "/before"), ("after (AsyncSession)", "/after")):
+        throughput, probe = await drive(app, path, args.clients, args.requests)
+        probe_p95 = percentile(probe, 95) if probe else float("nan")
+        print(
+            f"{label}: clients={args.clients} requests={args.clients * args.requests} "
+            f"throughput={throughput:.1f} req/s ping_p95={probe_p95:.2f}ms ping_samples={len(probe)}"
+        )
+    await async_engine.dispose()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=10)
+    parser.add_argument("--notifications", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+if __name__ == "__main__":
+    main()
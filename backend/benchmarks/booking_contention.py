@@ -0,0 +1,99 @@
+"""Booking attempts per second under contention.
+
+Fires concurrent booking attempts from a thread pool, each on its own
+session, through BookingService.create_booking:
+
+* one slot     - every attempt targets the same provider slot; exactly one
+                 may succeed, the rest must get 409;
+* spread       - attempts target distinct slots across many providers, so
+                 all should succeed.
+
+    python -m benchmarks.booking_contention [--attempts 500] [--workers 32]
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+
+from fastapi import HTTPException
+from sqlalchemy import insert
+
+from app.models import User, Provider, Service
+from app.schemas.booking import BookingCreate
+from app.services.booking_service import BookingService
+from benchmarks.common import make_session_factory, report
+
+DAY = datetime.combine(date.today() + timedelta(days=7), datetime.min.time())
+
+def seed(session, providers: int, customers: int) -> None:
+    session.execute(insert(User), [
+        {"id": f"user-{i}", "email": f"user{i}@example.com", "hashed_password": "x"}
+        for i in range(providers + customers)
+    ])
+    session.execute(insert(Provider), [{
+        "id": f"provider-{i}", "user_id": f"user-{i}", "business_name": f"Provider {i}",
+        "business_address": "Lagos", "business_phone": "+2348000000000",
+        "business_email": f"provider{i}@example.com", "business_description": "",
+        "service_categories": ["Plumbing"], "service_areas": ["Ikeja"], "availability": "{}",
+    } for i in range(providers)])
+    session.execute(insert(Service), [{
+        "id": f"service-{i}", "name": "Repair", "description": "", "price": 5000.0,
+        "duration": "01:00", "provider_id": f"provider-{i}",
+    } for i in range(providers)])
+    session.commit()
+
+def run(SessionLocal, requests, workers: int):
+    def attempt(args):
+        customer_id, data = args
+        session = SessionLocal()
+        start = time.perf_counter()
+        try:
+            BookingService(session).create_booking(data, customer_id)
+            outcome = "booked"
+        except HTTPException as e:
+            outcome = e.status_code
+        finally:
+            session.close()
+        return outcome, (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(attempt, requests))
+    return results, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--attempts", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--providers", type=int, default=50)
+    args = parser.parse_args()
+
+    engine, SessionLocal = make_session_factory(pool_size=args.workers, max_overflow=0)
+    session = SessionLocal()
+    seed(session, args.providers, args.attempts)
+    session.close()
+    customer = lambda i: f"user-{args.providers + i}"
+
+    one_slot = [
+        (customer(i), BookingCreate(service_id="service-0", provider_id="provider-0", date=DAY, time="10:00"))
+        for i in range(args.attempts)
+    ]
+    spread = [
+        (customer(i), BookingCreate(
+            service_id=f"service-{i % args.providers}", provider_id=f"provider-{i % args.providers}",
+            date=DAY + timedelta(days=1 + i // (args.providers * 24)),
+            time=f"{(i // args.providers) % 24:02d}:00"
+        ))
+        for i in range(args.attempts)
+    ]
+    for name, requests in (("one slot", one_slot), ("spread", spread)):
+        results, elapsed = run(SessionLocal, requests, args.workers)
+        outcomes = [outcome for outcome, _ in results]
+        report(
+            name, [latency for _, latency in results],
+            booked=outcomes.count("booked"), conflicts=outcomes.count(409),
+            attempts_per_s=round(len(results) / elapsed), dialect=engine.dialect.name
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Shared helpers for the benchmark scripts in this directory.
+
+Benchmarks run against a throwaway SQLite file (or BENCH_DATABASE_URL) so they
+never touch app.db. Run them from the backend directory, e.g.
+
+    python -m benchmarks.provider_analytics
+"""
+import os
+import statistics
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Callable, List
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+import app.models  # noqa: F401  (register mappers)
+import app.models.notification  # noqa: F401
+
+def make_session_factory(url: str = None, **engine_kwargs):
+    if url is None:
+        url = os.getenv("BENCH_DATABASE_URL")
+    if url is None:
+        path = os.path.join(tempfile.mkdtemp(prefix="connectify-bench-"), "bench.db")
+        url = f"sqlite:///{path}"
+    connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
+    engine = create_engine(url, connect_args=connect_args, **engine_kwargs)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    return engine, sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+class QueryCounter:
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+    @contextmanager
+    def measure(self):
+        start = self.count
+        holder = {}
+        yield holder
+        holder["queries"] = self.count - start
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+def time_calls(fn: Callable[[], object], iterations: int) -> List[float]:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+def report(name: str, samples: List[float], **extra) -> None:
+    fields = " ".join(f"{key}={value}" for key, value in extra.items())
+    print(
+        f"{name}: n={len(samples)} "
+        f"p50={statistics.median(samples):.2f}ms "
+        f"p95={percentile(samples, 95):.2f}ms "
+        f"max={max(samples):.2f}ms {fields}".rstrip()
+    )
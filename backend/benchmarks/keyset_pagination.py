@@ -0,0 +1,83 @@
+"""Page latency at increasing depth: OFFSET vs keyset cursors.
+
+Seeds one user with 200k payments (by default) among other users' rows,
+then reads a 50-row page at several depths into that user's history, once
+with LIMIT/OFFSET and once with the (created_at, id) cursor that GET
+/payments hands out. OFFSET pages get slower the deeper they are; keyset
+pages should cost the same at every depth.
+
+    python -m benchmarks.keyset_pagination [--rows 200000] [--iterations 50]
+"""
+import argparse
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, select
+
+from app.models import User, Payment
+from app.utils.pagination import PageParams, encode_cursor, paginate
+from benchmarks.common import make_session_factory, QueryCounter, time_calls, report
+
+USER_ID = "user-0"
+OTHER_USERS = 20
+
+def seed(session, row_count: int, batch_size: int = 20_000) -> None:
+    session.execute(insert(User), [
+        {"id": f"user-{u}", "email": f"user{u}@example.com", "hashed_password": "x"}
+        for u in range(OTHER_USERS + 1)
+    ])
+    start = datetime(2024, 1, 1)
+    for offset in range(0, row_count, batch_size):
+        session.execute(insert(Payment), [
+            {
+                "id": f"payment-{i:08d}", "amount": 1000.0, "payment_method": "card",
+                # Half of the rows belong to the user being paged through
+                "user_id": USER_ID if i % 2 == 0 else f"user-{1 + i % OTHER_USERS}",
+                "status": "completed", "created_at": start + timedelta(seconds=i // 2)
+            }
+            for i in range(offset * 2, min(offset + batch_size, row_count) * 2)
+        ])
+    session.commit()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+
+    engine, SessionLocal = make_session_factory()
+    counter = QueryCounter(engine)
+    session = SessionLocal()
+    seed(session, args.rows)
+
+    mine = select(Payment).filter(Payment.user_id == USER_ID)
+    newest_first = (Payment.created_at.desc(), Payment.id.desc())
+    for depth in (0, 1_000, 10_000, 100_000, args.rows - args.limit):
+        if depth >= args.rows:
+            continue
+        offset_page = mine.order_by(*newest_first).offset(depth).limit(args.limit)
+        samples = time_calls(lambda: session.scalars(offset_page).all(), args.iterations)
+        report("offset", samples, depth=depth, dialect=engine.dialect.name)
+
+        cursor = None
+        if depth:
+            # The row just above this depth is what the previous page ended on
+            last = session.execute(
+                select(Payment.created_at, Payment.id)
+                .filter(Payment.user_id == USER_ID)
+                .order_by(*newest_first).offset(depth - 1).limit(1)
+            ).one()
+            cursor = encode_cursor(*last)
+        page = PageParams(cursor=cursor, limit=args.limit)
+        with counter.measure() as measured:
+            samples = time_calls(
+                lambda: session.scalars(paginate(mine, Payment, page)).all(), args.iterations
+            )
+        report(
+            "keyset", samples, depth=depth,
+            queries=measured["queries"] / args.iterations, dialect=engine.dialect.name
+        )
+        session.expunge_all()
+
+if __name__ == "__main__":
+    main()
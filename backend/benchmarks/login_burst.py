@@ -0,0 +1,116 @@
+"""Login burst: bcrypt on the event loop vs the bounded PasswordHasher pool.
+
+Fires a burst of concurrent password checks at two endpoints over an
+in-process ASGI transport:
+
+* before - the old pattern, verify_password called inside an ``async def``
+  route, so every bcrypt round blocks the event loop;
+* after  - ``await password_hasher.verify``, which runs bcrypt on a small
+  thread pool and answers 503 once `--queue-limit` checks are in flight;
+  clients that get one retry after 50 ms.
+
+While each burst runs, a probe client hits a trivial endpoint to show how
+long unrelated requests wait. Logins per second are bounded by the CPU
+either way; what changes is the probe latency.
+
+    python -m benchmarks.login_burst [--logins 200] [--concurrency 50] [--rounds 10]
+"""
+import argparse
+import asyncio
+import logging
+import time
+
+import httpx
+from fastapi import FastAPI, HTTPException
+
+from app.config import settings
+from app.core.password_hasher import PasswordHasher
+from app.utils.password import get_password_hash, verify_password
+from benchmarks.common import report
+
+PASSWORD = "correct horse battery staple"
+
+def build_app(hashed: str, hasher: PasswordHasher) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/before")
+    async def before():
+        if not verify_password(PASSWORD, hashed):
+            raise HTTPException(status_code=401)
+        return {"ok": True}
+
+    @app.post("/after")
+    async def after():
+        if not await hasher.verify(PASSWORD, hashed):
+            raise HTTPException(status_code=401)
+        return {"ok": True}
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return app
+
+async def burst(app: FastAPI, path: str, logins: int, concurrency: int):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        done = asyncio.Event()
+        remaining = iter(range(logins))
+        statuses, rejected, probe_samples = [], [], []
+
+        async def worker():
+            for _ in remaining:
+                response = await client.post(path)
+                while response.status_code == 503:
+                    # Shed by the pool: back off briefly, as a client would
+                    rejected.append(response.status_code)
+                    await asyncio.sleep(0.05)
+                    response = await client.post(path)
+                statuses.append(response.status_code)
+
+        async def probe():
+            while not done.is_set():
+                # Timed from when the ping is due, so a blocked loop shows
+                # up as latency rather than as missing samples
+                due = time.perf_counter() + 0.01
+                await asyncio.sleep(0.01)
+                await client.get("/ping")
+                probe_samples.append((time.perf_counter() - due) * 1000)
+
+        probe_task = asyncio.create_task(probe())
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await probe_task
+    return statuses, len(rejected), elapsed, probe_samples
+
+async def run(args):
+    settings.SECURITY_BCRYPT_ROUNDS = args.rounds
+    # One warning per shed login would drown the results
+    logging.getLogger("app.core.password_hasher").setLevel(logging.ERROR)
+    hashed = get_password_hash(PASSWORD)
+    hasher = PasswordHasher(workers=args.workers, queue_limit=args.queue_limit)
+    app = build_app(hashed, hasher)
+
+    for label, path in (("before (bcrypt on the loop)", "/before"), ("after (PasswordHasher)", "/after")):
+        statuses, rejected, elapsed, probe = await burst(app, path, args.logins, args.concurrency)
+        report(
+            f"{label} ping", probe,
+            logins=len(statuses), ok=statuses.count(200), rejected_503=rejected,
+            logins_per_s=round(statuses.count(200) / elapsed, 1), total_s=round(elapsed, 2)
+        )
+    hasher.shutdown()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=10, help="bcrypt cost of the stored hash")
+    parser.add_argument("--workers", type=int, default=settings.PASSWORD_HASH_WORKERS)
+    parser.add_argument("--queue-limit", type=int, default=settings.PASSWORD_HASH_QUEUE_LIMIT)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Notification insert throughput: one transaction each vs the write-behind writer.
+
+Writes a "new job in your category" broadcast to 100k users (by default)
+through NotificationWriter, which flushes multi-row INSERTs by size or time,
+and a smaller sample the old way, with NotificationService.create_notification
+committing every row. Reports rows per second, how long add() takes, and how
+long after add() each notification reaches the broker for live delivery.
+
+    python -m benchmarks.notification_writes [--notifications 100000] [--baseline 5000]
+"""
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.broker import broker
+from app.database import to_async_url
+from app.models import User
+from app.schemas.notification import NotificationCreate
+from app.services.notification_service import NotificationService
+from app.services.notification_writer import NotificationWriter
+from benchmarks.common import make_session_factory, report
+
+def broadcast(users: int, start: int = 0):
+    return [
+        NotificationCreate(
+            user_id=f"user-{i % users}", title=f"n{i}", message="New plumbing job in Ikeja", type="job_request"
+        )
+        for i in range(start, start + users)
+    ]
+
+async def run(args) -> None:
+    engine, SessionLocal = make_session_factory()
+    with SessionLocal() as session:
+        session.execute(insert(User), [
+            {"id": f"user-{i}", "email": f"user{i}@example.com", "hashed_password": "x"}
+            for i in range(args.notifications)
+        ])
+        session.commit()
+    async_engine = create_async_engine(to_async_url(str(engine.url)))
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
+    added_at, push_delays = {}, []
+
+    async def delivered(user_id, message):
+        push_delays.append((time.perf_counter() - added_at[message["title"]]) * 1000)
+
+    await broker.start(delivered)
+
+    # Before: one add, commit and refresh per notification
+    baseline = broadcast(args.baseline)
+    began = time.perf_counter()
+    async with AsyncSessionLocal() as session:
+        service = NotificationService(session)
+        for notification in baseline:
+            added_at[notification.title] = time.perf_counter()
+            await service.create_notification(notification)
+    elapsed = time.perf_counter() - began
+    report(
+        "per-row create_notification", push_delays,
+        rows=len(baseline), rows_per_s=round(len(baseline) / elapsed), total_s=round(elapsed, 2)
+    )
+
+    # After: write-behind batches
+    push_delays.clear()
+    writer = NotificationWriter(
+        AsyncSessionLocal, batch_size=args.batch_size, flush_seconds=args.flush_seconds
+    )
+    writer.start()
+    add_times = []
+    began = time.perf_counter()
+    for notification in broadcast(args.notifications, start=args.baseline):
+        added_at[notification.title] = call_began = time.perf_counter()
+        await writer.add(notification)
+        add_times.append((time.perf_counter() - call_began) * 1000)
+    added = time.perf_counter() - began
+    await writer.stop()
+    elapsed = time.perf_counter() - began
+    report("writer add()", add_times, total_s=round(added, 2))
+    report(
+        "write-behind push delay", push_delays,
+        rows=writer.written, rows_per_s=round(writer.written / elapsed), total_s=round(elapsed, 2),
+        flushes=writer.flushes, batch_size=writer.batch_size
+    )
+
+    await broker.stop()
+    await async_engine.dispose()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--notifications", type=int, default=100_000)
+    parser.add_argument("--baseline", type=int, default=5_000, help="Rows written one transaction at a time")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--flush-seconds", type=float, default=0.05)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Query count and latency of AnalyticsService.get_provider_analytics.
+
+Seeds one provider with a large job history (50k jobs by default) and reports
+how many statements a dashboard load issues and its p50/p95 latency.
+
+    python -m benchmarks.provider_analytics [--jobs 50000] [--iterations 50]
+"""
+import argparse
+import asyncio
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+from app.models import User, Provider, Job, Review, Payment
+from app.services.analytics_service import AnalyticsService
+from app.services.provider_stats_service import ProviderDailyStatsService
+from benchmarks.common import make_session_factory, QueryCounter, time_calls, report
+
+SERVICE_TYPES = ["plumbing", "electrical", "cleaning", "carpentry", "painting"]
+STATUSES = ["pending", "accepted", "in_progress", "completed", "cancelled"]
+
+def seed(session, job_count: int, customer_count: int = 200) -> str:
+    now = datetime.utcnow()
+    rng = random.Random(42)
+
+    customers = [
+        {"id": f"customer-{i}", "email": f"customer{i}@example.com",
+         "hashed_password": "x", "full_name": f"Customer {i}"}
+        for i in range(customer_count)
+    ]
+    session.execute(insert(User), customers + [
+        {"id": "provider-user", "email": "provider@example.com",
+         "hashed_password": "x", "full_name": "Provider", "role": "PROVIDER"}
+    ])
+    session.execute(insert(Provider), [{
+        "id": "provider-1", "user_id": "provider-user", "business_name": "Bench Plumbing",
+        "business_address": "Ikeja, Lagos", "business_phone": "+2348000000000",
+        "business_email": "provider@example.com", "business_description": "Benchmark provider",
+        "service_categories": SERVICE_TYPES, "service_areas": ["Ikeja"], "availability": "{}",
+    }])
+
+    jobs, reviews, payments = [], [], []
+    for i in range(job_count):
+        created_at = now - timedelta(minutes=rng.randint(0, 60 * 24 * 365 * 3))
+        status = rng.choice(STATUSES)
+        updated_at = created_at + timedelta(minutes=rng.randint(5, 60 * 48))
+        jobs.append({
+            "id": f"job-{i}", "title": "Job", "description": "Benchmark job",
+            "status": status, "service_type": rng.choice(SERVICE_TYPES),
+            "amount": rng.randint(5, 200) * 1000.0,
+            "provider_id": "provider-1", "customer_id": rng.choice(customers)["id"],
+            "created_at": created_at, "updated_at": updated_at,
+            "completed_at": updated_at if status == "completed" else None,
+        })
+        if status == "completed":
+            payments.append({
+                "id": f"payment-{i}", "amount": jobs[-1]["amount"], "status": "completed",
+                "payment_method": rng.choice(["card", "transfer", "cash"]),
+                "user_id": jobs[-1]["customer_id"], "job_id": f"job-{i}",
+                "created_at": updated_at, "updated_at": updated_at,
+            })
+            if rng.random() < 0.6:
+                reviews.append({
+                    "id": f"review-{i}", "job_id": f"job-{i}", "provider_id": "provider-1",
+                    "customer_id": jobs[-1]["customer_id"], "rating": float(rng.randint(1, 5)),
+                    "comment": "Benchmark review", "created_at": updated_at,
+                })
+    for table, rows in ((Job, jobs), (Payment, payments), (Review, reviews)):
+        for start in range(0, len(rows), 5000):
+            session.execute(insert(table), rows[start:start + 5000])
+    session.commit()
+    ProviderDailyStatsService(session).rebuild()
+    return "provider-1"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=50_000)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    engine, SessionLocal = make_session_factory()
+    counter = QueryCounter(engine)
+    session = SessionLocal()
+    provider_id = seed(session, args.jobs)
+    service = AnalyticsService(session)
+
+    with counter.measure() as measured:
+        asyncio.run(service.get_provider_analytics(provider_id))
+
+    samples = time_calls(
+        lambda: asyncio.run(service.get_provider_analytics(provider_id)),
+        args.iterations
+    )
+    report(
+        "get_provider_analytics", samples,
+        jobs=args.jobs, queries=measured["queries"], dialect=engine.dialect.name
+    )
+
+if __name__ == "__main__":
+    main()
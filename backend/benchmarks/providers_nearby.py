@@ -0,0 +1,102 @@
+"""Latency of "k nearest verified plumbers within 5 km".
+
+Seeds 200k providers (by default) scattered around Lagos, Abuja and Port
+Harcourt, then answers nearby queries from random points in those cities
+two ways: the in-process grid index and the geohash range scan in the
+database. Also reports how long the index takes to load.
+
+    python -m benchmarks.providers_nearby [--providers 200000] [--iterations 500]
+"""
+import argparse
+import random
+import time
+
+from sqlalchemy import insert
+
+from app.models import User, Provider
+from app.services.provider_geo_service import ProviderGeoIndex, ProviderGeoService
+from app.services.provider_search_service import ProviderSearchService
+from app.utils.geo import geohash_encode
+from benchmarks.common import make_session_factory, QueryCounter, time_calls, report
+
+# (name, latitude, longitude, spread in degrees, share of providers)
+CITIES = [
+    ("Lagos", 6.5244, 3.3792, 0.12, 0.5),
+    ("Abuja", 9.0765, 7.3986, 0.10, 0.3),
+    ("Port Harcourt", 4.8156, 7.0498, 0.08, 0.2),
+]
+CATEGORIES = ["Plumbing", "Electrical Repairs", "Cleaning", "Carpentry", "Painting", "AC Repairs"]
+
+def random_point(rng: random.Random):
+    name, latitude, longitude, spread, _ = rng.choices(CITIES, weights=[c[4] for c in CITIES])[0]
+    return rng.gauss(latitude, spread), rng.gauss(longitude, spread)
+
+def seed(session, provider_count: int, batch_size: int = 10_000) -> None:
+    rng = random.Random(42)
+    for start in range(0, provider_count, batch_size):
+        users, providers = [], []
+        for i in range(start, min(start + batch_size, provider_count)):
+            latitude, longitude = random_point(rng)
+            users.append({"id": f"user-{i}", "email": f"provider{i}@example.com", "hashed_password": "x"})
+            providers.append({
+                "id": f"provider-{i}", "user_id": f"user-{i}", "business_name": f"Provider {i}",
+                "business_address": "Nigeria", "business_phone": "+2348000000000",
+                "business_email": f"provider{i}@example.com", "business_description": "",
+                "service_categories": rng.sample(CATEGORIES, rng.randint(1, 2)),
+                "service_areas": [], "availability": "{}",
+                "is_verified": rng.random() < 0.6, "rating": round(rng.uniform(1, 5), 1),
+                # Core inserts skip the mapper event that derives the geohash
+                "latitude": latitude, "longitude": longitude,
+                "geohash": geohash_encode(latitude, longitude),
+            })
+        session.execute(insert(User), users)
+        session.execute(insert(Provider), providers)
+    session.commit()
+    ProviderSearchService(session).rebuild()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--providers", type=int, default=200_000)
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--radius-km", type=float, default=5.0)
+    args = parser.parse_args()
+
+    engine, SessionLocal = make_session_factory()
+    counter = QueryCounter(engine)
+    session = SessionLocal()
+    seed(session, args.providers)
+
+    index = ProviderGeoIndex(refresh_seconds=3600)
+    start = time.perf_counter()
+    index.refresh(session, force=True)
+    print(f"index load: providers={len(index)} time={(time.perf_counter() - start) * 1000:.0f}ms")
+
+    rng = random.Random(7)
+    points = [random_point(rng) for _ in range(args.iterations)]
+    query = {"k": args.k, "radius_km": args.radius_km, "category": "plumbing", "verified": True}
+    grid = index.grid
+
+    lookups = iter(points)
+    samples = time_calls(
+        lambda: grid.nearest(*next(lookups), args.k, args.radius_km, {"verified", "category:plumbing"}),
+        args.iterations
+    )
+    report("grid.nearest (ids only)", samples, providers=args.providers)
+
+    service = ProviderGeoService(session, index=index)
+    for name, use_index in (("nearby (index)", True), ("nearby (database)", False)):
+        lookups = iter(points)
+        with counter.measure() as measured:
+            samples = time_calls(
+                lambda: service.nearby(*next(lookups), use_index=use_index, **query),
+                args.iterations
+            )
+        report(
+            name, samples, providers=args.providers,
+            queries=measured["queries"] / args.iterations, dialect=engine.dialect.name
+        )
+        session.expunge_all()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Holds 10k simulated sockets on one worker and measures delivery.
+
+Connects 10k fake sockets (by default) to a ConnectionManager, two per user
+like a phone and a laptop, with 1% of them stalled the way a phone on a bad
+network stops reading. It then publishes notifications through the broker to
+random users, and then rounds of one message to every user, and reports how long
+publishing takes and how long fast sockets wait for their messages. Stalled
+sockets should be disconnected without slowing anybody else down.
+
+    python -m benchmarks.websocket_fanout [--sockets 10000] [--messages 20000] [--rounds 40]
+"""
+import argparse
+import asyncio
+import random
+import resource
+import time
+
+from app.core.broker import InMemoryBroker
+from app.core.connections import ConnectionManager
+from benchmarks.common import report
+
+class SimulatedSocket:
+    def __init__(self, stalled: bool, latencies: list):
+        self.stalled = stalled
+        self.latencies = latencies
+        self.received = 0
+        self.closed = False
+
+    async def accept(self):
+        pass
+
+    async def send_json(self, message):
+        if self.stalled:
+            await asyncio.Event().wait()
+        # Hand control back once per frame, as a real socket write would
+        await asyncio.sleep(0)
+        self.received += 1
+        self.latencies.append((time.perf_counter() - message["sent_at"]) * 1000)
+
+    async def close(self, code=1000):
+        self.closed = True
+
+async def drained(sockets, expected: int, timeout: float = 60) -> None:
+    deadline = time.perf_counter() + timeout
+    while sum(s.received for s in sockets) < expected and time.perf_counter() < deadline:
+        await asyncio.sleep(0.01)
+
+async def run(args) -> None:
+    rng = random.Random(42)
+    manager = ConnectionManager(queue_size=args.queue_size, overflow_policy="disconnect")
+    broker = InMemoryBroker()
+    await broker.start(manager.deliver)
+
+    users = [f"user-{i}" for i in range(args.sockets // args.tabs)]
+    latencies, sockets = [], []
+    start = time.perf_counter()
+    for user_id in users:
+        for _ in range(args.tabs):
+            socket = SimulatedSocket(rng.random() < args.stalled, latencies)
+            sockets.append(socket)
+            await manager.connect(socket, user_id)
+    connected = (time.perf_counter() - start) * 1000
+    fast = [s for s in sockets if not s.stalled]
+    print(
+        f"connected: sockets={len(manager)} users={len(users)} stalled={len(sockets) - len(fast)} "
+        f"time={connected:.0f}ms max_rss={resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // 1024}MB"
+    )
+
+    # Targeted notifications, as jobs and payments generate them
+    publish_times = []
+    for i in range(args.messages):
+        user_id = rng.choice(users)
+        began = time.perf_counter()
+        await broker.publish(user_id, {"id": i, "sent_at": time.perf_counter()})
+        publish_times.append((time.perf_counter() - began) * 1000)
+        if i % 100 == 0:
+            await asyncio.sleep(0)
+    await asyncio.sleep(0.5)
+    report("publish (one user)", publish_times, sockets=len(sockets))
+    report("delivery latency (fast sockets)", latencies, slow_disconnects=manager.slow_disconnects)
+
+    # Rounds of one message to every user, as a system announcement would
+    # send; stalled sockets overflow their queues and are closed
+    latencies.clear()
+    before = sum(s.received for s in fast)
+    began = time.perf_counter()
+    enqueue_times = []
+    for round_number in range(args.rounds):
+        round_began = time.perf_counter()
+        for user_id in users:
+            await broker.publish(user_id, {"id": f"all-{round_number}", "sent_at": time.perf_counter()})
+        enqueue_times.append((time.perf_counter() - round_began) * 1000)
+        await asyncio.sleep(0)
+    await drained(fast, before + len(fast) * args.rounds)
+    everyone = (time.perf_counter() - began) * 1000
+    report("broadcast enqueue (all users)", enqueue_times, users=len(users))
+    report(
+        "broadcast latency (fast sockets)", latencies,
+        rounds=args.rounds, all_delivered_ms=round(everyone, 1),
+        delivered=sum(s.received for s in fast) - before,
+        slow_disconnects=manager.slow_disconnects, open_sockets=len(manager)
+    )
+    print(f"max_rss={resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // 1024}MB")
+
+    began = time.perf_counter()
+    await manager.close_all()
+    print(f"close_all: time={(time.perf_counter() - began) * 1000:.0f}ms")
+    await broker.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sockets", type=int, default=10_000)
+    parser.add_argument("--tabs", type=int, default=2, help="Sockets per user")
+    parser.add_argument("--stalled", type=float, default=0.01, help="Share of sockets that stop reading")
+    parser.add_argument("--messages", type=int, default=20_000)
+    parser.add_argument("--rounds", type=int, default=40)
+    parser.add_argument("--queue-size", type=int, default=32)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Composite indexes for the hot filter paths
+
+Tables are created by Base.metadata.create_all, which never alters an
+existing table. This revision first adds the job and payment columns that
+the indexes and the analytics queries rely on, where an older database lacks
+them. It then adds the indexes, skipping any that a fresh create_all has
+already built. On PostgreSQL the indexes are built CONCURRENTLY so live
+writes are not blocked.
+
+Revision ID: 0001_hot_path_indexes
+Revises:
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0001_hot_path_indexes"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = [
+    ("jobs", sa.Column("service_type", sa.String())),
+    ("jobs", sa.Column("completed_at", sa.DateTime())),
+    ("payments", sa.Column("job_id", sa.String(), sa.ForeignKey("jobs.id", name="fk_payments_job_id"))),
+]
+
+INDEXES = [
+    ("ix_jobs_provider_status_created", "jobs", ["provider_id", "status", "created_at"]),
+    ("ix_jobs_customer_id", "jobs", ["customer_id"]),
+    ("ix_reviews_provider_created", "reviews", ["provider_id", "created_at"]),
+    ("ix_payments_user_id", "payments", ["user_id"]),
+    ("ix_payments_job_id", "payments", ["job_id"]),
+    ("ix_bookings_provider_date", "bookings", ["provider_id", "date"]),
+    ("ix_bookings_customer_date", "bookings", ["customer_id", "date"]),
+    ("ix_notifications_user_read_created", "notifications", ["user_id", "is_read", "created_at"]),
+]
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    for table, column in COLUMNS:
+        if column.name not in {c["name"] for c in inspector.get_columns(table)}:
+            with op.batch_alter_table(table) as batch_op:
+                batch_op.add_column(column)
+
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name, table, columns, if_not_exists=True, postgresql_concurrently=True
+            )
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name, table_name=table, if_exists=True, postgresql_concurrently=True
+            )
@@ -0,0 +1,47 @@
+"""Provider search token index
+
+Adds the provider_search_tokens inverted index and the providers index used
+by search filters. Fill the new table with
+python -m scripts.rebuild_provider_search_index.
+
+Revision ID: 0002_provider_search_tokens
+Revises: 0001_hot_path_indexes
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0002_provider_search_tokens"
+down_revision: Union[str, Sequence[str], None] = "0001_hot_path_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not sa.inspect(op.get_bind()).has_table("provider_search_tokens"):
+        op.create_table(
+            "provider_search_tokens",
+            sa.Column("token", sa.String(), primary_key=True),
+            sa.Column("kind", sa.String(), primary_key=True),
+            sa.Column(
+                "provider_id", sa.String(),
+                sa.ForeignKey("providers.id", ondelete="CASCADE"), primary_key=True
+            ),
+        )
+    op.create_index(
+        "ix_provider_search_tokens_provider_id", "provider_search_tokens", ["provider_id"],
+        if_not_exists=True
+    )
+    op.create_index(
+        "ix_providers_verified_rating", "providers", ["is_verified", "rating"],
+        if_not_exists=True
+    )
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_providers_verified_rating", table_name="providers", if_exists=True)
+    op.drop_table("provider_search_tokens")
@@ -0,0 +1,43 @@
+"""Provider coordinates
+
+Adds providers.latitude/longitude and the geohash column (with its index)
+that nearby search scans when the in-process index is disabled.
+
+Revision ID: 0003_provider_coordinates
+Revises: 0002_provider_search_tokens
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0003_provider_coordinates"
+down_revision: Union[str, Sequence[str], None] = "0002_provider_search_tokens"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = [
+    sa.Column("latitude", sa.Float()),
+    sa.Column("longitude", sa.Float()),
+    sa.Column("geohash", sa.String(12)),
+]
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    existing = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("providers")}
+    missing = [column for column in COLUMNS if column.name not in existing]
+    if missing:
+        with op.batch_alter_table("providers") as batch_op:
+            for column in missing:
+                batch_op.add_column(column)
+    op.create_index("ix_providers_geohash", "providers", ["geohash"], if_not_exists=True)
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_providers_geohash", table_name="providers", if_exists=True)
+    with op.batch_alter_table("providers") as batch_op:
+        for column in reversed(COLUMNS):
+            batch_op.drop_column(column.name)
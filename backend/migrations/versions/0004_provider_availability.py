@@ -0,0 +1,48 @@
+"""Structured provider availability
+
+Adds provider_availability, the weekly windows normalized from
+providers.availability. Fill it with
+python -m scripts.rebuild_provider_availability.
+
+Revision ID: 0004_provider_availability
+Revises: 0003_provider_coordinates
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0004_provider_availability"
+down_revision: Union[str, Sequence[str], None] = "0003_provider_coordinates"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not sa.inspect(op.get_bind()).has_table("provider_availability"):
+        op.create_table(
+            "provider_availability",
+            sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column(
+                "provider_id", sa.String(),
+                sa.ForeignKey("providers.id", ondelete="CASCADE"), nullable=False
+            ),
+            sa.Column("weekday", sa.Integer(), nullable=False),
+            sa.Column("start_minute", sa.Integer(), nullable=False),
+            sa.Column("end_minute", sa.Integer(), nullable=False),
+        )
+    op.create_index(
+        "ix_provider_availability_provider_id", "provider_availability", ["provider_id"],
+        if_not_exists=True
+    )
+    op.create_index(
+        "ix_provider_availability_weekday_start", "provider_availability", ["weekday", "start_minute"],
+        if_not_exists=True
+    )
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("provider_availability")
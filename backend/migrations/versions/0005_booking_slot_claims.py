@@ -0,0 +1,49 @@
+"""Booking slot claims
+
+Adds booking_slot_claims, whose primary key stops two live bookings or
+holds of one provider from overlapping. Claim existing bookings with
+python -m scripts.rebuild_booking_claims.
+
+Revision ID: 0005_booking_slot_claims
+Revises: 0004_provider_availability
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0005_booking_slot_claims"
+down_revision: Union[str, Sequence[str], None] = "0004_provider_availability"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not sa.inspect(op.get_bind()).has_table("booking_slot_claims"):
+        op.create_table(
+            "booking_slot_claims",
+            sa.Column("provider_id", sa.String(), sa.ForeignKey("providers.id"), primary_key=True),
+            sa.Column("slot_start", sa.DateTime(), primary_key=True),
+            sa.Column(
+                "booking_id", sa.String(),
+                sa.ForeignKey("bookings.id", ondelete="CASCADE"), nullable=True
+            ),
+            sa.Column("hold_id", sa.String(), nullable=True),
+            sa.Column("customer_id", sa.String(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("expires_at", sa.DateTime(), nullable=True),
+        )
+    op.create_index(
+        "ix_booking_slot_claims_booking_id", "booking_slot_claims", ["booking_id"],
+        if_not_exists=True
+    )
+    op.create_index(
+        "ix_booking_slot_claims_hold_id", "booking_slot_claims", ["hold_id"],
+        if_not_exists=True
+    )
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("booking_slot_claims")
@@ -0,0 +1,46 @@
+"""Indexes for keyset pagination
+
+List endpoints page newest first on (created_at, id) within one owner;
+each index below serves one of them without a sort. Built CONCURRENTLY on
+PostgreSQL, like the hot path indexes.
+
+Revision ID: 0006_keyset_pagination_indexes
+Revises: 0005_booking_slot_claims
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0006_keyset_pagination_indexes"
+down_revision: Union[str, Sequence[str], None] = "0005_booking_slot_claims"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("ix_jobs_provider_created_id", "jobs", ["provider_id", "created_at", "id"]),
+    ("ix_jobs_customer_created_id", "jobs", ["customer_id", "created_at", "id"]),
+    ("ix_bookings_provider_created_id", "bookings", ["provider_id", "created_at", "id"]),
+    ("ix_bookings_customer_created_id", "bookings", ["customer_id", "created_at", "id"]),
+    ("ix_payments_user_created_id", "payments", ["user_id", "created_at", "id"]),
+    ("ix_notifications_user_created_id", "notifications", ["user_id", "created_at", "id"]),
+    ("ix_reviews_provider_created_id", "reviews", ["provider_id", "created_at", "id"]),
+]
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name, table, columns, if_not_exists=True, postgresql_concurrently=True
+            )
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name, table_name=table, if_exists=True, postgresql_concurrently=True
+            )
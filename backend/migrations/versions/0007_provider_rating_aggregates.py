@@ -0,0 +1,44 @@
+"""Provider rating aggregates
+
+Adds the running rating sum and the per-star review counts that review
+writes keep up to date. Fill them for existing reviews with
+python -m scripts.rebuild_provider_ratings.
+
+Revision ID: 0007_provider_rating_aggregates
+Revises: 0006_keyset_pagination_indexes
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0007_provider_rating_aggregates"
+down_revision: Union[str, Sequence[str], None] = "0006_keyset_pagination_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = [
+    sa.Column("rating_sum", sa.Float(), nullable=False, server_default="0"),
+    *(
+        sa.Column(f"rating_{star}_count", sa.Integer(), nullable=False, server_default="0")
+        for star in range(1, 6)
+    ),
+]
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    existing = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("providers")}
+    missing = [column for column in COLUMNS if column.name not in existing]
+    if missing:
+        with op.batch_alter_table("providers") as batch_op:
+            for column in missing:
+                batch_op.add_column(column)
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("providers") as batch_op:
+        for column in reversed(COLUMNS):
+            batch_op.drop_column(column.name)
@@ -0,0 +1,36 @@
+"""Index for replaying missed notifications
+
+A reconnecting socket asks for the user's notifications with an id above
+the last one it saw; (user_id, id) answers that with one range scan.
+Built CONCURRENTLY on PostgreSQL, like the hot path indexes.
+
+Revision ID: 0008_notification_replay_index
+Revises: 0007_provider_rating_aggregates
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0008_notification_replay_index"
+down_revision: Union[str, Sequence[str], None] = "0007_provider_rating_aggregates"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_notifications_user_id_id", "notifications", ["user_id", "id"],
+            if_not_exists=True, postgresql_concurrently=True
+        )
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_notifications_user_id_id", table_name="notifications",
+            if_exists=True, postgresql_concurrently=True
+        )
@@ -0,0 +1,44 @@
+"""Notification archive
+
+Adds notification_archive, the cold table that
+python -m scripts.compact_notifications moves old read notifications into.
+
+Revision ID: 0009_notification_archive
+Revises: 0008_notification_replay_index
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0009_notification_archive"
+down_revision: Union[str, Sequence[str], None] = "0008_notification_replay_index"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not sa.inspect(op.get_bind()).has_table("notification_archive"):
+        op.create_table(
+            "notification_archive",
+            sa.Column("id", sa.Integer(), primary_key=True, autoincrement=False),
+            sa.Column("user_id", sa.String(36), nullable=False),
+            sa.Column("title", sa.String(), nullable=True),
+            sa.Column("message", sa.String(), nullable=True),
+            sa.Column("type", sa.String(), nullable=True),
+            sa.Column("data", sa.JSON(), nullable=True),
+            sa.Column("is_read", sa.Boolean(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.Column("archived_at", sa.DateTime(), nullable=False),
+        )
+    op.create_index(
+        "ix_notification_archive_user_created_id", "notification_archive",
+        ["user_id", "created_at", "id"], if_not_exists=True
+    )
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("notification_archive")
@@ -0,0 +1,47 @@
+"""Refresh tokens
+
+Adds refresh_tokens, keyed by the HMAC of each token, for POST
+/auth/refresh. Purge expired rows with python -m scripts.purge_refresh_tokens.
+
+Revision ID: 0010_refresh_tokens
+Revises: 0009_notification_archive
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0010_refresh_tokens"
+down_revision: Union[str, Sequence[str], None] = "0009_notification_archive"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not sa.inspect(op.get_bind()).has_table("refresh_tokens"):
+        op.create_table(
+            "refresh_tokens",
+            sa.Column("token_hash", sa.String(64), primary_key=True),
+            sa.Column(
+                "user_id", sa.String(36),
+                sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+            ),
+            sa.Column("family_id", sa.String(36), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("expires_at", sa.DateTime(), nullable=False),
+            sa.Column("used_at", sa.DateTime(), nullable=True),
+            sa.Column("revoked_at", sa.DateTime(), nullable=True),
+        )
+    op.create_index(
+        "ix_refresh_tokens_family_id", "refresh_tokens", ["family_id"], if_not_exists=True
+    )
+    op.create_index(
+        "ix_refresh_tokens_user_id", "refresh_tokens", ["user_id"], if_not_exists=True
+    )
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("refresh_tokens")
@@ -0,0 +1,35 @@
+"""Store review timestamps the way SQLAlchemy binds them
+
+reviews.created_at used to come from CURRENT_TIMESTAMP, which SQLite stores
+as 'YYYY-MM-DD HH:MM:SS'. Keyset cursors bind 'YYYY-MM-DD HH:MM:SS.ffffff',
+and the shorter text sorts first, so a page's last review kept matching its
+own cursor. The model now sets created_at in Python; this gives existing
+rows the same format. Other databases store real timestamps and are left
+alone.
+
+Revision ID: 0011_review_created_at_format
+Revises: 0010_refresh_tokens
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0011_review_created_at_format"
+down_revision: Union[str, Sequence[str], None] = "0010_refresh_tokens"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == "sqlite":
+        op.execute(
+            "UPDATE reviews SET created_at = created_at || '.000000' "
+            "WHERE length(created_at) = 19"
+        )
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The padded values read back as the same timestamps; nothing to undo
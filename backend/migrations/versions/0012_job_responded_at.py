@@ -0,0 +1,39 @@
+"""Job first-response time
+
+Adds jobs.responded_at, stamped when a job first leaves pending, so the
+provider_daily_stats rebuild measures response time the way the live
+counters do rather than up to the job's latest update. Jobs that already
+left pending only have updated_at to go on, so it fills them in; rerun
+python -m scripts.backfill_provider_daily_stats afterwards.
+
+Revision ID: 0012_job_responded_at
+Revises: 0011_review_created_at_format
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0012_job_responded_at"
+down_revision: Union[str, Sequence[str], None] = "0011_review_created_at_format"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    existing = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("jobs")}
+    if "responded_at" not in existing:
+        with op.batch_alter_table("jobs") as batch_op:
+            batch_op.add_column(sa.Column("responded_at", sa.DateTime(), nullable=True))
+    op.execute(
+        "UPDATE jobs SET responded_at = updated_at "
+        "WHERE status <> 'pending' AND responded_at IS NULL"
+    )
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("jobs") as batch_op:
+        batch_op.drop_column("responded_at")
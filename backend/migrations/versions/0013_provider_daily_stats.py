@@ -0,0 +1,47 @@
+"""Provider daily stats rollup
+
+Adds the provider_daily_stats table behind the provider dashboards and
+earnings, which until now only existed where create_all had made it. Fill
+it with python -m scripts.backfill_provider_daily_stats.
+
+Revision ID: 0013_provider_daily_stats
+Revises: 0012_job_responded_at
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0013_provider_daily_stats"
+down_revision: Union[str, Sequence[str], None] = "0012_job_responded_at"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not sa.inspect(op.get_bind()).has_table("provider_daily_stats"):
+        op.create_table(
+            "provider_daily_stats",
+            sa.Column(
+                "provider_id", sa.String(),
+                sa.ForeignKey("providers.id", ondelete="CASCADE"), primary_key=True
+            ),
+            sa.Column("day", sa.Date(), primary_key=True),
+            sa.Column("booking_count", sa.Integer(), nullable=False),
+            sa.Column("completed_count", sa.Integer(), nullable=False),
+            sa.Column("completed_revenue", sa.Float(), nullable=False),
+            sa.Column("review_count", sa.Integer(), nullable=False),
+            sa.Column("review_sum", sa.Float(), nullable=False),
+            sa.Column("response_count", sa.Integer(), nullable=False),
+            sa.Column("response_time_sum", sa.Float(), nullable=False),
+            sa.Column("paid_amount", sa.Float(), nullable=False),
+            sa.Column("pending_amount", sa.Float(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+        )
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("provider_daily_stats")
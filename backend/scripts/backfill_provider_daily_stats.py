@@ -0,0 +1,27 @@
+"""Rebuild the provider_daily_stats rollup from jobs, reviews and payments.
+
+    python -m scripts.backfill_provider_daily_stats [--provider-id ID]
+
+Run it once after deploying the rollup table, and again whenever the rollup
+is suspected to have drifted from the base tables.
+"""
+import argparse
+
+from app.database import SessionLocal, Base, engine
+from app.services.provider_stats_service import ProviderDailyStatsService
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--provider-id", help="Only rebuild rows for this provider")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        written = ProviderDailyStatsService(db).rebuild(args.provider_id)
+    finally:
+        db.close()
+    print(f"provider_daily_stats: wrote {written} rows")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""Archive old read notifications and compact the notifications table.
+
+    python -m scripts.compact_notifications [--days 90] [--keep 1000] [--no-vacuum]
+
+Schedule it daily (cron, a Kubernetes CronJob). Read notifications older
+than --days, and read ones beyond each user's newest --keep, move to the
+notification_archive table; unread ones always stay. The table is then
+vacuumed and analyzed, and reindexed on PostgreSQL.
+"""
+import argparse
+
+from app.config import settings
+from app.database import SessionLocal, Base, engine
+from app.services.notification_retention_service import NotificationRetentionService
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=settings.NOTIFICATION_RETENTION_DAYS)
+    parser.add_argument("--keep", type=int, default=settings.NOTIFICATION_HOT_LIMIT, help="Notifications kept per user")
+    parser.add_argument("--no-vacuum", action="store_true", help="Skip VACUUM/ANALYZE afterwards")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        retention = NotificationRetentionService(db)
+        archived = retention.compact(args.days, args.keep)
+        if archived and not args.no_vacuum:
+            retention.vacuum()
+    finally:
+        db.close()
+    print(f"notifications: archived {archived} read notifications")
+
+if __name__ == "__main__":
+    main()
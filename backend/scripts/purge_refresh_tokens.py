@@ -0,0 +1,27 @@
+"""Delete expired refresh tokens.
+
+    python -m scripts.purge_refresh_tokens
+
+Every refresh leaves its used token behind until it expires, after
+REFRESH_TOKEN_EXPIRE_DAYS; schedule this daily (cron, a Kubernetes CronJob)
+to keep refresh_tokens small.
+"""
+import argparse
+
+from app.database import SessionLocal, Base, engine
+from app.services.refresh_token_service import RefreshTokenService
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        purged = RefreshTokenService(db).purge_expired()
+    finally:
+        db.close()
+    print(f"refresh_tokens: deleted {purged} expired tokens")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+"""Claim the slots of existing bookings in booking_slot_claims.
+
+    python -m scripts.rebuild_booking_claims
+
+Run it once after deploying conflict-free booking. Bookings that overlap an
+older booking of the same provider are listed and left unclaimed.
+"""
+from app.database import SessionLocal, Base, engine
+from app.services.booking_service import BookingService
+
+def main():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        claimed, conflicts = BookingService(db).rebuild_claims()
+    finally:
+        db.close()
+    print(f"booking_slot_claims: claimed {claimed} bookings")
+    for booking_id in conflicts:
+        print(f"  overlaps an older booking or has an invalid time: {booking_id}")
+
+if __name__ == "__main__":
+    main()
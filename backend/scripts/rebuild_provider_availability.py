@@ -0,0 +1,24 @@
+"""Normalize Provider.availability JSON into the provider_availability table.
+
+    python -m scripts.rebuild_provider_availability
+
+Run it once after deploying structured availability. Providers whose JSON
+cannot be parsed are listed and left without windows until they save a
+valid schedule.
+"""
+from app.database import SessionLocal, Base, engine
+from app.services.availability_service import AvailabilityService
+
+def main():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        normalized, invalid = AvailabilityService(db).rebuild()
+    finally:
+        db.close()
+    print(f"provider_availability: normalized {normalized} providers")
+    for provider_id in invalid:
+        print(f"  invalid availability JSON: {provider_id}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+"""Recompute every provider's rating, review count and star histogram.
+
+    python -m scripts.rebuild_provider_ratings
+
+Run it once after deploying the rating aggregates, and again whenever
+reviews were changed without going through ReviewService.
+"""
+from app.database import SessionLocal, Base, engine
+from app.services.provider_rating_service import ProviderRatingService
+
+def main():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        rated = ProviderRatingService(db).rebuild()
+    finally:
+        db.close()
+    print(f"providers: rebuilt ratings, {rated} providers have reviews")
+
+if __name__ == "__main__":
+    main()
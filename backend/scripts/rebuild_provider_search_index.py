@@ -0,0 +1,21 @@
+"""Rebuild the provider_search_tokens index from the providers table.
+
+    python -m scripts.rebuild_provider_search_index
+
+Run it once after deploying the search index, and again whenever providers
+were changed without going through ProviderService.
+"""
+from app.database import SessionLocal, Base, engine
+from app.services.provider_search_service import ProviderSearchService
+
+def main():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        indexed = ProviderSearchService(db).rebuild()
+    finally:
+        db.close()
+    print(f"provider_search_tokens: indexed {indexed} providers")
+
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,11 @@ import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from app.database import Base, get_db
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from app.database import Base, get_db, get_async_db, get_read_db, get_async_read_db
 from app.main import app
+from app.core import query_stats
+from app.auth.principal_cache import principal_cache
 
 # Test database URL
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
@@ -14,6 +17,19 @@ engine = create_engine(
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine on the same file for routes that depend on get_async_db
+async_engine = create_async_engine("sqlite+aiosqlite:///./test.db")
+TestingAsyncSessionLocal = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+query_stats.instrument(engine)
+query_stats.instrument(async_engine)
+
+# A second file stands in for the read replica
+REPLICA_DATABASE_URL = "sqlite:///./test_replica.db"
+replica_engine = create_engine(
+    REPLICA_DATABASE_URL, connect_args={"check_same_thread": False}
+)
+TestingReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+
 @pytest.fixture(scope="function")
 def db():
     # Create the test database tables
@@ -27,6 +43,18 @@ def db():
         db.close()
         # Drop all tables after the test
         Base.metadata.drop_all(bind=engine)
+        # Cached users would outlive their rows
+        principal_cache.clear()
+
+@pytest.fixture(scope="function")
+def replica_db():
+    Base.metadata.create_all(bind=replica_engine)
+    db = TestingReplicaSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        Base.metadata.drop_all(bind=replica_engine)
 
 @pytest.fixture(scope="function")
 def client(db):
@@ -36,11 +64,36 @@ def client(db):
         finally:
             db.close()
     
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as session:
+            yield session
+    
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    # Reads see the test's own writes unless a test routes them to replica_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_async_read_db] = override_get_async_db
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
 
+@pytest.fixture
+def assert_query_budget():
+    """Fail when a response ran more statements than its endpoint's budget.
+
+        response = client.get("/api/v1/notifications")
+        assert_query_budget(response, 2)
+    """
+    def check(response, max_queries: int):
+        timing = query_stats.parse_server_timing(response.headers.get("Server-Timing"))
+        assert timing is not None, "response has no Server-Timing db entry"
+        request = response.request
+        assert timing["queries"] <= max_queries, (
+            f"{request.method} {request.url.path} ran {timing['queries']} queries, "
+            f"budget is {max_queries}"
+        )
+    return check
+
 @pytest.fixture(scope="function")
 def test_provider(db):
     from app.models.provider import Provider
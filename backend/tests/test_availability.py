@@ -0,0 +1,147 @@
+import asyncio
+import random
+from datetime import date, datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from app.auth.auth import get_current_user
+from app.main import app
+from app.models.provider_availability import ProviderAvailability
+from app.models.service import Service
+from app.models.user import User
+from app.schemas.provider import ProviderCreate
+from app.services import availability_service
+from app.services.availability_service import availability_index, parse_availability, format_availability
+from app.services.provider_service import ProviderService
+from app.utils.intervals import IntervalTree
+from tests.conftest import TestingAsyncSessionLocal
+
+SATURDAY = datetime.combine(date.today() + timedelta(days=(5 - date.today().weekday()) % 7 + 7), datetime.min.time())
+
+def _at(hour, minute=0):
+    return SATURDAY + timedelta(hours=hour, minutes=minute)
+
+async def _with_service(action):
+    async with TestingAsyncSessionLocal() as session:
+        return await action(ProviderService(session))
+
+def _create_provider(db, key, areas, availability):
+    db.add(User(id=f"user-{key}", email=f"{key}@example.com", hashed_password="x"))
+    db.commit()
+    provider = asyncio.run(_with_service(lambda service: service.create_provider(ProviderCreate(
+        business_name=key.title(), business_address="Lagos", business_phone="+2348012345678",
+        business_email=f"{key}-business@example.com", service_categories=["Plumbing"],
+        service_areas=areas, availability=availability
+    ), f"user-{key}")))
+    db.add(Service(id=f"service-{key}", name="Repair", description="", price=5000.0,
+                   duration="01:00", provider_id=provider.id))
+    db.commit()
+    return provider.id
+
+@pytest.fixture
+def as_customer(client, db):
+    db.add(User(id="customer-1", email="customer@example.com", hashed_password="x"))
+    db.commit()
+    # A detached copy, so the override survives the request sessions closing
+    user = User(id="customer-1", email="customer@example.com", hashed_password="x", role="user")
+    app.dependency_overrides[get_current_user] = lambda: user
+    availability_index.clear()
+    yield
+    availability_index.clear()
+
+def test_interval_tree_matches_brute_force():
+    rng = random.Random(3)
+    tree, entries = IntervalTree(), set()
+    for i in range(3000):
+        if entries and rng.random() < 0.3:
+            entry = rng.choice(sorted(entries))
+            assert tree.remove(*entry)
+            entries.discard(entry)
+        else:
+            start = rng.randint(0, 10_000)
+            entry = (start, start + rng.randint(1, 300), i)
+            tree.add(*entry)
+            entries.add(entry)
+    assert len(tree) == len(entries)
+    assert list(tree) == sorted(entries)
+    for _ in range(200):
+        start = rng.randint(0, 10_000)
+        end = start + rng.randint(1, 500)
+        assert list(tree.overlapping(start, end)) == sorted(e for e in entries if e[0] < end and e[1] > start)
+        assert list(tree.covering(start, end)) == sorted(e for e in entries if e[0] <= start and e[1] >= end)
+    assert not tree.remove(-1, 0, None)
+
+def test_availability_is_normalized(db):
+    windows = parse_availability('{"Sat": ["09:00-11:00", {"start": "10:30", "end": "13:00"}], "monday": ["08:00-24:00"]}')
+    assert windows == [(0, 8 * 60, 24 * 60), (5, 9 * 60, 13 * 60)]
+    assert format_availability(windows) == '{"monday": ["08:00-24:00"], "saturday": ["09:00-13:00"]}'
+    for invalid in ('[]', '{"funday": []}', '{"saturday": ["13:00-09:00"]}', '{"saturday": ["9am-5pm"]}', 'nope'):
+        with pytest.raises(ValueError):
+            parse_availability(invalid)
+
+    provider_id = _create_provider(db, "ikeja", ["Ikeja"], '{"saturday": ["09:00-13:00"]}')
+    rows = db.query(ProviderAvailability).filter(ProviderAvailability.provider_id == provider_id).all()
+    assert [(r.weekday, r.start_minute, r.end_minute) for r in rows] == [(5, 540, 780)]
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(_with_service(lambda service: service.update_availability(provider_id, '{"saturday": "all day"}')))
+    assert error.value.status_code == 400
+    provider = asyncio.run(_with_service(lambda service: service.update_availability(
+        provider_id, '{"sun": ["12:00-14:00"]}'
+    )))
+    assert provider.availability == '{"sunday": ["12:00-14:00"]}'
+    assert availability_index.windows[provider_id] == [(6, 720, 840)]
+    availability_index.clear()
+
+def _slots(client, provider_id):
+    response = client.get(f"/api/v1/providers/{provider_id}/free-slots", params={
+        "after": SATURDAY.isoformat(), "count": 4
+    })
+    assert response.status_code == 200
+    return [datetime.fromisoformat(item["start"]).hour for item in response.json()["items"]]
+
+def test_free_slots_follow_booking_writes(client, db, as_customer):
+    provider_id = _create_provider(db, "ikeja", ["Ikeja"], '{"saturday": ["09:00-13:00"]}')
+    assert _slots(client, provider_id) == [9, 10, 11, 12]
+
+    booking = client.post("/api/v1/bookings/", json={
+        "service_id": "service-ikeja", "provider_id": provider_id,
+        "date": SATURDAY.isoformat(), "time": "10:00"
+    })
+    assert booking.status_code == 200
+    booking_id = booking.json()["id"]
+    assert _slots(client, provider_id) == [9, 11, 12, 9]
+
+    assert client.put(f"/api/v1/bookings/{booking_id}", json={"time": "11:30"}).status_code == 200
+    # 11:30-12:30 leaves 10:00-11:00 and nothing else before 13:00 that fits
+    assert _slots(client, provider_id) == [9, 10, 9, 10]
+
+    assert client.delete(f"/api/v1/bookings/{booking_id}").status_code == 204
+    assert _slots(client, provider_id) == [9, 10, 11, 12]
+
+def test_providers_free_at(client, db, as_customer, monkeypatch):
+    booked = _create_provider(db, "booked", ["Ikeja"], '{"saturday": ["08:00-18:00"]}')
+    _create_provider(db, "free", ["Ikeja"], '{"saturday": ["10:00-11:00"]}')
+    _create_provider(db, "morning", ["Ikeja"], '{"saturday": ["07:00-10:30"]}')
+    _create_provider(db, "lekki", ["Lekki"], '{"saturday": ["08:00-18:00"]}')
+    client.post("/api/v1/bookings/", json={
+        "service_id": "service-booked", "provider_id": booked,
+        "date": SATURDAY.isoformat(), "time": "09:30"
+    })
+
+    def free(at, **params):
+        response = client.get("/api/v1/providers/available", params={"at": at.isoformat(), **params})
+        assert response.status_code == 200
+        return sorted(provider["business_name"] for provider in response.json())
+
+    assert free(_at(10), area="ikeja") == ["Free"]
+    assert free(_at(10)) == ["Free", "Lekki"]
+    assert free(_at(10), area="ikeja", duration_minutes=30) == ["Free", "Morning"]
+    assert free(_at(11), area="ikeja") == ["Booked"]
+    assert free(_at(10) + timedelta(days=1)) == []
+
+    # Large candidate sets are ranked by streaming providers instead
+    monkeypatch.setattr(availability_service, "_MAX_IN_LIST", 0)
+    assert free(_at(10)) == ["Free", "Lekki"]
+    assert free(_at(10), limit=1) in (["Free"], ["Lekki"])
@@ -0,0 +1,155 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.auth.auth import get_current_user
+from app.config import settings
+from app.main import app
+from app.models.booking import Booking
+from app.models.booking_slot_claim import BookingSlotClaim
+from app.models.provider import Provider
+from app.models.service import Service
+from app.models.user import User
+from app.schemas.booking import BookingCreate
+from app.services.availability_service import availability_index
+from app.services.booking_service import BookingService
+
+DAY = datetime.combine(date.today() + timedelta(days=14), datetime.min.time())
+
+def _seed(db, customers=3):
+    db.add(User(id="provider-user", email="provider@example.com", hashed_password="x"))
+    db.add(Provider(
+        id="provider-1", user_id="provider-user", business_name="Ikeja Pipes",
+        business_address="Ikeja", business_phone="+2348012345678",
+        business_email="pipes@example.com", business_description="",
+        service_categories=["Plumbing"], service_areas=["Ikeja"], availability="{}"
+    ))
+    db.add(Service(id="service-1", name="Repair", description="", price=5000.0,
+                   duration="01:00", provider_id="provider-1"))
+    db.add_all([
+        User(id=f"customer-{i}", email=f"customer{i}@example.com", hashed_password="x")
+        for i in range(customers)
+    ])
+    db.commit()
+
+def _request(time, hold_id=None):
+    return BookingCreate(service_id="service-1", provider_id="provider-1", date=DAY, time=time, hold_id=hold_id)
+
+def _book(db, customer, time, hold_id=None):
+    return BookingService(db).create_booking(_request(time), customer, hold_id=hold_id)
+
+def _conflict(action):
+    with pytest.raises(HTTPException) as error:
+        action()
+    assert error.value.status_code == 409
+
+@pytest.fixture(autouse=True)
+def _fresh_index():
+    availability_index.clear()
+    yield
+    availability_index.clear()
+
+def test_overlapping_bookings_are_rejected(db):
+    _seed(db)
+    first = _book(db, "customer-0", "10:00")
+    _conflict(lambda: _book(db, "customer-1", "10:30"))
+    _conflict(lambda: _book(db, "customer-1", "09:15"))
+    # Back to back is fine
+    _book(db, "customer-1", "11:00")
+    _book(db, "customer-2", "09:00")
+
+    # Moving onto another booking fails and leaves the original claim
+    _conflict(lambda: BookingService(db).update_booking(first, {"time": "11:30"}))
+    db.refresh(first)
+    assert first.time == "10:00"
+    _conflict(lambda: _book(db, "customer-2", "10:00"))
+
+    # Cancelling releases the slot; reopening re-claims it
+    BookingService(db).update_booking(first, {"status": "cancelled"})
+    second = _book(db, "customer-2", "10:00")
+    _conflict(lambda: BookingService(db).update_booking(first, {"status": "pending"}))
+    BookingService(db).delete_booking(second)
+    BookingService(db).update_booking(first, {"status": "pending"})
+    assert db.scalar(select(func.count()).select_from(BookingSlotClaim)) == 12
+
+def test_holds_expire(db, monkeypatch):
+    _seed(db)
+    service = BookingService(db)
+    hold = service.hold_slot("provider-1", "service-1", DAY, "10:00", "customer-0")
+    _conflict(lambda: _book(db, "customer-1", "10:00"))
+    _conflict(lambda: service.hold_slot("provider-1", "service-1", DAY, "10:45", "customer-1"))
+    # Only the customer who holds the slot can confirm it
+    _conflict(lambda: _book(db, "customer-1", "10:00", hold_id=hold["id"]))
+    booking = _book(db, "customer-0", "10:00", hold_id=hold["id"])
+    claims = db.scalars(select(BookingSlotClaim)).all()
+    assert {c.booking_id for c in claims} == {booking.id} and len(claims) == 4
+
+    monkeypatch.setattr(settings, "BOOKING_HOLD_SECONDS", -1)
+    expired = service.hold_slot("provider-1", "service-1", DAY, "12:00", "customer-0")
+    _conflict(lambda: _book(db, "customer-0", "12:00", hold_id=expired["id"]))
+    _book(db, "customer-1", "12:00")
+
+def test_concurrent_attempts_at_one_slot(db):
+    attempts = 500
+    _seed(db, customers=attempts)
+    Session = sessionmaker(bind=db.get_bind(), autoflush=False)
+
+    def attempt(i):
+        session = Session()
+        try:
+            _book(session, f"customer-{i}", "10:00")
+            return "booked"
+        except HTTPException as e:
+            return e.status_code
+        finally:
+            session.close()
+
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        outcomes = list(pool.map(attempt, range(attempts)))
+    assert outcomes.count("booked") == 1
+    assert outcomes.count(409) == attempts - 1
+    assert db.scalar(select(func.count()).select_from(Booking)) == 1
+    assert db.scalar(select(func.count()).select_from(BookingSlotClaim)) == 4
+
+def test_booking_routes_return_conflict(client, db):
+    _seed(db)
+    customer = User(id="customer-0", email="customer0@example.com", hashed_password="x", role="user")
+    app.dependency_overrides[get_current_user] = lambda: customer
+    body = {"service_id": "service-1", "provider_id": "provider-1", "date": DAY.isoformat(), "time": "10:00"}
+
+    hold = client.post("/api/v1/bookings/holds", json={k: v for k, v in body.items()})
+    assert hold.status_code == 200
+    assert client.post("/api/v1/bookings/", json=body).status_code == 409
+    assert client.post("/api/v1/bookings/", json={**body, "hold_id": hold.json()["id"]}).status_code == 200
+    assert client.post("/api/v1/bookings/", json=body).status_code == 409
+
+    second = client.post("/api/v1/bookings/holds", json={**body, "time": "14:00"}).json()
+    assert client.delete(f"/api/v1/bookings/holds/{second['id']}").status_code == 204
+    assert client.post("/api/v1/bookings/", json={**body, "time": "14:00"}).status_code == 200
+
+def test_rebuild_claims(db):
+    _seed(db)
+    now = datetime.utcnow()
+    db.add_all([
+        Booking(id="b-old", service_id="service-1", provider_id="provider-1", customer_id="customer-0",
+                date=DAY, time="10:00", created_at=now - timedelta(days=2)),
+        Booking(id="b-overlap", service_id="service-1", provider_id="provider-1", customer_id="customer-1",
+                date=DAY, time="10:30", created_at=now - timedelta(days=1)),
+        Booking(id="b-cancelled", service_id="service-1", provider_id="provider-1", customer_id="customer-2",
+                date=DAY, time="10:00", status="cancelled", created_at=now),
+    ])
+    db.commit()
+    assert BookingService(db).rebuild_claims() == (1, ["b-overlap"])
+    _conflict(lambda: _book(db, "customer-2", "10:45"))
+
+def test_claim_constraint_decides_without_precheck(db, monkeypatch):
+    _seed(db)
+    # Another process may claim between the pre-check and the insert
+    monkeypatch.setattr(BookingService, "_taken", lambda self, provider_id, slots: False)
+    _book(db, "customer-0", "10:00")
+    _conflict(lambda: _book(db, "customer-1", "10:30"))
+    assert db.scalar(select(func.count()).select_from(Booking)) == 1
@@ -0,0 +1,273 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+from starlette.requests import Request
+from starlette.websockets import WebSocketDisconnect
+
+from app.auth.auth import create_access_token
+from app.config import settings
+from app.core.broker import broker
+from app.core.connections import (
+    IDLE_CLOSE_CODE, PING, POLICY_CLOSE_CODE, RESYNC, SLOW_CLIENT_CLOSE_CODE, ConnectionManager, format_event,
+    manager as worker_manager
+)
+from app.main import app
+from app.routes.notifications import notification_stream
+from app.models.notification import Notification
+from app.models.user import User
+from tests.conftest import async_engine
+
+class FakeSocket:
+    """Records what it is sent; a stalled socket never finishes a send."""
+
+    def __init__(self, stalled=False, broken=False):
+        self.sent = []
+        self.closed_with = None
+        self.stalled = stalled
+        self.broken = broken
+
+    async def accept(self):
+        pass
+
+    async def send_json(self, message):
+        if self.broken:
+            raise RuntimeError("connection reset")
+        if self.stalled:
+            await asyncio.Event().wait()
+        self.sent.append(message)
+
+    async def close(self, code=1000):
+        self.closed_with = code
+
+async def _settle():
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+def test_every_socket_of_a_user_receives():
+    async def scenario():
+        manager = ConnectionManager(queue_size=10)
+        phone, laptop, other = FakeSocket(), FakeSocket(), FakeSocket()
+        phone_connection = await manager.connect(phone, "user-1")
+        await manager.connect(laptop, "user-1")
+        await manager.connect(other, "user-2")
+        assert len(manager) == 3
+
+        await manager.deliver("user-1", {"id": 1})
+        await _settle()
+        assert phone.sent == laptop.sent == [{"id": 1}]
+        assert other.sent == []
+
+        # Closing one tab leaves the other connected
+        manager.disconnect(phone_connection)
+        await manager.deliver("user-1", {"id": 2})
+        await _settle()
+        assert phone.sent == [{"id": 1}]
+        assert laptop.sent == [{"id": 1}, {"id": 2}]
+
+        await manager.close_all()
+        assert laptop.closed_with == other.closed_with == 1001
+        assert len(manager) == 0
+
+    asyncio.run(scenario())
+
+def test_slow_client_is_disconnected_without_holding_up_others():
+    async def scenario():
+        manager = ConnectionManager(queue_size=5, overflow_policy="disconnect")
+        slow, fast = FakeSocket(stalled=True), FakeSocket()
+        await manager.connect(slow, "user-1")
+        await manager.connect(fast, "user-1")
+
+        for i in range(20):
+            await asyncio.wait_for(manager.deliver("user-1", {"id": i}), timeout=1)
+            await _settle()
+        assert [m["id"] for m in fast.sent] == list(range(20))
+        # One message in flight, five queued, the seventh overflowed
+        assert slow.closed_with == SLOW_CLIENT_CLOSE_CODE
+        assert manager.slow_disconnects == 1
+        assert len(manager) == 1
+
+    asyncio.run(scenario())
+
+def test_drop_oldest_keeps_the_newest_messages():
+    async def scenario():
+        manager = ConnectionManager(queue_size=3, overflow_policy="drop_oldest")
+        slow = FakeSocket(stalled=True)
+        connection = await manager.connect(slow, "user-1")
+        await manager.deliver("user-1", {"id": 0})
+        await _settle()  # taken by the sender, which is now stuck
+        for i in range(1, 10):
+            await manager.deliver("user-1", {"id": i})
+
+        assert slow.closed_with is None
+        assert connection.dropped == 6
+        assert [connection.queue.get_nowait()["id"] for _ in range(3)] == [7, 8, 9]
+
+    asyncio.run(scenario())
+
+def test_broken_socket_is_removed():
+    async def scenario():
+        manager = ConnectionManager(queue_size=3)
+        await manager.connect(FakeSocket(broken=True), "user-1")
+        await manager.deliver("user-1", {"id": 1})
+        await _settle()
+        assert len(manager) == 0
+        assert "user-1" not in manager.active_connections
+
+    asyncio.run(scenario())
+
+def test_heartbeat_pings_live_sockets_and_reaps_idle_ones():
+    async def scenario():
+        manager = ConnectionManager(queue_size=10, heartbeat_seconds=0.01, idle_timeout=0.05)
+        live, silent = FakeSocket(), FakeSocket()
+        live_connection = await manager.connect(live, "user-1")
+        await manager.connect(silent, "user-2")
+        manager.start()
+        for _ in range(10):
+            await asyncio.sleep(0.01)
+            live_connection.touch()
+        await manager.close_all()
+        return manager, live, silent
+
+    manager, live, silent = asyncio.run(scenario())
+    assert live.sent and all(message == PING for message in live.sent)
+    assert silent.closed_with == IDLE_CLOSE_CODE
+    assert live.closed_with == 1001
+    assert manager.idle_disconnects == 1
+
+def test_caps_refuse_new_sockets():
+    async def scenario():
+        manager = ConnectionManager(max_connections=3, max_per_user=2)
+        await manager.connect(FakeSocket(), "user-1")
+        assert manager.rejection("user-1") is None
+        await manager.connect(FakeSocket(), "user-1")
+        assert manager.rejection("user-1") == POLICY_CLOSE_CODE
+        assert manager.rejection("user-2") is None
+        await manager.connect(FakeSocket(), "user-2")
+        assert manager.rejection() == SLOW_CLIENT_CLOSE_CODE
+        assert manager.rejected_connections == 2
+        await manager.close_all()
+        assert manager.rejection("user-1") is None
+
+    asyncio.run(scenario())
+
+def test_ws_releases_its_session_once_admitted(client, db, monkeypatch):
+    db.add(User(id="user-1", email="user@example.com", hashed_password="x"))
+    db.commit()
+    token = create_access_token({"sub": "user-1"}, timedelta(minutes=5))
+    monkeypatch.setattr(worker_manager, "max_per_user", 1)
+
+    with client.websocket_connect(f"/api/v1/ws?token={token}") as websocket:
+        websocket.send_text("pong")
+        assert len(worker_manager) == 1
+        # No pooled connection stays checked out for the open socket
+        assert async_engine.pool.checkedout() == 0
+        with pytest.raises(WebSocketDisconnect):
+            with client.websocket_connect(f"/api/v1/ws?token={token}") as second:
+                second.receive_text()
+    assert worker_manager.rejected_connections >= 1
+
+    unknown = create_access_token({"sub": "nobody"}, timedelta(minutes=5))
+    with pytest.raises(WebSocketDisconnect):
+        with client.websocket_connect(f"/api/v1/ws?token={unknown}") as websocket:
+            websocket.receive_text()
+
+def test_held_connection_skips_live_copies_of_replayed_notifications():
+    async def scenario():
+        manager = ConnectionManager(queue_size=10)
+        socket = FakeSocket()
+        connection = await manager.connect(socket, "user-1", hold=True)
+        # Published while the replay was running
+        await manager.deliver("user-1", {"id": 4})
+        await manager.deliver("user-1", {"id": 6})
+        await _settle()
+        assert socket.sent == []
+        connection.start(skip_through=5)
+        await manager.deliver("user-1", PING)
+        await _settle()
+        await manager.close_all()
+        return socket
+
+    assert asyncio.run(scenario()).sent == [{"id": 6}, PING]
+
+def _seed_notifications(db, count):
+    db.add(User(id="user-1", email="user@example.com", hashed_password="x"))
+    db.add_all([
+        Notification(user_id="user-1", title=f"Update {i}", message="", type="system")
+        for i in range(count)
+    ])
+    db.add(Notification(user_id="user-2", title="Someone else's", message="", type="system"))
+    db.commit()
+    return create_access_token({"sub": "user-1"}, timedelta(minutes=5))
+
+def test_ws_replays_notifications_after_last_seen_id(client, db, monkeypatch):
+    token = _seed_notifications(db, 5)
+    monkeypatch.setattr(settings, "WS_REPLAY_BATCH_SIZE", 2)
+
+    with client.websocket_connect(f"/api/v1/ws?token={token}&last_seen_id=2") as websocket:
+        replayed = [websocket.receive_json() for _ in range(3)]
+    assert [(n["id"], n["title"]) for n in replayed] == [(3, "Update 2"), (4, "Update 3"), (5, "Update 4")]
+
+def test_ws_asks_for_a_refetch_when_too_much_was_missed(client, db, monkeypatch):
+    token = _seed_notifications(db, 6)
+    monkeypatch.setattr(settings, "WS_REPLAY_BATCH_SIZE", 2)
+    monkeypatch.setattr(settings, "WS_REPLAY_LIMIT", 4)
+
+    with client.websocket_connect(f"/api/v1/ws?token={token}&last_seen_id=0") as websocket:
+        received = [websocket.receive_json() for _ in range(5)]
+    assert [n.get("id") for n in received[:4]] == [1, 2, 3, 4]
+    assert received[4] == RESYNC
+
+def test_event_stream_replays_then_delivers_live(client, db):
+    token = _seed_notifications(db, 4)
+
+    async def scenario():
+        await broker.start(worker_manager.deliver)
+        request = Request({"type": "http", "app": app, "headers": [], "method": "GET", "path": "/"})
+        response = await notification_stream(request, token=token, last_event_id=None, last_event_header=2)
+        assert response.media_type == "text/event-stream"
+        frames = response.body_iterator
+        received = [await anext(frames) for _ in range(3)]
+        assert len(worker_manager) == 1
+        await broker.publish("user-1", {"id": 99, "title": "Live"})
+        received.append(await anext(frames))
+        await frames.aclose()
+        await broker.stop()
+        return received
+
+    retry, third, fourth, live = asyncio.run(scenario())
+    assert retry == "retry: 3000\n\n"
+    assert third.startswith("id: 3\ndata: ") and '"title": "Update 2"' in third
+    assert fourth.startswith("id: 4\n")
+    assert live == 'id: 99\ndata: {"id": 99, "title": "Live"}\n\n'
+    assert len(worker_manager) == 0
+
+def test_event_stream_holds_no_connection_until_the_response_starts(client, db):
+    token = _seed_notifications(db, 1)
+
+    async def scenario():
+        request = Request({"type": "http", "app": app, "headers": [], "method": "GET", "path": "/"})
+        # The client hangs up before the body is ever iterated
+        abandoned = await notification_stream(request, token=token, last_event_id=None, last_event_header=None)
+        await abandoned.body_iterator.aclose()
+        counts = [len(worker_manager)]
+
+        response = await notification_stream(request, token=token, last_event_id=None, last_event_header=None)
+        frames = response.body_iterator
+        await anext(frames)
+        task = asyncio.ensure_future(anext(frames))
+        await asyncio.sleep(0)
+        counts.append(len(worker_manager))
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        await frames.aclose()
+        counts.append(len(worker_manager))
+        return counts
+
+    assert asyncio.run(scenario()) == [0, 1, 0]
+
+def test_event_stream_frames_and_refusals(client, db):
+    assert format_event(PING) == ": ping\n\n"
+    assert format_event(RESYNC) == 'event: resync\ndata: {"event": "resync"}\n\n'
+    response = client.get("/api/v1/notifications/stream?token=not-a-jwt")
+    assert response.status_code == 401
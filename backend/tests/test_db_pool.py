@@ -0,0 +1,28 @@
+import pytest
+from sqlalchemy import create_engine, exc, text
+
+from app.core.db_pool import _registry, instrument, pool_options
+
+def test_pool_metrics_count_checkouts_and_timeouts(tmp_path, monkeypatch):
+    from app.config import settings
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 1)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 0)
+    monkeypatch.setattr(settings, "DB_POOL_TIMEOUT", 0.05)
+    url = f"sqlite:///{tmp_path / 'pool.db'}"
+    engine = create_engine(url, **pool_options(url, "test_pool"))
+    instrument(engine, "test_pool")
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("select 1"))
+            with pytest.raises(exc.TimeoutError):
+                engine.connect()
+            snapshot = _registry["test_pool"].snapshot()
+            assert snapshot["checked_out"] == 1
+        snapshot = _registry["test_pool"].snapshot()
+        assert snapshot["size"] == 1
+        assert snapshot["checkouts"] == 1
+        assert snapshot["timeouts"] == 1
+        assert snapshot["wait_max_ms"] >= 50
+    finally:
+        engine.dispose()
+        _registry.pop("test_pool", None)
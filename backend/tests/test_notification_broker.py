@@ -0,0 +1,85 @@
+import asyncio
+
+from app.core.broker import InMemoryBroker, LocalRedis, RedisBroker, broker
+from app.core.connections import ConnectionManager
+from app.models.user import User
+from app.schemas.notification import NotificationCreate
+from app.services.notification_service import NotificationService
+from tests.conftest import TestingAsyncSessionLocal
+
+class FakeSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def accept(self):
+        pass
+
+    async def send_json(self, message):
+        self.sent.append(message)
+
+async def _settle():
+    # Let the brokers' reader tasks drain what was published
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+def test_messages_reach_sockets_held_by_other_workers():
+    async def scenario():
+        server = LocalRedis()
+        workers = []
+        for _ in range(3):
+            manager = ConnectionManager()
+            worker_broker = RedisBroker("notifications", client=server)
+            await worker_broker.start(manager.deliver)
+            # Starting twice keeps the one subscription
+            await worker_broker.start(manager.deliver)
+            workers.append((manager, worker_broker))
+        assert len(server.subscribers["notifications"]) == 3
+
+        sockets = {}
+        for index, (manager, _) in enumerate(workers):
+            sockets[f"user-{index}"] = FakeSocket()
+            await manager.connect(sockets[f"user-{index}"], f"user-{index}")
+
+        # Published on worker 0, held by worker 2
+        await workers[0][1].publish("user-2", {"title": "Job accepted"})
+        await workers[1][1].publish("user-0", {"title": "Payment received"})
+        await workers[1][1].publish("nobody", {"title": "Dropped"})
+        await _settle()
+        assert sockets["user-2"].sent == [{"title": "Job accepted"}]
+        assert sockets["user-0"].sent == [{"title": "Payment received"}]
+        assert sockets["user-1"].sent == []
+
+        for _, worker_broker in workers:
+            await worker_broker.stop()
+        assert not server.subscribers["notifications"]
+
+    asyncio.run(scenario())
+
+def test_created_notifications_are_published(db):
+    db.add(User(id="user-1", email="user@example.com", hashed_password="x"))
+    db.commit()
+
+    async def scenario():
+        received = []
+
+        async def handler(user_id, message):
+            received.append((user_id, message))
+
+        await broker.start(handler)
+        try:
+            async with TestingAsyncSessionLocal() as session:
+                notification = await NotificationService(session).create_notification(NotificationCreate(
+                    user_id="user-1", title="New job", message="You have a new job request", type="job_request"
+                ))
+        finally:
+            await broker.stop()
+        await _settle()
+        return notification, received
+
+    notification, received = asyncio.run(scenario())
+    assert isinstance(broker, InMemoryBroker)
+    assert received == [("user-1", {
+        "id": notification.id, "user_id": "user-1", "title": "New job",
+        "message": "You have a new job request", "type": "job_request", "data": None,
+        "is_read": False, "created_at": notification.created_at.isoformat()
+    })]
@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from app.models.notification import ArchivedNotification, Notification
+from app.models.user import User
+from app.services.notification_retention_service import NotificationRetentionService
+
+def _seed(db):
+    now = datetime.utcnow()
+    db.add_all([
+        User(id="heavy", email="heavy@example.com", hashed_password="x"),
+        User(id="light", email="light@example.com", hashed_password="x"),
+    ])
+    # heavy: 30 notifications a day apart, oldest inserted first;
+    # every third one is still unread
+    db.add_all([
+        Notification(user_id="heavy", title=f"Heavy {day}", message="", type="system",
+                     is_read=day % 3 != 0, created_at=now - timedelta(days=day))
+        for day in range(30, 0, -1)
+    ])
+    # light: one old read notification and one recent
+    db.add_all([
+        Notification(user_id="light", title="Old", message="", type="system", is_read=True,
+                     created_at=now - timedelta(days=60)),
+        Notification(user_id="light", title="New", message="", type="system", is_read=True,
+                     created_at=now - timedelta(hours=1)),
+    ])
+    db.commit()
+
+def _titles(db, model, user_id):
+    return {row.title for row in db.scalars(select(model).filter(model.user_id == user_id))}
+
+def test_compaction_archives_old_and_surplus_read_notifications(db):
+    _seed(db)
+    retention = NotificationRetentionService(db)
+    archived = retention.compact(retention_days=20, keep_per_user=10, batch_size=4)
+    retention.vacuum()
+    db.expire_all()
+
+    heavy = _titles(db, Notification, "heavy")
+    # The 10 newest stay, plus every unread one however old
+    newest = {f"Heavy {day}" for day in range(1, 11)}
+    unread = {f"Heavy {day}" for day in range(3, 31, 3)}
+    assert heavy == newest | unread
+    assert _titles(db, ArchivedNotification, "heavy") == {f"Heavy {day}" for day in range(11, 31)} - unread
+    assert _titles(db, Notification, "light") == {"New"}
+    assert _titles(db, ArchivedNotification, "light") == {"Old"}
+    assert archived == 14
+
+    old = db.scalar(select(ArchivedNotification).filter(ArchivedNotification.title == "Old"))
+    assert old.is_read and old.archived_at is not None
+
+    # Nothing is left to archive
+    assert retention.compact(retention_days=20, keep_per_user=10) == 0
@@ -0,0 +1,113 @@
+import asyncio
+
+from sqlalchemy import event, func, select
+
+from app.core.broker import broker
+from app.models.notification import Notification
+from app.models.user import User
+from app.schemas.notification import NotificationCreate
+from app.services.notification_service import NotificationService
+from app.services.notification_writer import NotificationWriter
+from tests.conftest import TestingAsyncSessionLocal, async_engine
+
+def _notification(i, user_id="user-1"):
+    return NotificationCreate(user_id=user_id, title=f"New job {i}", message="Plumbing in Ikeja", type="job_request")
+
+def _seed(db):
+    db.add_all([
+        User(id="user-1", email="one@example.com", hashed_password="x"),
+        User(id="user-2", email="two@example.com", hashed_password="x"),
+    ])
+    db.commit()
+
+def _statements():
+    statements = []
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("INSERT"):
+            statements.append(statement)
+
+    return statements, on_execute
+
+def test_create_notifications_inserts_in_bulk_and_pushes_each(db):
+    _seed(db)
+    inserts, on_execute = _statements()
+    event.listen(async_engine.sync_engine, "before_cursor_execute", on_execute)
+
+    async def scenario():
+        received = []
+
+        async def handler(user_id, message):
+            received.append((user_id, message["id"], message["title"]))
+
+        await broker.start(handler)
+        try:
+            async with TestingAsyncSessionLocal() as session:
+                created = await NotificationService(session).create_notifications(
+                    [_notification(i, ("user-1", "user-2")[i % 2]) for i in range(50)]
+                )
+        finally:
+            await broker.stop()
+        return created, received
+
+    try:
+        created, received = asyncio.run(scenario())
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", on_execute)
+    assert sorted(n.title for n in created) == sorted(f"New job {i}" for i in range(50))
+    assert len({n.id for n in created}) == 50
+    assert received == [(n.user_id, n.id, n.title) for n in created]
+    assert len(inserts) < 5
+    assert all(not n.is_read and n.created_at is not None for n in created)
+
+def test_writer_flushes_by_size_and_by_time(db):
+    _seed(db)
+
+    async def count():
+        async with TestingAsyncSessionLocal() as session:
+            return await session.scalar(select(func.count()).select_from(Notification))
+
+    async def scenario():
+        writer = NotificationWriter(TestingAsyncSessionLocal, batch_size=100, flush_seconds=0.2)
+        writer.start()
+        # A full batch is written without waiting for the timer
+        await writer.add_many([_notification(i) for i in range(100)])
+        for _ in range(50):
+            await asyncio.sleep(0.01)
+            if writer.written:
+                break
+        by_size = (await count(), writer.flushes)
+
+        # A partial batch waits for the timer
+        await writer.add_many([_notification(i) for i in range(100, 130)])
+        await asyncio.sleep(0.05)
+        before_timer = await count()
+        await asyncio.sleep(0.3)
+        by_time = await count()
+
+        # Stopping writes whatever is left
+        await writer.add_many([_notification(i) for i in range(130, 135)])
+        await writer.stop()
+        return by_size, before_timer, by_time, await count(), writer
+
+    by_size, before_timer, by_time, final, writer = asyncio.run(scenario())
+    assert by_size == (100, 1)
+    assert (before_timer, by_time, final) == (100, 130, 135)
+    assert (writer.written, writer.flushes, writer.failed, len(writer)) == (135, 3, 0, 0)
+
+def test_writer_holds_adds_back_at_its_buffer_limit(db):
+    _seed(db)
+
+    async def scenario():
+        writer = NotificationWriter(TestingAsyncSessionLocal, batch_size=10, flush_seconds=0.01, buffer_limit=20)
+        writer.start()
+        largest = 0
+        for i in range(200):
+            await writer.add(_notification(i))
+            largest = max(largest, len(writer))
+        await writer.stop()
+        return largest, writer
+
+    largest, writer = asyncio.run(scenario())
+    assert largest <= 20
+    assert writer.written == 200
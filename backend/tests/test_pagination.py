@@ -0,0 +1,152 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert
+
+from app.auth.auth import get_current_user
+from app.main import app
+from app.models.job import Job
+from app.models.notification import Notification
+from app.models.payment import Payment
+from app.models.provider import Provider
+from app.models.review import Review
+from app.models.user import User
+from app.schemas.review import ReviewCreate
+from app.services.review_service import ReviewService
+from app.utils.pagination import NEXT_CURSOR_HEADER, encode_cursor
+
+START = datetime(2026, 1, 1)
+
+def _seed_owners(db):
+    db.add(User(id="customer-1", email="customer@example.com", hashed_password="x", full_name="Ada"))
+    db.add(User(id="provider-user", email="provider@example.com", hashed_password="x"))
+    db.add(Provider(
+        id="provider-1", user_id="provider-user", business_name="Ikeja Pipes",
+        business_address="Ikeja", business_phone="+2348012345678",
+        business_email="pipes@example.com", business_description="",
+        service_categories=["Plumbing"], service_areas=["Ikeja"], availability="{}"
+    ))
+    db.commit()
+
+def _seed(db, rows=130):
+    _seed_owners(db)
+    # Every third row shares its timestamp with the one before, so pages must
+    # break ties on id
+    stamps = [START + timedelta(hours=i - i % 3 // 2) for i in range(rows)]
+    db.execute(insert(Payment), [
+        {"id": f"payment-{i:03d}", "amount": 100.0 + i, "payment_method": "card", "user_id": "customer-1",
+         "status": ("pending", "completed")[i % 2], "created_at": stamps[i]}
+        for i in range(rows)
+    ])
+    db.execute(insert(Notification), [
+        {"id": i + 1, "user_id": "customer-1", "title": "Hello", "message": "Hi", "type": "system",
+         "is_read": i % 4 == 0, "created_at": stamps[i]}
+        for i in range(rows)
+    ])
+    db.execute(insert(Job), [
+        {"id": f"job-{i:03d}", "title": "Job", "description": "Fix sink", "amount": 1000.0,
+         "service_type": "plumbing", "provider_id": "provider-1", "customer_id": "customer-1",
+         "created_at": stamps[i]}
+        for i in range(rows)
+    ])
+    db.execute(insert(Review), [
+        {"id": f"review-{i:03d}", "job_id": f"job-{i:03d}", "provider_id": "provider-1",
+         "customer_id": "customer-1", "rating": 1 + i % 5, "comment": "Good", "created_at": stamps[i]}
+        for i in range(rows)
+    ])
+    db.commit()
+    return stamps
+
+@pytest.fixture
+def as_customer(client):
+    user = User(id="customer-1", email="customer@example.com", hashed_password="x",
+                role="customer", is_active=True)
+    app.dependency_overrides[get_current_user] = lambda: user
+    return client
+
+def _walk(client, url, **params):
+    """Follow X-Next-Cursor to the end and return every item served."""
+    items, pages = [], 0
+    while True:
+        response = client.get(url, params=params)
+        assert response.status_code == 200, response.text
+        items.extend(response.json())
+        pages += 1
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            return items, pages
+        assert pages < 100, f"cursor walk of {url} does not end"
+        params["cursor"] = cursor
+
+def _newest_first(rows):
+    return [row_id for _, row_id in sorted(rows, reverse=True)]
+
+def test_cursor_walk_serves_every_row_once(db, as_customer):
+    stamps = _seed(db)
+
+    items, pages = _walk(as_customer, "/api/v1/payments/", limit=25)
+    assert pages == 6
+    assert [p["id"] for p in items] == _newest_first(
+        (stamps[i], f"payment-{i:03d}") for i in range(len(stamps))
+    )
+
+    items, _ = _walk(as_customer, "/api/v1/notifications", limit=40)
+    assert [n["id"] for n in items] == _newest_first((stamps[i], i + 1) for i in range(len(stamps)))
+
+    items, _ = _walk(as_customer, "/api/v1/api/providers/provider-1/reviews", limit=50)
+    assert [r["id"] for r in items] == _newest_first(
+        (stamps[i], f"review-{i:03d}") for i in range(len(stamps))
+    )
+    assert items[0]["customer_name"] == "Ada"
+    assert items[0]["job_service_type"] == "plumbing"
+
+def test_status_and_date_filters(db, as_customer):
+    stamps = _seed(db)
+    after, before = stamps[20], stamps[80]
+
+    items, _ = _walk(
+        as_customer, "/api/v1/payments/", limit=7, status="completed",
+        created_after=after.isoformat(), created_before=before.isoformat()
+    )
+    assert [p["id"] for p in items] == _newest_first(
+        (stamps[i], f"payment-{i:03d}") for i in range(len(stamps))
+        if i % 2 and after <= stamps[i] < before
+    )
+
+    items, _ = _walk(as_customer, "/api/v1/notifications", limit=10, status="unread")
+    assert len(items) == len([i for i in range(len(stamps)) if i % 4])
+    assert not any(n["is_read"] for n in items)
+
+def test_bad_requests_are_rejected(db, as_customer):
+    _seed(db, rows=3)
+    assert as_customer.get("/api/v1/payments/", params={"cursor": "not-a-cursor"}).status_code == 400
+    assert as_customer.get("/api/v1/payments/", params={"limit": 1000}).status_code == 422
+    assert as_customer.get("/api/v1/notifications", params={"status": "pending"}).status_code == 400
+    assert as_customer.get(
+        "/api/v1/api/providers/provider-1/reviews", params={"status": "pending"}
+    ).status_code == 400
+
+    # A cursor past the oldest row is an empty last page
+    response = as_customer.get("/api/v1/payments/", params={"cursor": encode_cursor(START, "")})
+    assert response.json() == []
+    assert NEXT_CURSOR_HEADER not in response.headers
+
+def test_reviews_created_through_the_service_page_to_the_end(db, as_customer):
+    # Timestamps here come from the model default, not from the test
+    _seed_owners(db)
+    for i in range(5):
+        db.add(Job(id=f"job-{i}", title="Job", description="Fix sink", amount=1000.0,
+                   service_type="plumbing", provider_id="provider-1", customer_id="customer-1"))
+    db.commit()
+    service = ReviewService(db)
+    created = [
+        service.create_review(ReviewCreate(job_id=f"job-{i}", rating=4, comment="Good"), "customer-1").id
+        for i in range(5)
+    ]
+
+    items, pages = _walk(as_customer, "/api/v1/api/providers/provider-1/reviews", limit=2)
+    assert pages == 3
+    assert [r["id"] for r in items] == [
+        review.id for review in sorted(db.query(Review).all(), key=lambda r: (r.created_at, r.id), reverse=True)
+    ]
+    assert sorted(r["id"] for r in items) == sorted(created)
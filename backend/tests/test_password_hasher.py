@@ -0,0 +1,78 @@
+import asyncio
+import threading
+
+import bcrypt
+import pytest
+from fastapi import HTTPException
+
+from app.config import settings
+from app.core.password_hasher import PasswordHasher
+from app.models.user import User
+from app.utils.password import get_password_hash, needs_rehash, verify_password
+
+@pytest.fixture(autouse=True)
+def cheap_rounds(monkeypatch):
+    monkeypatch.setattr(settings, "SECURITY_BCRYPT_ROUNDS", 4)
+
+def test_hashes_use_the_configured_cost():
+    hashed = get_password_hash("correct horse")
+    assert hashed.startswith("$2b$04$")
+    assert verify_password("correct horse", hashed)
+    assert not verify_password("wrong horse", hashed)
+    assert not verify_password("correct horse", "not-a-hash")
+    assert not needs_rehash(hashed)
+    assert needs_rehash(bcrypt.hashpw(b"correct horse", bcrypt.gensalt(rounds=5)).decode())
+
+def test_passwords_past_72_bytes_verify_as_before():
+    # The old passlib hashes only saw the first 72 bytes
+    long_password = "x" * 72
+    hashed = get_password_hash(long_password + "ignored")
+    assert verify_password(long_password, hashed)
+
+def test_login_hashes_off_the_event_loop_and_upgrades_old_hashes(client, db):
+    old_hash = bcrypt.hashpw(b"correct horse", bcrypt.gensalt(rounds=5)).decode()
+    db.add(User(id="user-1", email="ada@example.com", hashed_password=old_hash, full_name="Ada"))
+    db.commit()
+
+    response = client.post("/api/v1/auth/token", json={"email": "ada@example.com", "password": "correct horse"})
+    assert response.status_code == 200
+    assert response.json()["access_token"]
+    db.expire_all()
+    assert db.get(User, "user-1").hashed_password.startswith("$2b$04$")
+
+    response = client.post("/api/v1/auth/token", json={"email": "ada@example.com", "password": "wrong horse"})
+    assert response.status_code == 401
+
+def test_register_hashes_at_the_configured_cost(client, db):
+    response = client.post("/api/v1/auth/register", json={
+        "email": "obi@example.com", "full_name": "Obi",
+        "password": "correct horse", "confirm_password": "correct horse"
+    })
+    assert response.status_code == 200
+    user = db.query(User).filter(User.email == "obi@example.com").one()
+    assert user.hashed_password.startswith("$2b$04$")
+
+def test_saturated_pool_rejects_fast():
+    hasher = PasswordHasher(workers=1, queue_limit=2)
+    release = threading.Event()
+
+    def slow_verify(password, hashed):
+        release.wait(5)
+        return True
+
+    async def burst():
+        running = [asyncio.ensure_future(hasher._run(slow_verify, "pw", "hash")) for _ in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(HTTPException) as rejected:
+            await hasher.verify("pw", "hash")
+        release.set()
+        return rejected.value, await asyncio.gather(*running)
+
+    try:
+        rejected, results = asyncio.run(burst())
+    finally:
+        hasher.shutdown()
+    assert rejected.status_code == 503
+    assert rejected.headers["Retry-After"] == "1"
+    assert results == [True, True]
+    assert (hasher.pending, hasher.completed, hasher.rejected) == (0, 2, 1)
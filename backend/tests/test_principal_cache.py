@@ -0,0 +1,80 @@
+from datetime import timedelta
+
+from app.auth.auth import create_access_token, get_current_user
+from app.auth.principal_cache import PrincipalCache, principal_cache
+from app.main import app
+from app.models.user import User
+from app.schemas.user import UserUpdate
+from app.services.user_service import UserService
+
+def _login(db, user_id="user-1", **fields):
+    db.add(User(id=user_id, email=f"{user_id}@example.com", hashed_password="x", full_name="Ada", **fields))
+    db.commit()
+    token = create_access_token({"sub": user_id}, timedelta(minutes=5))
+    return {"Authorization": f"Bearer {token}"}
+
+def test_repeat_requests_skip_the_user_lookup(client, db, assert_query_budget):
+    headers = _login(db)
+
+    first = client.get("/api/v1/users/me", headers=headers)
+    assert first.status_code == 200
+    assert_query_budget(first, 1)
+    second = client.get("/api/v1/users/me", headers=headers)
+    assert second.json() == first.json()
+    assert_query_budget(second, 0)
+    assert (principal_cache.hits, principal_cache.misses) >= (1, 1)
+
+def test_user_writes_invalidate_the_cached_principal(client, db):
+    headers = _login(db)
+    assert client.get("/api/v1/users/me", headers=headers).json()["full_name"] == "Ada"
+
+    users = UserService(db)
+    users.update_user("user-1", UserUpdate(full_name="Ada Obi"))
+    assert client.get("/api/v1/users/me", headers=headers).json()["full_name"] == "Ada Obi"
+
+    users.update_user("user-1", UserUpdate(is_active=False))
+    assert client.get("/api/v1/users/me", headers=headers).status_code == 400
+
+    users.delete_user("user-1")
+    assert client.get("/api/v1/users/me", headers=headers).status_code == 401
+    assert principal_cache.invalidations == 3
+
+def test_cache_is_bounded_expires_and_skips_stale_loads():
+    cache = PrincipalCache(max_entries=2, ttl_seconds=60)
+    users = [User(id=f"user-{i}", email=f"{i}@example.com", role="user", is_active=True) for i in range(3)]
+    for user in users:
+        cache.put(user, cache.generation)
+    assert cache.get("user-0") is None
+    assert cache.get("user-2").email == "2@example.com"
+    assert cache.evictions == 1
+
+    # Hits are fresh objects: changing one leaves the cache alone
+    cache.get("user-1").email = "changed@example.com"
+    assert cache.get("user-1").email == "1@example.com"
+
+    # A load that raced an invalidation is not cached
+    generation = cache.generation
+    cache.invalidate("user-1")
+    cache.put(users[1], generation)
+    assert cache.get("user-1") is None
+
+    expiring = PrincipalCache(max_entries=2, ttl_seconds=0)
+    expiring.put(users[0], expiring.generation)
+    assert expiring.get("user-0") is None
+
+def test_admins_can_read_cache_counters(client):
+    admin = User(id="admin-1", email="admin@example.com", hashed_password="x", role="admin", is_active=True)
+    app.dependency_overrides[get_current_user] = lambda: admin
+    response = client.get("/api/v1/api/admin/cache/principals")
+    assert response.status_code == 200
+    assert {"hits", "misses", "hit_ratio", "evictions", "invalidations"} <= set(response.json())
+
+def test_profile_update_over_http_shows_on_the_next_request(client, db):
+    headers = _login(db)
+    assert client.get("/api/v1/users/me", headers=headers).json()["full_name"] == "Ada"
+
+    response = client.put("/api/v1/api/users/me", headers=headers, json={"full_name": "Ada Obi"})
+    assert response.status_code == 200
+    assert client.get("/api/v1/users/me", headers=headers).json()["full_name"] == "Ada Obi"
+    assert client.get("/api/v1/api/users/user-1", headers=headers).json()["full_name"] == "Ada Obi"
+    assert client.get("/api/v1/api/users/user-1").status_code == 401
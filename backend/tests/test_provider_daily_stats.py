@@ -0,0 +1,131 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.job import Job
+from app.models.payment import Payment
+from app.models.provider import Provider
+from app.models.provider_daily_stats import ProviderDailyStats
+from app.models.review import Review
+from app.models.user import User
+from app.services.provider_stats_service import ProviderDailyStatsService
+
+def _snapshot(db):
+    return {
+        (row.provider_id, row.day): (
+            row.booking_count, row.completed_count, row.completed_revenue,
+            row.review_count, row.review_sum, row.paid_amount, row.pending_amount,
+            row.response_count
+        )
+        for row in db.query(ProviderDailyStats).all()
+    }
+
+def _response_hours(db):
+    # SQLite's julianday() reads timestamps to the millisecond, so the
+    # rebuilt sums may differ from the live ones by a few microseconds
+    return {
+        (row.provider_id, row.day): row.response_time_sum
+        for row in db.query(ProviderDailyStats).all()
+    }
+
+def _seed_provider(db):
+    db.add(User(id="customer-1", email="customer@example.com", hashed_password="x"))
+    db.add(Provider(
+        id="provider-1", user_id="customer-1", business_name="Test Provider",
+        business_address="Ikeja", business_phone="+2348012345678",
+        business_email="test@example.com", business_description="Plumbing",
+        service_categories=["plumbing"], service_areas=["Ikeja"], availability="{}"
+    ))
+    db.commit()
+
+def test_incremental_rollup_matches_rebuild(db):
+    _seed_provider(db)
+    stats = ProviderDailyStatsService(db)
+    now = datetime.utcnow()
+
+    jobs = []
+    for i, created_at in enumerate([now - timedelta(days=3), now - timedelta(days=1), now]):
+        job = Job(
+            id=f"job-{i}", title="Job", description="Fix sink", amount=1000.0 * (i + 1),
+            provider_id="provider-1", customer_id="customer-1",
+            created_at=created_at, updated_at=created_at
+        )
+        db.add(job)
+        stats.record_job_created(job)
+        jobs.append(job)
+    db.commit()
+
+    for job in jobs[:2]:
+        job.status, job.completed_at = "completed", now
+        stats.record_job_status_change(job, "pending")
+    db.commit()
+
+    review = Review(
+        id="review-1", job_id="job-0", provider_id="provider-1", customer_id="customer-1",
+        rating=4.0, comment="Good", created_at=now
+    )
+    db.add(review)
+    stats.record_review_created(review)
+    review.rating = 5.0
+    stats.record_review_updated(review, 4.0)
+
+    payment = Payment(
+        id="payment-1", amount=1000.0, payment_method="card",
+        user_id="customer-1", job_id="job-0", created_at=now
+    )
+    db.add(payment)
+    stats.record_payment_status_change(payment, None)
+    payment.status = "completed"
+    stats.record_payment_status_change(payment, "pending")
+    db.commit()
+
+    incremental, response_hours = _snapshot(db), _response_hours(db)
+    stats.rebuild()
+    assert _snapshot(db) == incremental
+    assert _response_hours(db) == pytest.approx(response_hours, abs=1e-6)
+    totals = db.query(ProviderDailyStats).all()
+    assert sum(row.booking_count for row in totals) == 3
+    assert sum(row.completed_revenue for row in totals) == 3000.0
+    assert sum(row.paid_amount for row in totals) == 1000.0
+    assert sum(row.pending_amount for row in totals) == 0.0
+
+def test_response_time_is_the_first_move_off_pending(db):
+    _seed_provider(db)
+    stats = ProviderDailyStatsService(db)
+    created_at = datetime.utcnow() - timedelta(hours=6)
+    jobs = [
+        Job(
+            id=f"job-{i}", title="Job", description="Fix sink", amount=1000.0,
+            provider_id="provider-1", customer_id="customer-1",
+            created_at=created_at, updated_at=created_at
+        )
+        for i in range(2)
+    ]
+    for job in jobs:
+        db.add(job)
+        stats.record_job_created(job)
+    db.commit()
+
+    def move(job, status, updated_at):
+        old_status, job.status = job.status, status
+        stats.record_job_status_change(job, old_status)
+        # Later edits move updated_at but not the response
+        job.updated_at = updated_at
+        db.commit()
+
+    move(jobs[0], "in_progress", created_at + timedelta(hours=1))
+    jobs[0].completed_at = created_at + timedelta(hours=5)
+    move(jobs[0], "completed", jobs[0].completed_at)
+    responded_at = jobs[0].responded_at
+    # A job sent back to pending takes its response out again, whatever its updated_at
+    move(jobs[1], "accepted", created_at + timedelta(hours=2))
+    move(jobs[1], "pending", created_at + timedelta(hours=4))
+    assert jobs[1].responded_at is None
+
+    incremental, response_hours = _snapshot(db), _response_hours(db)
+    row = db.query(ProviderDailyStats).filter(ProviderDailyStats.day == created_at.date()).one()
+    assert row.response_count == 1
+    assert row.response_time_sum == pytest.approx((responded_at - created_at).total_seconds() / 3600)
+    stats.rebuild()
+    assert _snapshot(db) == incremental
+    assert _response_hours(db) == pytest.approx(response_hours, abs=1e-6)
@@ -0,0 +1,137 @@
+import random
+from datetime import timedelta
+
+from sqlalchemy import update
+
+from app.models.provider import Provider
+from app.models.user import User
+from app.services.provider_search_service import ProviderSearchService
+from app.services.provider_geo_service import ProviderGeoIndex, ProviderGeoService, geo_index
+from app.utils.geo import GridIndex, distance_km, geohash_encode
+
+IKEJA = (6.6018, 3.3515)
+
+PROVIDERS = [
+    # name, (lat, lng), categories, verified
+    ("Allen Pipes", (6.6010, 3.3540), ["Plumbing"], True),
+    ("Opebi Flow", (6.5890, 3.3630), ["Plumbing"], True),
+    ("Ogba Drains", (6.6300, 3.3400), ["Plumbing"], False),
+    ("Ikeja Volts", (6.6030, 3.3500), ["Electrical Repairs"], True),
+    ("Yaba Pipes", (6.5095, 3.3711), ["Plumbing"], True),  # ~10 km away
+    ("No Address Plumbing", None, ["Plumbing"], True),
+]
+
+def _seed(db):
+    for i, (name, location, categories, verified) in enumerate(PROVIDERS):
+        db.add(User(id=f"user-{i}", email=f"user{i}@example.com", hashed_password="x"))
+        db.add(Provider(
+            id=f"provider-{i}", user_id=f"user-{i}", business_name=name,
+            business_address="Lagos", business_phone="+2348012345678",
+            business_email=f"provider{i}@example.com", business_description="",
+            service_categories=categories, service_areas=["Ikeja"], availability="{}",
+            latitude=location[0] if location else None,
+            longitude=location[1] if location else None, is_verified=verified
+        ))
+    db.commit()
+    # The database path filters categories through the search token index
+    ProviderSearchService(db).rebuild()
+
+def _names(results):
+    return [provider.business_name for _, provider in results]
+
+def test_geohash_encode():
+    assert geohash_encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+    assert geohash_encode(*IKEJA, 5) == geohash_encode(6.6010, 3.3540, 5)
+
+def test_grid_matches_brute_force():
+    rng = random.Random(7)
+    grid = GridIndex()
+    points = {}
+    for i in range(2000):
+        point = (6.5 + rng.random() * 0.2, 3.3 + rng.random() * 0.2)
+        points[i] = point
+        grid.add(i, *point, tags={"even"} if i % 2 == 0 else set())
+    for _ in range(20):
+        lat, lon = 6.5 + rng.random() * 0.2, 3.3 + rng.random() * 0.2
+        for tags in (set(), {"even"}):
+            expected = sorted(
+                (distance_km(lat, lon, *point), key) for key, point in points.items()
+                if distance_km(lat, lon, *point) <= 3 and (not tags or key % 2 == 0)
+            )[:7]
+            found = grid.nearest(lat, lon, 7, 3, tags)
+            assert [key for _, key in found] == [key for _, key in expected]
+            assert [round(d, 9) for d, _ in found] == [round(d, 9) for d, _ in expected]
+
+    grid.remove(0)
+    assert 0 not in {key for _, key in grid.nearest(*points[0], 1, 1)}
+
+def test_index_and_database_agree(db):
+    _seed(db)
+    service = ProviderGeoService(db, index=ProviderGeoIndex())
+    for kwargs in ({}, {"category": "plumbing"}, {"category": "plumbing", "verified": True}, {"k": 2}):
+        from_index = service.nearby(*IKEJA, use_index=True, **kwargs)
+        from_db = service.nearby(*IKEJA, use_index=False, **kwargs)
+        assert _names(from_index) == _names(from_db)
+        assert [round(d, 6) for d, _ in from_index] == [round(d, 6) for d, _ in from_db]
+
+    results = service.nearby(*IKEJA, category="plumbing", verified=True, radius_km=5, use_index=True)
+    assert _names(results) == ["Allen Pipes", "Opebi Flow"]
+    assert _names(service.nearby(*IKEJA, category="plumbing", radius_km=15, use_index=False))[-1] == "Yaba Pipes"
+
+def test_index_refresh_follows_changes(db):
+    _seed(db)
+    index = ProviderGeoIndex(refresh_seconds=3600)
+    service = ProviderGeoService(db, index=index)
+    assert _names(service.nearby(*IKEJA, k=2, use_index=True)) == ["Ikeja Volts", "Allen Pipes"]
+    assert len(index) == 5
+
+    db.execute(update(Provider).filter(Provider.id == "provider-1").values(latitude=IKEJA[0], longitude=IKEJA[1]))
+    db.execute(update(Provider).filter(Provider.id == "provider-3").values(latitude=None, longitude=None))
+    db.commit()
+    # Not picked up until the refresh interval has passed
+    assert _names(service.nearby(*IKEJA, k=2, use_index=True)) == ["Ikeja Volts", "Allen Pipes"]
+    index.refresh(db, force=True)
+    assert _names(service.nearby(*IKEJA, k=2, use_index=True)) == ["Opebi Flow", "Allen Pipes"]
+
+    db.query(Provider).filter(Provider.id == "provider-1").delete()
+    db.commit()
+    assert _names(service.nearby(*IKEJA, k=2, use_index=True)) == ["Allen Pipes", "Ogba Drains"]
+    assert len(index) == 3
+
+def test_rows_committed_behind_the_watermark_are_picked_up(db):
+    _seed(db)
+    lagging = ProviderGeoIndex(refresh_seconds=3600, rebuild_seconds=3600, lag_seconds=60)
+    strict = ProviderGeoIndex(refresh_seconds=3600, rebuild_seconds=3600, lag_seconds=0)
+    for index in (lagging, strict):
+        index.refresh(db)
+        assert _names(ProviderGeoService(db, index=index).nearby(*IKEJA, k=1, use_index=True)) == ["Ikeja Volts"]
+
+    # Stamped at flush before the newest row already read, committed after it
+    db.execute(update(Provider).filter(Provider.id == "provider-1").values(
+        latitude=IKEJA[0], longitude=IKEJA[1], updated_at=lagging.watermark - timedelta(seconds=10)
+    ))
+    db.commit()
+    for index in (lagging, strict):
+        index.refresh(db, force=True)
+    assert _names(ProviderGeoService(db, index=lagging).nearby(*IKEJA, k=1, use_index=True)) == ["Opebi Flow"]
+    assert _names(ProviderGeoService(db, index=strict).nearby(*IKEJA, k=1, use_index=True)) == ["Ikeja Volts"]
+
+    # Past the margin, the periodic reload still catches it
+    strict.rebuilt_at -= 3600
+    strict.refresh(db, force=True)
+    assert _names(ProviderGeoService(db, index=strict).nearby(*IKEJA, k=1, use_index=True)) == ["Opebi Flow"]
+
+def test_nearby_endpoint(client, db):
+    _seed(db)
+    geo_index.clear()
+    response = client.get("/api/v1/providers/nearby", params={
+        "lat": IKEJA[0], "lng": IKEJA[1], "category": "plumbing", "verified": True, "k": 5
+    })
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert [item["business_name"] for item in items] == ["Allen Pipes", "Opebi Flow"]
+    assert items[0]["distance_km"] < items[1]["distance_km"] < 5
+    assert items[0]["latitude"] == 6.6010
+
+    assert client.get("/api/v1/providers/nearby", params={"lat": 100, "lng": 3.3}).status_code == 422
+    geo_index.clear()
@@ -0,0 +1,109 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import update
+from sqlalchemy.orm import sessionmaker
+
+from app.models.job import Job
+from app.models.provider import Provider
+from app.models.user import User
+from app.schemas.review import ReviewCreate, ReviewUpdate
+from app.services.analytics_service import AnalyticsService
+from app.services.provider_rating_service import ProviderRatingService, histogram
+from app.services.provider_service import ProviderService
+from app.services.review_service import ReviewService
+from tests.conftest import TestingAsyncSessionLocal
+
+def _seed(db, jobs=50):
+    db.add(User(id="provider-user", email="provider@example.com", hashed_password="x"))
+    db.add(User(id="customer-1", email="customer@example.com", hashed_password="x", full_name="Ada"))
+    db.add(Provider(
+        id="provider-1", user_id="provider-user", business_name="Ikeja Pipes",
+        business_address="Ikeja", business_phone="+2348012345678",
+        business_email="pipes@example.com", business_description="",
+        service_categories=["Plumbing"], service_areas=["Ikeja"], availability="{}"
+    ))
+    db.add_all([
+        Job(id=f"job-{i}", title="Job", description="Fix sink", amount=1000.0,
+            service_type="plumbing", provider_id="provider-1", customer_id="customer-1")
+        for i in range(jobs)
+    ])
+    db.commit()
+
+def _aggregates(db):
+    db.expire_all()
+    provider = db.get(Provider, "provider-1")
+    return provider.total_reviews, provider.rating_sum, round(provider.rating, 6), histogram(provider)
+
+def test_review_writes_keep_aggregates(db):
+    _seed(db)
+    reviews = ReviewService(db)
+    first = reviews.create_review(ReviewCreate(job_id="job-0", rating=5, comment="Great"), "customer-1")
+    second = reviews.create_review(ReviewCreate(job_id="job-1", rating=3, comment="Fine"), "customer-1")
+    reviews.create_review(ReviewCreate(job_id="job-2", rating=4, comment="Good"), "customer-1")
+    assert _aggregates(db) == (3, 12.0, 4.0, {1: 0, 2: 0, 3: 1, 4: 1, 5: 1})
+
+    reviews.update_review(second.id, ReviewUpdate(rating=1))
+    assert _aggregates(db) == (3, 10.0, round(10 / 3, 6), {1: 1, 2: 0, 3: 0, 4: 1, 5: 1})
+    # Changing only the comment leaves the aggregates alone
+    reviews.update_review(first.id, ReviewUpdate(comment="Still great"))
+    assert _aggregates(db)[0:2] == (3, 10.0)
+
+    reviews.delete_review(first.id)
+    incremental = _aggregates(db)
+    assert incremental == (2, 5.0, 2.5, {1: 1, 2: 0, 3: 0, 4: 1, 5: 0})
+
+    # The running totals match a recomputation from the reviews table
+    ProviderRatingService(db).rebuild()
+    assert _aggregates(db) == incremental
+
+    for review in [r for r in db.get(Provider, "provider-1").reviews]:
+        reviews.delete_review(review.id)
+    assert _aggregates(db) == (0, 0.0, 0.0, {star: 0 for star in range(1, 6)})
+
+def test_concurrent_reviews_are_all_counted(db):
+    _seed(db, jobs=40)
+    Session = sessionmaker(bind=db.get_bind())
+
+    def review(i):
+        session = Session()
+        try:
+            ReviewService(session).create_review(
+                ReviewCreate(job_id=f"job-{i}", rating=1 + i % 5, comment="Ok"), "customer-1"
+            )
+        finally:
+            session.close()
+
+    with ThreadPoolExecutor(max_workers=20) as pool:
+        list(pool.map(review, range(40)))
+    assert _aggregates(db) == (40, 120.0, 3.0, {star: 8 for star in range(1, 6)})
+
+def test_concurrent_update_rating_loses_nothing(db):
+    _seed(db, jobs=0)
+
+    async def rate(value):
+        async with TestingAsyncSessionLocal() as session:
+            await ProviderService(session).update_rating("provider-1", value)
+
+    async def burst():
+        await asyncio.gather(*(rate(1 + i % 5) for i in range(25)))
+
+    asyncio.run(burst())
+    assert _aggregates(db) == (25, 75.0, 3.0, {star: 5 for star in range(1, 6)})
+
+def test_distributions_read_provider_columns(db):
+    _seed(db, jobs=0)
+    # No review rows at all: whatever is reported comes from the provider
+    db.execute(update(Provider).values(
+        total_reviews=6, rating_sum=24.0, rating=4.0, rating_3_count=2, rating_5_count=4
+    ))
+    db.commit()
+
+    expected = [(3, 2), (5, 4)]
+    analytics = asyncio.run(AnalyticsService(db).get_provider_analytics("provider-1"))
+    assert [(d.rating, d.count) for d in analytics.rating_distribution] == expected
+
+    stats = asyncio.run(ReviewService(db).get_provider_reviews("provider-1"))
+    assert (stats.total_reviews, stats.average_rating) == (6, 4.0)
+    assert [(d.rating, d.count) for d in stats.rating_distribution] == expected
+    assert stats.recent_reviews == []
@@ -0,0 +1,114 @@
+import asyncio
+
+from sqlalchemy import select, update
+
+from app.models.provider import Provider
+from app.models.provider_search_token import ProviderSearchToken
+from app.models.user import User
+from app.schemas.provider import ProviderCreate, ProviderUpdate
+from app.services.provider_search_service import ProviderSearchService
+from app.services.provider_service import ProviderService
+from tests.conftest import TestingAsyncSessionLocal
+
+PROVIDERS = [
+    # name, categories, areas, verified, rating
+    ("Ikeja Pipes", ["Plumbing"], ["Ikeja", "Victoria Island"], True, 4.8),
+    ("Lekki Sparks", ["Electrical Repairs"], ["Lekki"], True, 4.5),
+    ("Ikeja Volts", ["Electrical Repairs", "Plumbing"], ["Ikeja"], False, 3.9),
+    ("Abuja Flow", ["Plumbing"], ["Wuse"], True, 4.1),
+]
+
+def _run(coro):
+    return asyncio.run(coro)
+
+async def _with_service(action):
+    async with TestingAsyncSessionLocal() as session:
+        return await action(ProviderService(session))
+
+def _create_providers(db):
+    for i in range(len(PROVIDERS)):
+        db.add(User(id=f"user-{i}", email=f"user{i}@example.com", hashed_password="x"))
+    db.commit()
+
+    ids = {}
+    for i, (name, categories, areas, verified, rating) in enumerate(PROVIDERS):
+        provider = _run(_with_service(lambda service: service.create_provider(ProviderCreate(
+            business_name=name, business_address="Lagos", business_phone="+2348012345678",
+            business_email=f"provider{i}@example.com", service_categories=categories,
+            service_areas=areas
+        ), f"user-{i}")))
+        ids[name] = provider.id
+        # Verification and rating are not part of the submitted profile
+        db.execute(update(Provider).filter(Provider.id == provider.id).values(
+            is_verified=verified, rating=rating
+        ))
+        db.commit()
+    return ids
+
+def _names(response):
+    return [item["business_name"] for item in response.json()["items"]]
+
+def test_search_filters_and_paginates(client, db):
+    _create_providers(db)
+
+    response = client.get("/api/v1/providers/search", params={"q": "plumbing ikeja"})
+    assert response.status_code == 200
+    assert _names(response) == ["Ikeja Pipes", "Ikeja Volts"]
+    assert response.json()["total"] == 2
+
+    # The last word is matched as a prefix
+    assert _names(client.get("/api/v1/providers/search", params={"q": "ikeja elec"})) == ["Ikeja Volts"]
+    assert _names(client.get("/api/v1/providers/search", params={"area": "victoria island"})) == ["Ikeja Pipes"]
+    assert _names(client.get("/api/v1/providers/search", params={
+        "category": "plumbing", "verified": True, "min_rating": 4.5
+    })) == ["Ikeja Pipes"]
+    # "Plumbing" is a category, not an area
+    assert _names(client.get("/api/v1/providers/search", params={"area": "plumbing"})) == []
+    # Filters match whole values: one word of "Electrical Repairs" is not enough
+    assert _names(client.get("/api/v1/providers/search", params={"category": "electrical"})) == []
+    assert _names(client.get("/api/v1/providers/search", params={"area": "island"})) == []
+    assert _names(client.get("/api/v1/providers/search", params={"category": "Electrical  repairs"})) == [
+        "Lekki Sparks", "Ikeja Volts"
+    ]
+    # ...while q still matches single words
+    assert _names(client.get("/api/v1/providers/search", params={"q": "island"})) == ["Ikeja Pipes"]
+
+    first = client.get("/api/v1/providers/search", params={"page_size": 3}).json()
+    second = client.get("/api/v1/providers/search", params={"page_size": 3, "page": 2}).json()
+    assert first["total"] == second["total"] == 4
+    assert [p["business_name"] for p in first["items"] + second["items"]] == [
+        "Ikeja Pipes", "Lekki Sparks", "Abuja Flow", "Ikeja Volts"
+    ]
+
+def test_index_follows_provider_updates(client, db):
+    ids = _create_providers(db)
+    provider_id = ids["Abuja Flow"]
+
+    _run(_with_service(lambda service: service.update_provider(
+        provider_id, ProviderUpdate(service_areas=["Garki"])
+    )))
+    assert _names(client.get("/api/v1/providers/search", params={"area": "wuse"})) == []
+    assert _names(client.get("/api/v1/providers/search", params={"area": "garki"})) == ["Abuja Flow"]
+
+    _run(_with_service(lambda service: service.delete_provider(provider_id)))
+    assert db.scalar(select(ProviderSearchToken).filter(
+        ProviderSearchToken.provider_id == provider_id
+    )) is None
+
+    # A rebuild produces the same index the incremental updates left behind
+    tokens = lambda: sorted(db.execute(select(
+        ProviderSearchToken.token, ProviderSearchToken.kind, ProviderSearchToken.provider_id
+    )).all())
+    incremental = tokens()
+    assert ProviderSearchService(db).rebuild() == 3
+    assert tokens() == incremental
+
+def test_search_uses_token_index(db):
+    _create_providers(db)
+    statement = ProviderSearchService(db)._matching("plumbing", kind="category_exact")
+    compiled = statement.compile(db.get_bind())
+    with db.get_bind().connect() as conn:
+        plan = conn.exec_driver_sql(
+            f"EXPLAIN QUERY PLAN {compiled}", tuple(compiled.params.values())
+        ).all()
+    assert all(not row.detail.startswith("SCAN") for row in plan), plan
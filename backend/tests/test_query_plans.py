@@ -0,0 +1,145 @@
+import asyncio
+import re
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event, insert
+
+from app.auth.auth import get_current_user
+from app.database import Base
+from app.main import app
+from app.models.booking import Booking
+from app.models.job import Job
+from app.models.notification import Notification
+from app.models.payment import Payment
+from app.models.provider import Provider
+from app.models.review import Review
+from app.models.service import Service
+from app.models.user import User
+from app.services.analytics_service import AnalyticsService
+from app.services.earnings_service import EarningsService
+from app.services.job_service import JobService
+from app.services.notification_service import NotificationService
+from app.services.provider_stats_service import ProviderDailyStatsService
+from tests.conftest import TestingAsyncSessionLocal, async_engine
+
+PROVIDERS = 5
+ROWS_PER_PROVIDER = 40
+
+# "SCAN <table>" is SQLite's full table (or full index) scan; index lookups
+# are reported as "SEARCH <table> USING ..."
+FULL_SCAN = re.compile(r"^SCAN (\w+)")
+
+def seed(db):
+    now = datetime.utcnow()
+    users, providers, services = [], [], []
+    jobs, reviews, payments, bookings, notifications = [], [], [], [], []
+    for p in range(PROVIDERS):
+        users.append({"id": f"provider-user-{p}", "email": f"provider{p}@example.com",
+                      "hashed_password": "x", "full_name": f"Provider {p}", "role": "PROVIDER"})
+        users.append({"id": f"customer-{p}", "email": f"customer{p}@example.com",
+                      "hashed_password": "x", "full_name": f"Customer {p}"})
+        providers.append({
+            "id": f"provider-{p}", "user_id": f"provider-user-{p}", "business_name": f"Provider {p}",
+            "business_address": "Ikeja", "business_phone": "+2348012345678",
+            "business_email": f"provider{p}@example.com", "business_description": "Plumbing",
+            "service_categories": ["plumbing"], "service_areas": ["Ikeja"], "availability": "{}"
+        })
+        services.append({"id": f"service-{p}", "name": "Plumbing", "description": "Pipes",
+                         "price": 5000.0, "duration": "01:00", "provider_id": f"provider-{p}"})
+        for i in range(ROWS_PER_PROVIDER):
+            created_at = now - timedelta(days=i)
+            key = f"{p}-{i}"
+            jobs.append({
+                "id": f"job-{key}", "title": "Job", "description": "Fix sink",
+                "status": ("pending", "completed", "cancelled")[i % 3], "service_type": "plumbing",
+                "amount": 1000.0 + i, "provider_id": f"provider-{p}", "customer_id": f"customer-{p}",
+                "created_at": created_at, "updated_at": created_at,
+                "completed_at": created_at if i % 3 == 1 else None
+            })
+            reviews.append({
+                "id": f"review-{key}", "job_id": f"job-{key}", "provider_id": f"provider-{p}",
+                "customer_id": f"customer-{p}", "rating": float(i % 5 + 1), "comment": "Good",
+                "created_at": created_at
+            })
+            payments.append({
+                "id": f"payment-{key}", "amount": 1000.0 + i, "payment_method": "card",
+                "status": ("pending", "completed")[i % 2], "user_id": f"customer-{p}",
+                "job_id": f"job-{key}", "created_at": created_at, "updated_at": created_at
+            })
+            bookings.append({
+                "id": f"booking-{key}", "service_id": f"service-{p}", "provider_id": f"provider-user-{p}",
+                "customer_id": f"customer-{p}", "date": created_at, "time": "10:00", "status": "pending",
+                "created_at": created_at, "updated_at": created_at
+            })
+            notifications.append({
+                "user_id": f"customer-{p}", "title": "Update", "message": "Job updated",
+                "type": "job_request", "is_read": i % 2 == 0, "created_at": created_at
+            })
+    for model, rows in ((User, users), (Provider, providers), (Service, services), (Job, jobs),
+                        (Review, reviews), (Payment, payments), (Booking, bookings),
+                        (Notification, notifications)):
+        db.execute(insert(model), rows)
+    db.commit()
+    ProviderDailyStatsService(db).rebuild()
+
+@contextmanager
+def capture_statements(*engines):
+    """Collect every SELECT/UPDATE issued on the given engines."""
+    statements = []
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(("SELECT", "UPDATE")):
+            statements.append((statement, parameters))
+
+    for target in engines:
+        event.listen(target, "before_cursor_execute", on_execute)
+    try:
+        yield statements
+    finally:
+        for target in engines:
+            event.remove(target, "before_cursor_execute", on_execute)
+
+def full_scans(engine, statements):
+    tables = set(Base.metadata.tables)
+    scans = []
+    with engine.connect() as conn:
+        for statement, parameters in statements:
+            for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters):
+                match = FULL_SCAN.match(row.detail)
+                if match and match.group(1) in tables:
+                    scans.append((row.detail, statement))
+    return scans
+
+async def run_async_services():
+    async with TestingAsyncSessionLocal() as session:
+        jobs = JobService(session)
+        await jobs.get_provider_jobs("provider-0")
+        await jobs.get_customer_jobs("customer-0")
+        notifications = NotificationService(session)
+        await notifications.get_user_notifications("customer-0")
+        await notifications.get_notifications_after("customer-0", 0, 100)
+        await notifications.mark_all_as_read("customer-0")
+
+@pytest.fixture
+def as_user(client):
+    def login(user_id, role):
+        user = User(id=user_id, email=f"{user_id}@example.com", hashed_password="x", role=role)
+        app.dependency_overrides[get_current_user] = lambda: user
+    return login
+
+def test_hot_queries_use_indexes(db, client, as_user):
+    seed(db)
+    with capture_statements(db.get_bind(), async_engine.sync_engine) as statements:
+        asyncio.run(AnalyticsService(db).get_provider_analytics("provider-0"))
+        asyncio.run(EarningsService(db).get_provider_earnings("provider-0", "year"))
+        asyncio.run(run_async_services())
+        as_user("customer-0", "user")
+        assert client.get("/api/v1/payments/").status_code == 200
+        assert client.get("/api/v1/bookings/").status_code == 200
+        as_user("provider-user-0", "provider")
+        assert client.get("/api/v1/bookings/").status_code == 200
+
+    assert len(statements) > 10
+    assert full_scans(db.get_bind(), statements) == []
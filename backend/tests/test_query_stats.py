@@ -0,0 +1,71 @@
+import logging
+
+import pytest
+
+from app.auth.auth import get_current_user
+from app.core import query_stats
+from app.main import app
+from app.models.job import Job
+from app.models.notification import Notification
+from app.models.payment import Payment
+from app.models.provider import Provider
+from app.models.user import User
+from app.services.analytics_service import AnalyticsService
+
+@pytest.fixture
+def provider_with_jobs(db):
+    db.add(User(id="provider-user", email="provider@example.com", hashed_password="x"))
+    db.add(Provider(
+        id="provider-1", user_id="provider-user", business_name="Test Provider",
+        business_address="Ikeja", business_phone="+2348012345678",
+        business_email="provider@example.com", business_description="Plumbing",
+        service_categories=["plumbing"], service_areas=["Ikeja"], availability="{}"
+    ))
+    for i in range(12):
+        db.add(User(id=f"customer-{i}", email=f"customer{i}@example.com",
+                    hashed_password="x", full_name=f"Customer {i}"))
+        db.add(Job(id=f"job-{i}", title="Job", description="Fix sink", amount=1000.0,
+                   provider_id="provider-1", customer_id=f"customer-{i}"))
+    db.commit()
+    db.expunge_all()
+
+def test_lazy_loading_loop_is_reported(db, provider_with_jobs, caplog):
+    with caplog.at_level(logging.WARNING, logger="app.core.query_stats"):
+        with query_stats.track("lazy customers", n_plus_one_threshold=5) as stats:
+            names = [job.customer.full_name for job in db.query(Job).all()]
+    assert len(names) == 12
+    assert stats.queries == 13
+    assert "Possible N+1 in lazy customers: statement ran 12 times" in caplog.text
+
+def test_recent_activity_loads_customers_up_front(db, provider_with_jobs, caplog):
+    with caplog.at_level(logging.WARNING, logger="app.core.query_stats"):
+        with query_stats.track("recent activity", n_plus_one_threshold=2) as stats:
+            activity = AnalyticsService(db)._recent_activity("provider-1")
+    assert len(activity) == 5
+    assert stats.queries == 2
+    assert "Possible N+1" not in caplog.text
+
+def test_server_timing_and_endpoint_totals(client, db, assert_query_budget):
+    user = User(id="user-1", email="user@example.com", hashed_password="x", is_active=True)
+    db.add(User(id=user.id, email=user.email, hashed_password="x"))
+    db.add(Payment(id="payment-1", amount=5000, payment_method="card", user_id=user.id))
+    db.add(Notification(user_id=user.id, title="Paid", message="Payment received", type="payment"))
+    db.commit()
+    app.dependency_overrides[get_current_user] = lambda: user
+    query_stats.reset()
+
+    payments = client.get("/api/v1/payments/")
+    assert payments.status_code == 200
+    assert query_stats.parse_server_timing(payments.headers["Server-Timing"])["queries"] == 1
+    assert_query_budget(payments, 1)
+
+    # Statements on the async engine count against the request too
+    notifications = client.get("/api/v1/notifications")
+    assert notifications.status_code == 200
+    assert_query_budget(notifications, 1)
+    assert query_stats.parse_server_timing(notifications.headers["Server-Timing"])["queries"] == 1
+
+    endpoints = {s["endpoint"]: s for s in query_stats.endpoint_snapshots()}
+    assert endpoints["GET /api/v1/payments/"]["requests"] == 1
+    assert endpoints["GET /api/v1/payments/"]["queries"] == 1
+    assert endpoints["GET /api/v1/notifications"]["queries"] == 1
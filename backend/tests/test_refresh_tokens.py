@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.config import settings
+from app.models import RefreshToken
+from app.models.user import User
+from app.schemas.user import UserUpdate
+from app.services.refresh_token_service import RefreshTokenService, hash_refresh_token
+from app.services.user_service import UserService
+from app.utils.password import get_password_hash
+
+@pytest.fixture
+def login(client, db, monkeypatch):
+    monkeypatch.setattr(settings, "SECURITY_BCRYPT_ROUNDS", 4)
+    db.add(User(id="user-1", email="ada@example.com", hashed_password=get_password_hash("correct horse"), full_name="Ada"))
+    db.commit()
+
+    def log_in():
+        response = client.post("/api/v1/auth/token", json={"email": "ada@example.com", "password": "correct horse"})
+        assert response.status_code == 200
+        return response.json()
+    return log_in
+
+def test_refresh_rotates_without_the_password(client, db, login, assert_query_budget, monkeypatch):
+    tokens = login()
+    assert tokens["refresh_token"]
+    # Only the HMAC is stored
+    assert db.get(RefreshToken, tokens["refresh_token"]) is None
+    assert db.get(RefreshToken, hash_refresh_token(tokens["refresh_token"])).user_id == "user-1"
+
+    def no_bcrypt(*args):
+        raise AssertionError("refresh must not hash a password")
+    monkeypatch.setattr("app.core.password_hasher.verify_password", no_bcrypt)
+
+    response = client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 200
+    renewed = response.json()
+    assert renewed["refresh_token"] != tokens["refresh_token"]
+    # Lookup, mark used, insert the next token
+    assert_query_budget(response, 3)
+    me = client.get("/api/v1/users/me", headers={"Authorization": f"Bearer {renewed['access_token']}"})
+    assert me.json()["id"] == "user-1"
+
+def test_reusing_a_token_revokes_its_family(client, db, login):
+    first = login()
+    other_device = login()
+    second = client.post("/api/v1/auth/refresh", json={"refresh_token": first["refresh_token"]}).json()
+
+    replay = client.post("/api/v1/auth/refresh", json={"refresh_token": first["refresh_token"]})
+    assert replay.status_code == 401
+    # The rotated token was revoked along with it, the other login was not
+    assert client.post("/api/v1/auth/refresh", json={"refresh_token": second["refresh_token"]}).status_code == 401
+    assert client.post("/api/v1/auth/refresh", json={"refresh_token": other_device["refresh_token"]}).status_code == 200
+
+def test_expired_unknown_and_logged_out_tokens_are_refused(client, db, login):
+    tokens = login()
+    assert client.post("/api/v1/auth/refresh", json={"refresh_token": "made-up"}).status_code == 401
+
+    stored = db.get(RefreshToken, hash_refresh_token(tokens["refresh_token"]))
+    stored.expires_at = datetime.utcnow() - timedelta(seconds=1)
+    db.commit()
+    assert client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]}).status_code == 401
+    assert RefreshTokenService(db).purge_expired() == 1
+
+    assert client.post("/api/v1/auth/logout", json={}).status_code == 200
+    tokens = login()
+    assert client.post("/api/v1/auth/logout", json={"refresh_token": tokens["refresh_token"]}).status_code == 200
+    assert client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]}).status_code == 401
+
+def test_password_change_and_deactivation_end_sessions(client, db, login):
+    tokens = login()
+    UserService(db).update_user("user-1", UserUpdate(is_active=False))
+    assert client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]}).status_code == 401
+
+    UserService(db).update_user("user-1", UserUpdate(is_active=True))
+    tokens = login()
+    UserService(db).update_user("user-1", UserUpdate(password="battery staple"))
+    assert client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]}).status_code == 401
@@ -0,0 +1,61 @@
+import pytest
+
+from app.auth.auth import get_current_user
+from app.core.db_router import ReplicaRouter
+from app import database
+from app.database import get_read_db
+from app.main import app
+from app.models.payment import Payment
+from app.models.user import User
+from tests.conftest import TestingReplicaSessionLocal, TestingSessionLocal, replica_engine
+
+@pytest.fixture
+def routed_client(client, db, replica_db, monkeypatch):
+    """Client whose read-only endpoints go through the real get_read_db,
+    routed by a ReplicaRouter over the test databases."""
+    router = ReplicaRouter(replica_engine, check_interval=0)
+    monkeypatch.setattr(database, "replica_router", router)
+    monkeypatch.setattr(database, "ReplicaSessionLocal", TestingReplicaSessionLocal)
+    monkeypatch.setattr(database, "SessionLocal", TestingSessionLocal)
+    user = User(id="user-1", email="user@example.com", hashed_password="x")
+    for session in (db, replica_db):
+        session.add(User(id=user.id, email=user.email, hashed_password="x"))
+        session.commit()
+
+    app.dependency_overrides.pop(get_read_db)
+    app.dependency_overrides[get_current_user] = lambda: user
+    return client, router
+
+def _add_payment(session, payment_id):
+    session.add(Payment(id=payment_id, amount=5000, payment_method="card", user_id="user-1"))
+    session.commit()
+
+def test_listing_reads_from_replica(routed_client, db, replica_db):
+    client, router = routed_client
+    _add_payment(db, "on-primary")
+    _add_payment(replica_db, "on-replica")
+
+    response = client.get("/api/v1/payments/")
+    assert response.status_code == 200
+    assert [p["id"] for p in response.json()] == ["on-replica"]
+    assert router.lag == 0.0
+
+def test_lagging_replica_falls_back_to_primary(routed_client, db, replica_db):
+    client, router = routed_client
+    router.lag_probe = lambda connection: router.max_lag + 1
+    _add_payment(db, "on-primary")
+    _add_payment(replica_db, "on-replica")
+
+    response = client.get("/api/v1/payments/")
+    assert [p["id"] for p in response.json()] == ["on-primary"]
+
+def test_unreachable_replica_falls_back_to_primary():
+    def broken_probe(connection):
+        raise ConnectionError("replica down")
+
+    router = ReplicaRouter(replica_engine, check_interval=60, lag_probe=broken_probe)
+    assert router.use_replica() is False
+    # The failed reading is cached until the check interval passes
+    router.lag_probe = lambda connection: 0.0
+    assert router.use_replica() is False
+    assert ReplicaRouter().use_replica() is False
@@ -0,0 +1,72 @@
+import asyncio
+import json
+
+from sqlalchemy import event
+
+from app.core.slow_query_log import SlowQueryRecorder
+from app.models.job import Job
+from app.models.provider import Provider
+from app.models.user import User
+from app.services.analytics_service import AnalyticsService
+from app.services.job_service import JobService
+from tests.conftest import TestingAsyncSessionLocal, async_engine
+
+def _seed(db):
+    db.add(User(id="customer-1", email="customer@example.com", hashed_password="x", full_name="Ada"))
+    db.add(Provider(
+        id="provider-1", user_id="customer-1", business_name="Test Provider",
+        business_address="Ikeja", business_phone="+2348012345678",
+        business_email="test@example.com", business_description="Plumbing",
+        service_categories=["plumbing"], service_areas=["Ikeja"], availability="{}"
+    ))
+    db.add(Job(id="job-1", title="Job", description="Fix sink", amount=1000.0, service_type="plumbing",
+               provider_id="provider-1", customer_id="customer-1"))
+    db.commit()
+
+def _detach(recorder, *engines):
+    for engine in engines:
+        event.remove(engine, "before_cursor_execute", recorder._before_cursor_execute)
+        event.remove(engine, "after_cursor_execute", recorder._after_cursor_execute)
+
+def test_records_caller_and_plan(db, tmp_path):
+    _seed(db)
+    log_file = tmp_path / "slow.log"
+    recorder = SlowQueryRecorder(threshold_ms=0, log_file=str(log_file))
+    engines = (db.get_bind(), async_engine.sync_engine)
+    for engine in engines:
+        recorder.attach(engine)
+    try:
+        asyncio.run(AnalyticsService(db).get_provider_analytics("provider-1"))
+
+        async def provider_jobs():
+            async with TestingAsyncSessionLocal() as session:
+                return await JobService(session).get_provider_jobs("provider-1")
+        assert len(asyncio.run(provider_jobs())) == 1
+    finally:
+        _detach(recorder, *engines)
+
+    ranked = recorder.ranked()
+    assert [s["total_ms"] for s in ranked] == sorted((s["total_ms"] for s in ranked), reverse=True)
+    callers = {caller for s in ranked for caller in s["callers"]}
+    assert "AnalyticsService._scalar_stats" in callers
+    assert "AnalyticsService._recent_activity" in callers
+    # Found through the awaiting coroutine chain rather than the greenlet stack
+    assert "JobService.get_provider_jobs" in callers
+
+    job_lookup = next(s for s in ranked if "JobService.get_provider_jobs" in s["callers"])
+    assert "USING INDEX ix_jobs_provider_" in job_lookup["last_plan"]
+    assert "provider-1" in job_lookup["last_parameters"]
+
+    lines = [json.loads(line) for line in log_file.read_text().splitlines()]
+    assert len(lines) == sum(s["count"] for s in ranked)
+    assert {"timestamp", "duration_ms", "caller", "statement", "parameters", "plan"} <= set(lines[0])
+
+def test_fast_statements_are_ignored(db):
+    recorder = SlowQueryRecorder(threshold_ms=60_000)
+    recorder.attach(db.get_bind())
+    try:
+        _seed(db)
+        db.query(Job).all()
+    finally:
+        _detach(recorder, db.get_bind())
+    assert recorder.ranked() == []
@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+
+from app.auth.auth import get_current_user
+from app.core.counter_cache import InMemoryCounterCache
+from app.main import app
+from app.models.notification import Notification
+from app.models.user import User
+from app.schemas.notification import NotificationCreate
+from app.services import notification_service
+from app.services.notification_service import NotificationService
+from tests.conftest import TestingAsyncSessionLocal
+
+@pytest.fixture
+def counts(monkeypatch):
+    cache = InMemoryCounterCache("unread", ttl_seconds=300)
+    monkeypatch.setattr(notification_service, "unread_counts", cache)
+    return cache
+
+def _run(action):
+    async def scenario():
+        async with TestingAsyncSessionLocal() as session:
+            return await action(NotificationService(session))
+    return asyncio.run(scenario())
+
+def _create(user_id, count):
+    return _run(lambda service: service.create_notifications([
+        NotificationCreate(user_id=user_id, title=f"Update {i}", message="", type="system") for i in range(count)
+    ]))
+
+def test_unread_count_follows_every_write(client, db, counts, assert_query_budget):
+    user = User(id="user-1", email="user@example.com", hashed_password="x", is_active=True)
+    db.add(User(id="user-1", email="user@example.com", hashed_password="x"))
+    db.commit()
+    app.dependency_overrides[get_current_user] = lambda: user
+
+    def badge():
+        response = client.get("/api/v1/notifications/unread-count")
+        assert response.status_code == 200
+        db.expire_all()
+        truth = db.scalar(select(func.count()).select_from(Notification).filter(
+            Notification.user_id == "user-1", Notification.is_read == False
+        ))
+        assert response.json()["unread_count"] == truth
+        return response
+
+    created = _create("user-1", 3)
+    assert badge().json() == {"unread_count": 3}
+    assert (counts.misses, counts.hits) == (1, 0)
+    # Served from the counter without touching the notifications table
+    assert_query_budget(badge(), 0)
+
+    first = created[0].id
+    assert client.post(f"/api/v1/notifications/{first}/read").status_code == 200
+    # Marking it read again changes nothing
+    assert client.post(f"/api/v1/notifications/{first}/read").status_code == 200
+    assert badge().json() == {"unread_count": 2}
+
+    _run(lambda service: service.create_notification(NotificationCreate(
+        user_id="user-1", title="Payment received", message="", type="payment"
+    )))
+    assert badge().json() == {"unread_count": 3}
+    assert client.post("/api/v1/notifications/read-all").status_code == 200
+    assert badge().json() == {"unread_count": 0}
+    assert counts.misses == 1
+
+def test_counts_are_never_invented_and_expire():
+    async def scenario():
+        cache = InMemoryCounterCache("unread", ttl_seconds=300)
+        await cache.add("user-1", 1)
+        assert await cache.get("user-1") is None
+        await cache.set("user-1", 2)
+        await cache.add("user-1", -1)
+        assert await cache.get("user-1") == 1
+        # Below zero means the count drifted: forget it
+        await cache.add("user-1", -5)
+        assert await cache.get("user-1") is None
+
+        expiring = InMemoryCounterCache("unread", ttl_seconds=0)
+        await expiring.set("user-1", 4)
+        assert await expiring.get("user-1") is None
+
+        bounded = InMemoryCounterCache("unread", ttl_seconds=300, max_entries=2)
+        for user_id in ("a", "b", "c"):
+            await bounded.set(user_id, 1)
+        assert [await bounded.get(user_id) for user_id in ("a", "b", "c")] == [None, 1, 1]
+
+    asyncio.run(scenario())
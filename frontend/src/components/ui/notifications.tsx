@@ -1,4 +1,4 @@
-import { useState, useEffect } from "react";
+import { useState, useEffect, useRef } from "react";
 import { Bell } from "lucide-react";
 import { Button } from "@/components/ui/button";
 import {
@@ -20,62 +20,185 @@ interface Notification {
   is_read: boolean;
 }
 
+// Reconnect delay after an ordinary drop: network, idle timeout (1001) or a
+// server restart (also 1001), where coming straight back is what we want
+const RECONNECT_MS = 3000;
+// Close codes the server turns a socket away with on purpose: 1008 when the
+// user has too many sockets open, 1013 when the worker is full or the client
+// could not keep up. Retrying at once would only be refused again.
+const REJECTED_CLOSE_CODES = [1008, 1013];
+const REJECTED_BACKOFF_MS = 30000;
+const MAX_BACKOFF_MS = 300000;
+
 export function Notifications() {
   const [notifications, setNotifications] = useState<Notification[]>([]);
   const [unreadCount, setUnreadCount] = useState(0);
+  // Cursor of the next (older) page; null once the list is complete
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [isOpen, setIsOpen] = useState(false);
   const { toast } = useToast();
+  // Newest notification id we hold, so a reconnect only replays what was missed
+  const lastSeenId = useRef<number | null>(null);
+  // Set on unmount, after which nothing may reconnect
+  const closed = useRef(false);
+  const socket = useRef<WebSocket | null>(null);
+  // Closes the Server-Sent Events fallback while it is in use
+  const closeEventSource = useRef<(() => void) | null>(null);
+  const retry = useRef<ReturnType<typeof setTimeout>>();
+  const backoff = useRef(REJECTED_BACKOFF_MS);
+
+  const remember = (items: Notification[]) => {
+    for (const n of items) {
+      if (lastSeenId.current === null || n.id > lastSeenId.current) lastSeenId.current = n.id;
+    }
+  };
 
   useEffect(() => {
+    closed.current = false;
     fetchNotifications();
     setupWebSocket();
+    return () => {
+      closed.current = true;
+      clearTimeout(retry.current);
+      socket.current?.close();
+      closeEventSource.current?.();
+    };
   }, []);
 
+  // The list comes a page at a time, so the badge asks the server for the
+  // count instead of counting the rows it happens to hold
   const fetchNotifications = async () => {
     try {
-      const response = await service.getNotifications();
-      setNotifications(response || []);
-      setUnreadCount(response?.filter(n => !n.is_read).length || 0);
+      const [page, count] = await Promise.all([
+        service.getNotifications(),
+        service.getUnreadCount(),
+      ]);
+      setNotifications(page.notifications);
+      setNextCursor(page.next_cursor);
+      remember(page.notifications);
+      setUnreadCount(count.unread_count);
     } catch (error) {
       console.error("Error fetching notifications:", error);
       setNotifications([]);
+      setNextCursor(null);
       setUnreadCount(0);
     }
   };
 
+  const fetchOlder = async () => {
+    if (!nextCursor) return;
+    try {
+      const page = await service.getNotifications({ cursor: nextCursor });
+      setNotifications(prev => [...prev, ...page.notifications]);
+      setNextCursor(page.next_cursor);
+    } catch (error) {
+      console.error("Error fetching older notifications:", error);
+    }
+  };
+
+  const receive = (notification: Notification) => {
+    remember([notification]);
+    setNotifications(prev => [notification, ...prev]);
+    setUnreadCount(prev => prev + 1);
+
+    // Show toast for new notifications
+    toast({
+      title: notification.title,
+      description: notification.message,
+    });
+  };
+
+  // For networks that break WebSockets: one long-lived Server-Sent Events
+  // response; the browser reconnects by itself and sends Last-Event-ID
+  const setupEventSource = (token: string) => {
+    const resume = lastSeenId.current === null ? '' : `&last_event_id=${lastSeenId.current}`;
+    const events = new EventSource(`http://localhost:8000/api/v1/notifications/stream?token=${token}${resume}`);
+    events.onmessage = (event) => receive(JSON.parse(event.data));
+    events.addEventListener('resync', () => fetchNotifications());
+    events.onerror = () => {
+      // The browser retries a dropped stream by itself, but gives up on one
+      // the server refused (401, 429, 503): go back to trying the socket
+      if (events.readyState !== EventSource.CLOSED) return;
+      closeEventSource.current = null;
+      retryLater();
+    };
+    closeEventSource.current = () => events.close();
+  };
+
+  // A socket that never opened was either refused (bad token, too many
+  // connections) or cut off by a network that does not pass WebSockets.
+  // Only the latter is worth the fallback, so first check that plain HTTP
+  // gets through with the same token.
+  const fallBackIfBlocked = async (token: string) => {
+    try {
+      await service.getUnreadCount();
+    } catch (error: any) {
+      // A bad token has already sent the user to log in; anything else
+      // means the server is unreachable, so try the socket again later
+      if (error?.response?.status !== 401) retryLater();
+      return;
+    }
+    if (!closed.current) setupEventSource(token);
+  };
+
   const setupWebSocket = () => {
     const token = localStorage.getItem('token');
     if (!token) return;
 
-    const ws = new WebSocket(`ws://localhost:8000/api/v1/ws?token=${token}`);
+    let opened = false;
+    const resume = lastSeenId.current === null ? '' : `&last_seen_id=${lastSeenId.current}`;
+    const ws = new WebSocket(`ws://localhost:8000/api/v1/ws?token=${token}${resume}`);
+    socket.current = ws;
     
     ws.onopen = () => {
+      opened = true;
+      backoff.current = REJECTED_BACKOFF_MS;
       console.log('WebSocket connected');
     };
 
     ws.onmessage = (event) => {
       const notification = JSON.parse(event.data);
-      setNotifications(prev => [notification, ...prev]);
-      setUnreadCount(prev => prev + 1);
-      
-      // Show toast for new notifications
-      toast({
-        title: notification.title,
-        description: notification.message,
-      });
+      // Heartbeat: answer so the server keeps the socket open
+      if (notification.event === 'ping') {
+        ws.send('pong');
+        return;
+      }
+      // Too much was missed to replay: reload the list instead
+      if (notification.event === 'resync') {
+        fetchNotifications();
+        return;
+      }
+      receive(notification);
     };
 
     ws.onerror = (error) => {
       console.error('WebSocket error:', error);
     };
 
-    ws.onclose = () => {
-      console.log('WebSocket disconnected');
+    ws.onclose = (event) => {
+      console.log('WebSocket disconnected', event.code);
+      if (closed.current) return;
+      if (!opened) {
+        fallBackIfBlocked(token);
+        return;
+      }
+      // Reconnect; the server replays anything sent in between
+      if (REJECTED_CLOSE_CODES.includes(event.code)) {
+        retryLater();
+        return;
+      }
+      reconnect(RECONNECT_MS);
     };
+  };
 
-    return () => {
-      ws.close();
-    };
+  const retryLater = () => {
+    reconnect(backoff.current);
+    backoff.current = Math.min(backoff.current * 2, MAX_BACKOFF_MS);
+  };
+
+  const reconnect = (delay: number) => {
+    if (closed.current) return;
+    retry.current = setTimeout(setupWebSocket, delay);
   };
 
   const handleMarkAsRead = async (notificationId: number) => {
@@ -175,6 +298,13 @@ export function Notifications() {
                   </div>
                 </div>
               ))}
+              {nextCursor && (
+                <div className="p-2 text-center">
+                  <Button variant="ghost" size="sm" onClick={fetchOlder} className="text-sm">
+                    Load older
+                  </Button>
+                </div>
+              )}
             </div>
           )}
         </ScrollArea>
@@ -81,10 +81,12 @@ api.interceptors.response.use(
           throw new Error('No refresh token available');
         }
 
-        const response = await api.post('/api/v1/auth/refresh', { refreshToken });
-        const { access_token } = response.data;
+        const response = await api.post('/api/v1/auth/refresh', { refresh_token: refreshToken });
+        const { access_token, refresh_token } = response.data;
         
         localStorage.setItem('token', access_token);
+        // Refresh tokens are single use; the old one is now spent
+        localStorage.setItem('refreshToken', refresh_token);
         originalRequest.headers.Authorization = `Bearer ${access_token}`;
         
         processQueue(null, access_token);
@@ -142,4 +144,17 @@ api.interceptors.response.use(
   }
 );
 
+// Paged list endpoints return one page per request and put the cursor of the
+// next one in the X-Next-Cursor header; follow it until the last page
+export const getAllPages = async <T = any>(url: string, params: Record<string, any> = {}): Promise<T[]> => {
+  const rows: T[] = [];
+  let cursor: string | undefined;
+  do {
+    const response = await api.get<T[]>(url, { params: { ...params, cursor } });
+    rows.push(...response.data);
+    cursor = response.headers['x-next-cursor'];
+  } while (cursor);
+  return rows;
+};
+
 export default api; 
\ No newline at end of file
@@ -4,7 +4,8 @@ import { Calendar, Clock, User, MapPin, CheckCircle, XCircle, Clock3, ArrowRight
 import { Tabs, TabsContent, TabsList, TabsTrigger } from "@/components/ui/tabs";
 import { Button } from "@/components/ui/button";
 import Loading from "@/components/Loading";
-import api from "@/lib/axios";
+import { getAllPages } from "@/lib/axios";
+import { API_ENDPOINTS } from "@/config/api";
 
 interface Booking {
   id: string;
@@ -90,16 +91,8 @@ const Bookings = () => {
           throw new Error("No authentication token found");
         }
 
-        const response = await api.get("/api/bookings", {
-          headers: {
-            Authorization: `Bearer ${token}`,
-          },
-          params: {
-            status: "all",
-          },
-        });
-
-        setBookings(response.data);
+        // The tabs filter client-side, so load every page
+        setBookings(await getAllPages(API_ENDPOINTS.BOOKINGS));
         setLoading(false);
       } catch (err) {
         setError("Failed to fetch bookings. Please try again.");
@@ -91,7 +91,7 @@ const Profile = () => {
     try {
       const token = localStorage.getItem("token");
       if (token) {
-        await api.post("/api/auth/logout", {}, {
+        await api.post("/api/auth/logout", { refresh_token: localStorage.getItem("refreshToken") }, {
           headers: {
             Authorization: `Bearer ${token}`,
           },
@@ -103,6 +103,7 @@ const Profile = () => {
       setUserRole(null);
       setIsAuthenticated(false);
       localStorage.removeItem("token");
+      localStorage.removeItem("refreshToken");
       localStorage.removeItem("userRole");
       localStorage.removeItem("isAuthenticated");
       toast({
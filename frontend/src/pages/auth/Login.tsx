@@ -47,6 +47,7 @@ const Login = () => {
 
       if (result.access_token) {
         localStorage.setItem('token', result.access_token);
+        localStorage.setItem('refreshToken', result.refresh_token);
         
         // Get user info
         const userResponse = await api.get(endpoints.auth.me);
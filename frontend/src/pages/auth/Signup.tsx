@@ -66,6 +66,7 @@ const Signup = () => {
       });
       
       localStorage.setItem('token', loginResponse.data.access_token);
+      localStorage.setItem('refreshToken', loginResponse.data.refresh_token);
       setIsAuthenticated(true);
       
       // Map the role to match UserContext types
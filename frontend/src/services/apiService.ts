@@ -1,6 +1,11 @@
-import axios from 'axios';
+import axios, { InternalAxiosRequestConfig } from 'axios';
 import apiContract from '../config/api-contract.json';
 
+// Set on a request whose caller needs the response headers, not just the body
+interface PagedRequestConfig extends InternalAxiosRequestConfig {
+  _withHeaders?: boolean;
+}
+
 class ApiService {
   private baseUrl: string;
   private axiosInstance;
@@ -30,7 +35,7 @@ class ApiService {
 
     // Add response interceptor for error handling
     this.axiosInstance.interceptors.response.use(
-      (response) => response.data,
+      (response) => (response.config as PagedRequestConfig)._withHeaders ? response : response.data,
       (error) => {
         if (error.response?.status === 401) {
           // Handle unauthorized access
@@ -107,8 +112,20 @@ class ApiService {
     );
   }
 
-  async getNotifications() {
-    return this.axiosInstance.get('/notifications');
+  // One page of notifications, newest first; next_cursor is null on the last page
+  async getNotifications(params: { cursor?: string; limit?: number } = {}) {
+    const response: any = await this.axiosInstance.get('/notifications', {
+      params,
+      _withHeaders: true
+    } as Partial<PagedRequestConfig>);
+    return {
+      notifications: response.data,
+      next_cursor: response.headers['x-next-cursor'] ?? null
+    };
+  }
+
+  async getUnreadCount() {
+    return this.axiosInstance.get('/notifications/unread-count');
   }
 
   async markNotificationAsRead(notificationId: string) {
@@ -100,46 +100,50 @@ class MockService {
     });
   }
 
-  async getNotifications() {
+  async getNotifications(params: { cursor?: string; limit?: number } = {}) {
     return {
       notifications: [
         {
-          id: "1",
+          id: 1,
           type: "new_job",
           title: "New Job Request",
           message: "You have a new job request for Plumbing Service",
           created_at: new Date().toISOString(),
-          read: false,
+          is_read: false,
         },
         {
-          id: "2",
+          id: 2,
           type: "job_status",
           title: "Job Completed",
           message: "Your job #123 has been marked as completed",
           created_at: new Date(Date.now() - 3600000).toISOString(),
-          read: true,
+          is_read: true,
         },
         {
-          id: "3",
+          id: 3,
           type: "review",
           title: "New Review",
           message: "You received a 5-star review from John Doe",
           created_at: new Date(Date.now() - 7200000).toISOString(),
-          read: false,
+          is_read: false,
         },
         {
-          id: "4",
+          id: 4,
           type: "payment",
           title: "Payment Received",
           message: "You received a payment of $150 for job #123",
           created_at: new Date(Date.now() - 86400000).toISOString(),
-          read: true,
+          is_read: true,
         },
       ],
-      unread_count: 2,
+      next_cursor: null,
     };
   }
 
+  async getUnreadCount() {
+    return { unread_count: 2 };
+  }
+
   async markNotificationAsRead(notificationId: string) {
     // Mock implementation - in a real service, this would make an API call
     return;
@@ -20,17 +20,18 @@ export interface Service {
   getTransactionHistory: (params?: { page?: number; limit?: number }) => Promise<any>;
   
   // Notification methods
-  getNotifications: () => Promise<{
+  getNotifications: (params?: { cursor?: string; limit?: number }) => Promise<{
     notifications: Array<{
-      id: string;
+      id: number;
       type: "new_job" | "job_status" | "review" | "payment";
       title: string;
       message: string;
       created_at: string;
-      read: boolean;
+      is_read: boolean;
     }>;
-    unread_count: number;
+    next_cursor: string | null;
   }>;
+  getUnreadCount: () => Promise<{ unread_count: number }>;
   markNotificationAsRead: (notificationId: string) => Promise<void>;
   markAllNotificationsAsRead: () => Promise<void>;
 } 
\ No newline at end of file
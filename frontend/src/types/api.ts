@@ -88,6 +88,7 @@ export interface Payment {
 export interface AuthResponse {
   access_token: string;
   token_type: string;
+  refresh_token: string;
   user: {
     id: string;
     email: string;